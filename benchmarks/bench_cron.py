@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Times ``CronExpression.next_after`` and ``next_n`` for common and
+pathological expressions (rare days, DST gaps, day-of-month/day-of-week
+unions).
+
+Usage: python benchmarks/bench_cron.py [repeat]
+"""
+
+import sys
+import timeit
+
+import maya
+from maya.cron import CronExpression
+
+EXPRESSIONS = (
+    ("* * * * *", "UTC"),
+    ("*/15 9-17 * * MON-FRI", "America/New_York"),
+    # Fires once every four years.
+    ("0 0 29 2 *", "UTC"),
+    # December 31st or any Sunday in December.
+    ("59 23 31 12 7", "UTC"),
+    # Friday the 13th or any Friday.
+    ("0 0 13 * 5", "Europe/Berlin"),
+    ("*/7 */5 13 * 5", "Australia/Lord_Howe"),
+    # Skipped by the spring DST gap once a year.
+    ("30 2 * * *", "Europe/Berlin"),
+    ("0 0 31 */2 *", "UTC"),
+)
+
+
+def main(repeat=1000):
+    start = maya.parse("2018-03-24T12:00:00Z")
+    header = ("expression", "timezone", "next_after", "next_n(10)")
+    print("{:<24} {:<20} {:>14} {:>14}".format(*header))
+    for text, timezone in EXPRESSIONS:
+        expression = CronExpression(text, timezone=timezone)
+        next_after = timeit.timeit(lambda: expression.next_after(start), number=repeat)
+        next_n = timeit.timeit(
+            lambda: expression.next_n(start, 10), number=repeat // 10
+        )
+        print(
+            "{:<24} {:<20} {:>11.1f} us {:>11.1f} us".format(
+                text, timezone, next_after / repeat * 1e6, next_n / (repeat // 10) * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the benchmarks of ``suite.py`` and compares them to a baseline.
+
+Usage:
+    python benchmarks/run.py                      # compare to baseline.json
+    python benchmarks/run.py --save               # update baseline.json
+    python benchmarks/run.py -k parse -k when     # only matching cases
+    python benchmarks/run.py --baseline other.json --threshold 1.5
+
+Each case is timed in several rounds of as many calls as fit into
+``--round-time`` seconds; the fastest round counts, as it is the one
+least disturbed by the rest of the system. Cases which are slower than
+the baseline by more than the threshold factor are reported as
+regressions and make the command exit with status 1.
+
+Timings depend on the machine, so compare against a baseline recorded on
+the same machine (e.g. ``--save`` on the release branch first).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+from suite import CASES
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+
+def measure(function, rounds, round_time):
+    """Returns the fastest time per call of the given function in seconds."""
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= round_time / 10 or number >= 10**7:
+            break
+        number *= 10
+    number = max(int(number * round_time / max(elapsed, 1e-9)), 1)
+    return min(timer.repeat(repeat=rounds, number=number)) / number
+
+
+def format_time(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return "{:.3g} {}".format(seconds / factor, unit)
+
+    return "{:.3g} ns".format(seconds / 1e-9)
+
+
+def environment():
+    import maya
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "maya": maya.__version__,
+    }
+
+
+def report(results, baseline, threshold):
+    """Prints the results next to the baseline and returns the regressions."""
+    regressions = []
+    print("{:<28} {:>12} {:>12} {:>8}".format("case", "time", "baseline", "ratio"))
+    for name, seconds in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            print(
+                "{:<28} {:>12} {:>12} {:>8}".format(
+                    name, format_time(seconds), "-", "-"
+                )
+            )
+            continue
+
+        ratio = seconds / expected
+        flag = ""
+        if ratio > threshold:
+            flag = "  regression"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = "  improvement"
+        print(
+            "{:<28} {:>12} {:>12} {:>7.2f}x{}".format(
+                name, format_time(seconds), format_time(expected), ratio, flag
+            )
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the maya benchmarks.")
+    parser.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        default=[],
+        help="only run cases whose name contains this text",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="the baseline file (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="slowdown factor reported as a regression (default: 1.25)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="number of timing rounds per case (default: 5)",
+    )
+    parser.add_argument(
+        "--round-time",
+        type=float,
+        default=0.1,
+        help="approximate seconds per round (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    names = [
+        name
+        for name in CASES
+        if not args.patterns or any(pattern in name for pattern in args.patterns)
+    ]
+    results = {}
+    for name in names:
+        results[name] = measure(CASES[name](), args.rounds, args.round_time)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save:
+        # Keep the baseline of cases which were not run.
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {"environment": environment(), "results": baseline},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        print("baseline saved to {}".format(args.baseline))
+        return 0
+
+    if regressions:
+        print("{} regression(s): {}".format(len(regressions), ", ".join(regressions)))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+The benchmark cases of ``run.py``.
+
+Each case is a function returning the callable to time, so any setup
+happens once, outside of the measurement. Inputs are fixed, results do
+not depend on the current time (except ``when`` with relative input).
+"""
+
+import random
+from datetime import timedelta
+
+import maya
+from maya.cron import CronExpression
+from maya.scanner import scan
+
+from bench_cron import EXPRESSIONS as CRON_EXPRESSIONS
+
+#: The registered cases, by name.
+CASES = {}
+
+START = maya.parse("2018-03-25T00:30:00Z")
+
+
+def case(name):
+    """Registers a benchmark case under the given name."""
+
+    def register(function):
+        CASES[name] = function
+        return function
+
+    return register
+
+
+@case("parse.iso8601")
+def parse_iso8601():
+    return lambda: maya.parse("2018-03-25T01:30:00.123456+02:00")
+
+
+@case("parse.rfc2822")
+def parse_rfc2822():
+    return lambda: maya.parse("Sun, 25 Mar 2018 01:30:00 +0200")
+
+
+@case("parse_any.iso8601")
+def parse_any_iso8601():
+    return lambda: maya.parse_any("2018-03-25T01:30:00.123456+02:00")
+
+
+@case("parse_any.rfc2822")
+def parse_any_rfc2822():
+    return lambda: maya.parse_any("Sun, 25 Mar 2018 01:30:00 +0200", source="bench")
+
+
+@case("when.absolute")
+def when_absolute():
+    return lambda: maya.when("March 25, 2018 1:30 am")
+
+
+@case("when.relative")
+def when_relative():
+    return lambda: maya.when("3 days ago")
+
+
+@case("MayaDT.init")
+def maya_dt_init():
+    return lambda: maya.MayaDT(1521941400.5)
+
+
+@case("MayaDT.from_datetime")
+def maya_dt_from_datetime():
+    dt = START.datetime()
+    return lambda: maya.MayaDT.from_datetime(dt)
+
+
+@case("MayaDT.datetime.utc")
+def maya_dt_datetime():
+    return lambda: START.datetime()
+
+
+@case("MayaDT.datetime.timezone")
+def maya_dt_datetime_timezone():
+    return lambda: START.datetime(to_timezone="Europe/Berlin")
+
+
+@case("MayaDT.properties")
+def maya_dt_properties():
+    def properties():
+        return (
+            START.year,
+            START.month,
+            START.day,
+            START.hour,
+            START.minute,
+            START.weekday,
+        )
+
+    return properties
+
+
+@case("MayaDT.add")
+def maya_dt_add():
+    return lambda: START.add(days=1, hours=2)
+
+
+@case("MayaDT.add.duration")
+def maya_dt_add_duration():
+    duration = maya.Duration(days=1, hours=2)
+    return lambda: START + duration
+
+
+@case("format.iso8601")
+def format_iso8601():
+    return START.iso8601
+
+
+@case("format.rfc2822")
+def format_rfc2822():
+    return START.rfc2822
+
+
+@case("format.rfc3339")
+def format_rfc3339():
+    return START.rfc3339
+
+
+@case("format.icalendar")
+def format_icalendar():
+    interval = maya.MayaInterval(start=START, duration=3600)
+    return lambda: interval.icalendar
+
+
+@case("MayaDT.snap")
+def maya_dt_snap():
+    return lambda: START.snap("@d+3h")
+
+
+@case("MayaInterval.split")
+def interval_split():
+    interval = maya.MayaInterval(start=START, duration=timedelta(days=7))
+    return lambda: list(interval.split(timedelta(hours=1)))
+
+
+@case("MayaInterval.flatten")
+def interval_flatten():
+    rng = random.Random(0)
+    intervals = []
+    for _ in range(200):
+        start = START.add(seconds=rng.randint(0, 10**6))
+        intervals.append(maya.MayaInterval(start=start, duration=rng.randint(0, 10**4)))
+    return lambda: maya.MayaInterval.flatten(intervals)
+
+
+@case("MayaInterval.quantize")
+def interval_quantize():
+    interval = maya.MayaInterval(start=START.add(seconds=731), duration=9001)
+    return lambda: interval.quantize(timedelta(minutes=15), timezone="Europe/Berlin")
+
+
+@case("intervals")
+def intervals():
+    end = START.add(days=7)
+    return lambda: list(maya.intervals(START, end, 3600))
+
+
+@case("cron.next_n")
+def cron_next_n():
+    expressions = [
+        CronExpression(text, timezone) for text, timezone in CRON_EXPRESSIONS
+    ]
+
+    def next_n():
+        for expression in expressions:
+            expression.next_n(START, 10)
+
+    return next_n
+
+
+@case("scan.html")
+def scan_html():
+    paragraph = (
+        "<p>Lorem ipsum dolor sit amet, page 3 of 12, consectetur adipiscing elit."
+        " Posted on March 25, 2018 at 10:30 am, updated 2018-03-26T08:00:00Z.</p>\n"
+    )
+    document = paragraph * 100
+    return lambda: scan(document, relative=False)
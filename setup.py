@@ -14,15 +14,21 @@ CLASSIFIERS = [
     "License :: OSI Approved :: MIT License",
     "Natural Language :: English",
     "Operating System :: OS Independent",
-    "Programming Language :: Python :: 2",
-    "Programming Language :: Python :: 2.7",
     "Programming Language :: Python :: 3",
+    "Programming Language :: Python :: 3 :: Only",
     "Programming Language :: Python :: 3.6",
+    "Programming Language :: Python :: 3.7",
+    "Programming Language :: Python :: 3.8",
+    "Programming Language :: Python :: 3.9",
+    "Programming Language :: Python :: 3.10",
     "Programming Language :: Python :: Implementation",
     "Programming Language :: Python :: Implementation :: CPython",
     "Topic :: Software Development :: Libraries :: Python Modules",
 ]
 
+#: Holds the supported Python versions (the array, scanner and bulk
+#: conversion modules rely on Python 3)
+PYTHON_REQUIRES = ">=3.6"
 #: Holds the runtime requirements for the end user
 INSTALL_REQUIRES = [
     "humanize",
@@ -32,6 +38,8 @@ INSTALL_REQUIRES = [
     "pendulum>=2.0.2",
     "snaptime",
 ]
+#: Holds the command line entry points
+ENTRY_POINTS = {"console_scripts": ["maya = maya.cli:main"]}
 #: Holds runtime requirements and development requirements
 EXTRAS_REQUIRES = {
     # extras for contributors
@@ -85,8 +93,10 @@ setup(
     packages=PACKAGES,
     package_dir={"": "src"},
     include_package_data=True,
+    python_requires=PYTHON_REQUIRES,
     install_requires=INSTALL_REQUIRES,
     extras_require=EXTRAS_REQUIRES,
+    entry_points=ENTRY_POINTS,
     keywords=KEYWORDS,
     classifiers=CLASSIFIERS,
 )
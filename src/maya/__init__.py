@@ -8,3 +8,12 @@ __download_url__ = "https://github.com/timofurrer/maya"
 __bugtrack_url__ = "https://github.com/timofurrer/maya/issues"
 
 from .core import *  # noqa
+from .duration import Duration  # noqa
+from .arrays import IntervalArray, TimestampArray  # noqa
+from .windows import SlidingWindow, TumblingWindow  # noqa
+from .recurrence import Recurrence  # noqa
+from .cron import CronExpression  # noqa
+from .calendars import BusinessCalendar  # noqa
+from .icalendar import ICalendarWriter  # noqa
+from .scanner import TimestampScanner  # noqa
+from .tiered import TieredParser, parse_any  # noqa
@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+"""
+maya.arrays
+~~~~~~~~~~~
+This module provides column-oriented containers for large collections
+of timestamps and intervals. Values are stored as epoch seconds in
+``array('q')`` columns (signed 64 bit integers), so bulk operations work
+on plain integers instead of on individual ``MayaDT`` and ``MayaInterval``
+objects.
+
+On Python 3.8 and later, both containers can be copied into shared memory
+(``to_shared_memory``), which other processes attach to without copying
+(``from_shared_memory``, or by unpickling, e.g. as an argument of a
+``multiprocessing.Pool`` task).
+"""
+
+from array import array
+from datetime import datetime as Datetime
+
+import pytz
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+from .core import MayaDT, MayaInterval, _seconds_or_timedelta
+
+#: Typecode of the epoch columns (signed 64 bit integers).
+EPOCH_TYPECODE = "q"
+#: Size of an epoch in bytes.
+EPOCH_SIZE = array(EPOCH_TYPECODE).itemsize
+#: Epoch marking a missing value ("not a time") in epoch columns.
+NAT = -(2**63)
+
+
+def _to_epoch(value):
+    """Returns the epoch seconds for a MayaDT, datetime or number."""
+    if isinstance(value, MayaDT):
+        return value.epoch
+
+    if isinstance(value, Datetime):
+        return MayaDT.from_datetime(value).epoch
+
+    return int(value)
+
+
+def _epoch_column(values):
+    """Returns an epoch column for the given values.
+
+    Existing epoch columns are used as they are, everything else is
+    converted with ``_to_epoch``.
+    """
+    if isinstance(values, array) and values.typecode == EPOCH_TYPECODE:
+        return values
+
+    if isinstance(values, memoryview) and values.format == EPOCH_TYPECODE:
+        return values
+
+    return array(EPOCH_TYPECODE, (_to_epoch(value) for value in values))
+
+
+def _quantize_origin(timezone):
+    """Returns the epoch of 1970-01-01 00:00 in the given timezone."""
+    localized = pytz.timezone(timezone).localize(Datetime(1970, 1, 1))
+    return MayaDT.from_datetime(localized).epoch
+
+
+class _SharedColumns(object):
+    """Epoch columns of equal length in a block of shared memory.
+
+    The block holds the length of the columns, followed by the columns.
+    """
+
+    def __init__(self, memory, owner):
+        self.memory = memory
+        self.owner = owner
+        self._views = []
+
+    @classmethod
+    def create(cls, columns, name=None):
+        """Returns the block for a copy of the columns, and the columns in it."""
+        if shared_memory is None:
+            raise RuntimeError("shared memory requires Python 3.8 or later")
+
+        length = len(columns[0])
+        size = EPOCH_SIZE * (1 + length * len(columns))
+        shared = cls(
+            shared_memory.SharedMemory(name=name, create=True, size=size), True
+        )
+        shared._column(0, 1)[0] = length
+        views = []
+        for index, column in enumerate(columns):
+            view = shared._column(1 + index * length, length)
+            view[:] = column if isinstance(column, memoryview) else memoryview(column)
+            views.append(view)
+        return shared, views
+
+    @classmethod
+    def attach(cls, name, count):
+        """Returns an existing block and its ``count`` columns."""
+        if shared_memory is None:
+            raise RuntimeError("shared memory requires Python 3.8 or later")
+
+        shared = cls(shared_memory.SharedMemory(name=name), False)
+        length = shared._column(0, 1)[0]
+        views = [shared._column(1 + index * length, length) for index in range(count)]
+        return shared, views
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def _column(self, offset, length):
+        """Returns an epoch column view of the block, ``offset`` and ``length``
+        in epochs."""
+        raw = self.memory.buf[offset * EPOCH_SIZE : (offset + length) * EPOCH_SIZE]
+        view = raw.cast(EPOCH_TYPECODE)
+        self._views.extend((view, raw))
+        return view
+
+    def _release(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+
+    def close(self):
+        self._release()
+        self.memory.close()
+
+    def __del__(self):
+        # The memory cannot be closed (when collected) before its views.
+        self._release()
+
+    def unlink(self):
+        self.memory.unlink()
+
+
+class _Shareable(object):
+    """Shared memory support of the column containers."""
+
+    #: The number of epoch columns.
+    _column_count = 1
+    # The _SharedColumns holding the columns (None if not shared).
+    _shared = None
+
+    def _columns(self):
+        raise NotImplementedError
+
+    @classmethod
+    def _from_shared_columns(cls, columns):
+        raise NotImplementedError
+
+    def to_shared_memory(self, name=None):
+        """Returns a copy in a new block of shared memory (with the given
+        name, or a random one), which owns the block.
+
+        The copy is pickled as the name of the block, so passing it to other
+        processes (e.g. to the tasks of a ``multiprocessing.Pool``) does not
+        copy the epochs. Use it as a context manager, or call ``close`` and
+        ``unlink`` when done, to free the block.
+        """
+        shared, columns = _SharedColumns.create(self._columns(), name)
+        copy = self._from_shared_columns(columns)
+        copy._shared = shared
+        return copy
+
+    @classmethod
+    def from_shared_memory(cls, name):
+        """Returns a container for an existing block of shared memory
+        without copying it. Call ``close`` when done."""
+        shared, columns = _SharedColumns.attach(name, cls._column_count)
+        attached = cls._from_shared_columns(columns)
+        attached._shared = shared
+        return attached
+
+    @property
+    def shared_memory_name(self):
+        """Returns the name of the shared memory block (or None)."""
+        return None if self._shared is None else self._shared.name
+
+    def close(self):
+        """Detaches from the shared memory block. The container (and any
+        slice of it) must not be used anymore."""
+        if self._shared is not None:
+            self._shared.close()
+
+    def unlink(self):
+        """Frees the shared memory block, once all processes closed it."""
+        if self._shared is not None:
+            self._shared.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        shared = self._shared
+        self.close()
+        if shared is not None and shared.owner:
+            shared.unlink()
+
+    def __reduce__(self):
+        if self._shared is not None:
+            return self.__class__.from_shared_memory, (self._shared.name,)
+
+        columns = tuple(array(EPOCH_TYPECODE, column) for column in self._columns())
+        return self.__class__._from_shared_columns, (columns,)
+
+
+class TimestampArray(_Shareable):
+    """A collection of timestamps stored as a column of epoch seconds."""
+
+    def __init__(self, epochs=()):
+        self.epochs = _epoch_column(epochs)
+
+    @classmethod
+    def _from_column(cls, epochs):
+        """Returns a TimestampArray for an existing epoch column."""
+        timestamp_array = cls.__new__(cls)
+        timestamp_array.epochs = epochs
+        return timestamp_array
+
+    def _columns(self):
+        return (self.epochs,)
+
+    @classmethod
+    def _from_shared_columns(cls, columns):
+        return cls._from_column(columns[0])
+
+    def to_list(self):
+        """Returns a list of MayaDTs."""
+        return list(self)
+
+    def __repr__(self):
+        return "<TimestampArray length={}>".format(len(self))
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __iter__(self):
+        return map(MayaDT, self.epochs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._from_column(self.epochs[index])
+
+        return MayaDT(self.epochs[index])
+
+    def __eq__(self, other):
+        if not isinstance(other, TimestampArray):
+            return NotImplemented
+
+        return list(self.epochs) == list(other.epochs)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    __hash__ = None
+
+    def argsort(self):
+        """Returns the indices that sort the timestamps."""
+        epochs = self.epochs
+        return sorted(range(len(self)), key=epochs.__getitem__)
+
+    def take(self, indices):
+        """Returns a new TimestampArray with the timestamps at the given indices."""
+        epochs = self.epochs
+        return self._from_column(array(EPOCH_TYPECODE, [epochs[i] for i in indices]))
+
+    def sort(self):
+        """Returns a new sorted TimestampArray."""
+        return self._from_column(array(EPOCH_TYPECODE, sorted(self.epochs)))
+
+    def unique(self):
+        """Returns a new sorted TimestampArray without duplicate timestamps."""
+        return self._from_column(array(EPOCH_TYPECODE, sorted(set(self.epochs))))
+
+
+class IntervalArray(_Shareable):
+    """A collection of intervals stored as two columns of epoch seconds.
+
+    Like ``MayaInterval``, each interval is inclusive of its start and
+    exclusive of its end. Epochs are whole seconds, which is the resolution
+    ``MayaDT`` uses for comparisons.
+    """
+
+    def __init__(self, starts=(), ends=()):
+        starts = _epoch_column(starts)
+        ends = _epoch_column(ends)
+        if len(starts) != len(ends):
+            raise ValueError("starts and ends must have the same length")
+
+        for start, end in zip(starts, ends):
+            if start > end:
+                raise ValueError("MayaInterval cannot end before it starts")
+
+        self.starts = starts
+        self.ends = ends
+
+    @classmethod
+    def _from_columns(cls, starts, ends):
+        """Returns an IntervalArray for already validated epoch columns."""
+        interval_array = cls.__new__(cls)
+        interval_array.starts = starts
+        interval_array.ends = ends
+        return interval_array
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """Returns an IntervalArray holding the given MayaIntervals."""
+        starts = array(EPOCH_TYPECODE)
+        ends = array(EPOCH_TYPECODE)
+        for interval in intervals:
+            starts.append(interval.start.epoch)
+            ends.append(interval.end.epoch)
+        return cls._from_columns(starts, ends)
+
+    @classmethod
+    def parse_many(cls, strings):
+        """Returns an IntervalArray of ISO 8601 time intervals.
+
+        See ``MayaInterval.from_iso8601``, except that repeating intervals
+        are not supported. Repeated strings are parsed only once.
+        """
+        starts = array(EPOCH_TYPECODE)
+        ends = array(EPOCH_TYPECODE)
+        parsed = {}
+        for string in strings:
+            try:
+                start, end = parsed[string]
+            except KeyError:
+                interval = MayaInterval.from_iso8601(string)
+                if not isinstance(interval, MayaInterval):
+                    raise ValueError(
+                        "repeating intervals are not supported: {!r}".format(string)
+                    )
+
+                start, end = parsed[string] = interval.start.epoch, interval.end.epoch
+            starts.append(start)
+            ends.append(end)
+        return cls._from_columns(starts, ends)
+
+    _column_count = 2
+
+    def _columns(self):
+        return (self.starts, self.ends)
+
+    @classmethod
+    def _from_shared_columns(cls, columns):
+        return cls._from_columns(*columns)
+
+    def to_intervals(self):
+        """Returns a list of MayaIntervals."""
+        return list(self)
+
+    def __repr__(self):
+        return "<IntervalArray length={}>".format(len(self))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        for start, end in zip(self.starts, self.ends):
+            yield MayaInterval._from_bounds(MayaDT(start), MayaDT(end))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._from_columns(self.starts[index], self.ends[index])
+
+        return MayaInterval._from_bounds(
+            MayaDT(self.starts[index]), MayaDT(self.ends[index])
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalArray):
+            return NotImplemented
+
+        return list(self.starts) == list(other.starts) and list(self.ends) == list(
+            other.ends
+        )
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    __hash__ = None
+
+    # Vectorized properties
+    # ---------------------
+    @property
+    def duration(self):
+        """Returns the duration of each interval in seconds."""
+        return array(EPOCH_TYPECODE, [e - s for s, e in zip(self.starts, self.ends)])
+
+    @property
+    def midpoint(self):
+        """Returns the midpoint epoch of each interval."""
+        return array("d", [(s + e) / 2.0 for s, e in zip(self.starts, self.ends)])
+
+    @property
+    def is_instant(self):
+        """Returns whether each interval has a duration of zero."""
+        return [s == e for s, e in zip(self.starts, self.ends)]
+
+    def contains_dt(self, points):
+        """Returns whether each interval contains the given point(s).
+
+        Keyword Arguments:
+            points -- a single MayaDT (or epoch) checked against every
+                      interval, or a sequence of points of the same length
+                      as the array, checked pairwise.
+        """
+        if isinstance(points, (MayaDT, Datetime, int, float)):
+            point = _to_epoch(points)
+            return [s <= point < e for s, e in zip(self.starts, self.ends)]
+
+        points = _epoch_column(points)
+        if len(points) != len(self):
+            raise ValueError("points must have the same length as the IntervalArray")
+
+        return [s <= p < e for s, e, p in zip(self.starts, self.ends, points)]
+
+    def quantize(self, duration, snap_out=False, timezone="UTC"):
+        """Returns a new IntervalArray with every interval quantized.
+
+        Same semantics as ``MayaInterval.quantize``.
+        """
+        duration = _seconds_or_timedelta(duration)
+        if duration.total_seconds() <= 0:
+            raise ValueError("cannot quantize by non-positive timedelta")
+
+        seconds = int(duration.total_seconds())
+        origin = _quantize_origin(timezone)
+        starts = array(EPOCH_TYPECODE)
+        ends = array(EPOCH_TYPECODE)
+        for start, end in zip(self.starts, self.ends):
+            start_seconds = start - origin
+            end_seconds = end - origin
+            if start_seconds % seconds and not snap_out:
+                start_seconds += seconds
+            if end_seconds % seconds and snap_out:
+                end_seconds += seconds
+            start_seconds -= start_seconds % seconds
+            end_seconds -= end_seconds % seconds
+            if start_seconds > end_seconds:
+                start_seconds = end_seconds
+            starts.append(origin + start_seconds)
+            ends.append(origin + end_seconds)
+        return self._from_columns(starts, ends)
+
+    # Sorting
+    # -------
+    def argsort(self):
+        """Returns the indices that sort the intervals by start, then end."""
+        starts, ends = self.starts, self.ends
+        return sorted(range(len(self)), key=lambda i: (starts[i], ends[i]))
+
+    def take(self, indices):
+        """Returns a new IntervalArray with the intervals at the given indices."""
+        starts, ends = self.starts, self.ends
+        return self._from_columns(
+            array(EPOCH_TYPECODE, [starts[i] for i in indices]),
+            array(EPOCH_TYPECODE, [ends[i] for i in indices]),
+        )
+
+    def sort(self):
+        """Returns a new IntervalArray sorted by start, then end."""
+        return self.take(self.argsort())
+
+    def unique(self):
+        """Returns a new sorted IntervalArray without duplicate intervals."""
+        pairs = sorted(set(zip(self.starts, self.ends)))
+        return self._from_columns(
+            array(EPOCH_TYPECODE, [start for start, _ in pairs]),
+            array(EPOCH_TYPECODE, [end for _, end in pairs]),
+        )
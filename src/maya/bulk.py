@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+"""
+maya.bulk
+~~~~~~~~~
+This module converts the timestamps in large amounts of delimited text
+(or whole lines), to formatted timestamps or to epoch columns.
+
+``convert_stream`` converts any iterable of lines in batches. Files can be
+converted by ``convert_file`` and ``read_timestamps`` without ever being
+read as a whole: the file is memory-mapped and split into chunks ending at
+newlines, which worker processes parse independently. Results are written
+(or collected) in input order, and only a few chunks are in flight at any
+time, so memory use does not grow with the size of the file.
+"""
+
+import contextlib
+import csv
+import functools
+import io
+import itertools
+import mmap
+import multiprocessing
+import os
+from array import array
+from collections import deque
+
+from .arrays import EPOCH_TYPECODE, NAT, TimestampArray
+from .core import parse, when
+from .tiered import DEFAULT_CHAIN, TieredParser, parse_iso8601
+
+#: The number of lines converted as one batch.
+BATCH_SIZE = 10000
+#: The approximate size of the chunks files are split into in bytes.
+CHUNK_SIZE = 16 << 20
+# The number of converted values a Converter remembers.
+_CACHE_SIZE = 1 << 16
+
+
+def _parse_when(string, timezone, languages):
+    return when(string, timezone=timezone, languages=languages)
+
+
+def _format_epoch(dt):
+    epoch = dt._epoch
+    if epoch == int(epoch):
+        return str(int(epoch))
+
+    return repr(float(epoch))
+
+
+#: The output formats by name.
+FORMATS = {
+    "iso8601": lambda dt: dt.iso8601(),
+    "rfc3339": lambda dt: dt.rfc3339(),
+    "rfc2822": lambda dt: dt.rfc2822(),
+    "epoch": _format_epoch,
+}
+
+#: The parsers by name.
+PARSERS = ("parse", "when", "any", "iso")
+
+#: What to do with values which cannot be parsed.
+ERROR_POLICIES = ("fail", "skip", "keep", "blank")
+
+
+class ConversionError(ValueError):
+    """Raised for a value which cannot be parsed (with ``errors='fail'``)."""
+
+    def __init__(self, line_number, value):
+        super(ConversionError, self).__init__(
+            "line {}: invalid datetime input: {!r}".format(line_number, value)
+        )
+        self.line_number = line_number
+        self.value = value
+
+    def __reduce__(self):
+        # Errors of worker processes are pickled.
+        return ConversionError, (self.line_number, self.value)
+
+
+class Converter(object):
+    """
+    Converts the timestamps in lines of text.
+
+    Keyword Arguments:
+        parser -- 'parse' (pendulum), 'when' (dateparser), 'any' (tries
+                  ISO 8601, pendulum and dateparser) or 'iso' (ISO 8601
+                  only, fastest) (default: 'parse')
+        timezone -- timezone of timestamps without one (default: 'UTC')
+        day_first -- parse ambiguous dates as day first (default: False)
+        output_format -- 'iso8601', 'rfc3339', 'rfc2822' or 'epoch'
+                         (default: 'iso8601')
+        column -- the zero-based index of the column to convert, or None
+                  to convert whole lines (default: None)
+        delimiter -- the column delimiter (default: ',')
+        errors -- what to do with values which cannot be parsed: 'fail'
+                  (raise ConversionError), 'skip' the line, 'keep' the value
+                  or 'blank' it (default: 'fail')
+        languages -- languages of the input for dateparser, e.g. ['en', 'de']
+                     (default: None, as ``when``)
+    """
+
+    def __init__(
+        self,
+        parser="parse",
+        timezone="UTC",
+        day_first=False,
+        output_format="iso8601",
+        column=None,
+        delimiter=",",
+        errors="fail",
+        languages=None,
+    ):
+        if parser not in PARSERS:
+            raise ValueError("invalid parser: {!r}".format(parser))
+        if output_format not in FORMATS:
+            raise ValueError("invalid format: {!r}".format(output_format))
+        if errors not in ERROR_POLICIES:
+            raise ValueError("invalid error policy: {!r}".format(errors))
+
+        self.parser = parser
+        self.timezone = timezone
+        self.day_first = day_first
+        self.output_format = output_format
+        self.column = column
+        self.delimiter = delimiter
+        self.errors = errors
+        self.languages = None if languages is None else list(languages)
+        self._format = FORMATS[output_format]
+        self._tiered = None
+        if parser == "any":
+            dateparser = functools.partial(_parse_when, languages=self.languages)
+            self._tiered = TieredParser(
+                [
+                    ("dateparser", dateparser) if name == "dateparser" else name
+                    for name in DEFAULT_CHAIN
+                ]
+            )
+        self._cache = {}
+        self._epochs = {}
+
+    def __getstate__(self):
+        # Worker processes start with empty caches.
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        state["_epochs"] = {}
+        del state["_format"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._format = FORMATS[self.output_format]
+
+    def parse(self, value):
+        """Returns the MayaDT of a value, see the ``parser`` argument."""
+        if self.parser == "parse":
+            return parse(value, timezone=self.timezone, day_first=self.day_first)
+        if self.parser == "when":
+            return when(value, timezone=self.timezone, languages=self.languages)
+        if self.parser == "iso":
+            return parse_iso8601(value, self.timezone)
+
+        return self._tiered.parse(value, source=self.column, timezone=self.timezone)
+
+    def convert(self, value):
+        """Returns the converted value (raises ValueError if it is invalid)."""
+        try:
+            return self._cache[value]
+        except KeyError:
+            pass
+
+        try:
+            converted = self._format(self.parse(value))
+        except OverflowError:
+            raise ValueError("out of range")
+        if len(self._cache) >= _CACHE_SIZE:
+            self._cache.clear()
+        self._cache[value] = converted
+        return converted
+
+    def epoch(self, value):
+        """Returns the epoch seconds of a value (raises ValueError if it is
+        invalid)."""
+        try:
+            return self._epochs[value]
+        except KeyError:
+            pass
+
+        try:
+            epoch = self.parse(value).epoch
+        except OverflowError:
+            raise ValueError("out of range")
+        if len(self._epochs) >= _CACHE_SIZE:
+            self._epochs.clear()
+        self._epochs[value] = epoch
+        return epoch
+
+    def _failed(self, line_number, value):
+        """Returns the replacement of an invalid value (None to skip it)."""
+        if self.errors == "fail":
+            raise ConversionError(line_number, value)
+        if self.errors == "keep":
+            return value
+        if self.errors == "blank":
+            return ""
+        return None
+
+    def convert_lines(self, lines, first_line_number=1):
+        """Returns the converted lines (each ending with a newline).
+
+        Keyword Arguments:
+            lines -- the lines of input, with or without line endings
+            first_line_number -- the line number of the first line, for
+                                 error messages (default: 1)
+        """
+        if self.column is None:
+            return self._convert_whole_lines(lines, first_line_number)
+
+        output = io.StringIO()
+        writer = csv.writer(output, delimiter=self.delimiter, lineterminator="\n")
+        column = self.column
+        for line_number, row in enumerate(
+            csv.reader(lines, delimiter=self.delimiter), first_line_number
+        ):
+            if not row:
+                writer.writerow(row)
+                continue
+            if len(row) <= column:
+                replacement = self._failed(line_number, "")
+            else:
+                try:
+                    replacement = self.convert(row[column])
+                except ValueError:
+                    replacement = self._failed(line_number, row[column])
+            if replacement is None:
+                continue
+            if len(row) > column:
+                row[column] = replacement
+            writer.writerow(row)
+        return [output.getvalue()]
+
+    def _convert_whole_lines(self, lines, first_line_number):
+        converted = []
+        for line_number, line in enumerate(lines, first_line_number):
+            value = line.rstrip("\r\n")
+            if not value:
+                converted.append("\n")
+                continue
+            try:
+                replacement = self.convert(value)
+            except ValueError:
+                replacement = self._failed(line_number, value)
+            if replacement is not None:
+                converted.append(replacement + "\n")
+        return converted
+
+    def _values(self, lines):
+        """Yields the value to convert of each line (None for blank lines)."""
+        if self.column is None:
+            for line in lines:
+                yield line.rstrip("\r\n") or None
+            return
+
+        column = self.column
+        for row in csv.reader(lines, delimiter=self.delimiter):
+            if not row:
+                yield None
+            else:
+                yield row[column] if len(row) > column else ""
+
+    def epochs(self, lines, first_line_number=1):
+        """Returns an epoch column (``array('q')``) of the timestamps in the
+        lines. Blank lines are left out, as are invalid values with
+        ``errors='skip'``; with 'keep' or 'blank' they are NAT.
+        """
+        epochs = array(EPOCH_TYPECODE)
+        append = epochs.append
+        for line_number, value in enumerate(self._values(lines), first_line_number):
+            if value is None:
+                continue
+            try:
+                append(self.epoch(value))
+            except ValueError:
+                if self.errors == "fail":
+                    raise ConversionError(line_number, value)
+                if self.errors != "skip":
+                    append(NAT)
+        return epochs
+
+
+def batches(lines, size=BATCH_SIZE, first_line_number=1):
+    """Yields (line number, lines) pairs of up to ``size`` lines."""
+    lines = iter(lines)
+    line_number = first_line_number
+    while True:
+        batch = list(itertools.islice(lines, size))
+        if not batch:
+            return
+        yield line_number, batch
+        line_number += len(batch)
+
+
+_worker_converter = None
+
+
+def _init_worker(converter):
+    global _worker_converter
+    _worker_converter = converter
+
+
+def _convert_batch(batch):
+    line_number, lines = batch
+    return _worker_converter.convert_lines(lines, line_number)
+
+
+def convert_stream(lines, output, converter, workers=1, first_line_number=1):
+    """Converts an iterable of lines into a writable text file, in order.
+
+    With more than one worker, batches of lines are converted by a pool of
+    worker processes.
+    """
+    stream = batches(lines, first_line_number=first_line_number)
+    if workers <= 1:
+        for line_number, batch in stream:
+            output.writelines(converter.convert_lines(batch, line_number))
+        return
+
+    pool = multiprocessing.Pool(workers, _init_worker, (converter,))
+    try:
+        for converted in pool.imap(_convert_batch, stream):
+            output.writelines(converted)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _workers(workers):
+    if workers is None:
+        return os.cpu_count() or 1
+
+    return workers
+
+
+def chunk_bounds(path, chunk_size=CHUNK_SIZE, start=0):
+    """Returns the (start, end) byte offsets of the chunks of a file, from
+    ``start`` on. Chunks are about ``chunk_size`` bytes long and end after
+    a newline (or at the end of the file)."""
+    bounds = []
+    with io.open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return bounds
+
+        with contextlib.closing(
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        ) as mapped:
+            while start < size:
+                end = start + chunk_size
+                if end < size:
+                    newline = mapped.find(b"\n", end - 1)
+                    end = size if newline < 0 else newline + 1
+                else:
+                    end = size
+                bounds.append((start, end))
+                start = end
+    return bounds
+
+
+def read_header(path, encoding="utf-8"):
+    """Returns the first line of a file and the byte offset after it."""
+    with io.open(path, "rb") as f:
+        line = f.readline()
+    return line.decode(encoding), len(line)
+
+
+def _read_chunk(path, start, end, encoding):
+    """Returns the lines of a chunk of a file."""
+    with io.open(path, "rb") as f:
+        with contextlib.closing(
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        ) as mapped:
+            data = mapped[start:end]
+    return list(io.StringIO(data.decode(encoding), newline=""))
+
+
+def _process_chunk(task, converter=None):
+    """Returns the number of lines of a chunk and its conversion."""
+    path, start, end, encoding, epochs = task
+    converter = converter or _worker_converter
+    lines = _read_chunk(path, start, end, encoding)
+    if epochs:
+        return len(lines), converter.epochs(lines)
+
+    return len(lines), "".join(converter.convert_lines(lines))
+
+
+def _map_chunks(converter, tasks, workers):
+    """Yields the results of ``_process_chunk`` for the tasks, in order.
+
+    With more than one worker, up to two chunks per worker are processed
+    ahead in a pool of worker processes.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield _process_chunk(task, converter)
+        return
+
+    tasks = iter(tasks)
+    pool = multiprocessing.Pool(workers, _init_worker, (converter,))
+    try:
+        pending = deque(
+            pool.apply_async(_process_chunk, (task,))
+            for task in itertools.islice(tasks, 2 * workers)
+        )
+        while pending:
+            result = pending.popleft().get()
+            for task in itertools.islice(tasks, 1):
+                pending.append(pool.apply_async(_process_chunk, (task,)))
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _convert_chunks(
+    path, converter, workers, chunk_size, start, encoding, epochs, first_line_number
+):
+    """Yields the conversions of the chunks of a file, in order."""
+    tasks = [
+        (path, chunk_start, chunk_end, encoding, epochs)
+        for chunk_start, chunk_end in chunk_bounds(path, chunk_size, start)
+    ]
+    results = _map_chunks(converter, tasks, _workers(workers))
+    line_number = first_line_number
+    try:
+        while True:
+            try:
+                count, converted = next(results)
+            except StopIteration:
+                return
+            except ConversionError as error:
+                # Errors carry the line number within their chunk.
+                raise ConversionError(line_number + error.line_number - 1, error.value)
+            yield converted
+            line_number += count
+    finally:
+        results.close()
+
+
+def convert_file(
+    path,
+    output,
+    converter,
+    workers=None,
+    chunk_size=CHUNK_SIZE,
+    start=0,
+    encoding="utf-8",
+    first_line_number=1,
+):
+    """Converts the lines of a file into a writable text file, in order.
+
+    Keyword Arguments:
+        path -- the file to convert; its lines must end with '\\n' (or
+                '\\r\\n') in an ASCII-compatible encoding, e.g. UTF-8
+        output -- the writable text file
+        converter -- the Converter to use
+        workers -- number of worker processes (default: one per CPU)
+        chunk_size -- approximate chunk size in bytes (default: 16 MiB)
+        start -- byte offset to start at, e.g. after a header (default: 0)
+        encoding -- encoding of the file (default: 'utf-8')
+        first_line_number -- the line number at ``start``, for error
+                             messages (default: 1)
+    """
+    for converted in _convert_chunks(
+        path, converter, workers, chunk_size, start, encoding, False, first_line_number
+    ):
+        output.write(converted)
+
+
+def read_timestamps(
+    path,
+    converter,
+    workers=None,
+    chunk_size=CHUNK_SIZE,
+    start=0,
+    encoding="utf-8",
+    first_line_number=1,
+):
+    """Returns a TimestampArray of the timestamps in a file, in order.
+
+    See ``convert_file`` for the arguments and ``Converter.epochs`` for the
+    handling of invalid values.
+    """
+    epochs = array(EPOCH_TYPECODE)
+    for column in _convert_chunks(
+        path, converter, workers, chunk_size, start, encoding, True, first_line_number
+    ):
+        epochs.extend(column)
+    return TimestampArray._from_column(epochs)
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+maya.calendars
+~~~~~~~~~~~~~~
+This module provides business day calendars: a weekmask of working
+weekdays plus a list of holidays.
+
+Days are numbered from 1970-01-01 in the calendar's timezone. The number
+of business days before any day is the weekmask count of whole weeks
+plus a precomputed cumulative count over the span of the holidays, so
+every query is O(1), no matter how far apart the days are.
+"""
+
+from array import array
+from datetime import date as Date
+from datetime import datetime as Datetime
+
+from .arrays import (
+    EPOCH_TYPECODE,
+    IntervalArray,
+    TimestampArray,
+    _epoch_column,
+    _to_epoch,
+)
+from .core import MayaDT, MayaInterval
+from .timezones import _UNIX_EPOCH_ORDINAL, get_transition_table
+
+_DAY = 86400
+
+
+# 1970-01-01 was a Thursday.
+_EPOCH_WEEKDAY = 3
+
+_WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+#: The policies for days which are not business days in ``add_business_days``.
+ROLL_POLICIES = ("forward", "backward", "raise")
+
+
+def _is_scalar(value):
+    return isinstance(value, (MayaDT, Datetime, int, float))
+
+
+def _parse_weekmask(weekmask):
+    """Returns a tuple of seven booleans, Monday first.
+
+    Accepts strings like '1111100' or 'Mon Tue Wed Thu Fri' and sequences
+    of seven booleans.
+    """
+    if isinstance(weekmask, str):
+        if set(weekmask) <= {"0", "1"}:
+            weekmask = [day == "1" for day in weekmask]
+        else:
+            names = weekmask.lower().split()
+            for name in names:
+                if name not in _WEEKDAY_NAMES:
+                    raise ValueError("invalid weekday: {!r}".format(name))
+
+            weekmask = [day in names for day in _WEEKDAY_NAMES]
+
+    weekmask = tuple(bool(day) for day in weekmask)
+    if len(weekmask) != 7:
+        raise ValueError("a weekmask has 7 days: {!r}".format(weekmask))
+
+    if not any(weekmask):
+        raise ValueError("a weekmask needs at least one business day")
+
+    return weekmask
+
+
+class BusinessCalendar(object):
+    """
+    A calendar of business days.
+
+    Keyword Arguments:
+        weekmask -- the business weekdays, Monday first, either as a
+                    string like '1111100' or 'Mon Tue Wed Thu Fri' or as
+                    a sequence of seven booleans (default: '1111100')
+        holidays -- dates (or 'YYYY-MM-DD' strings or MayaDTs) which are
+                    no business days
+        timezone -- the timezone whose days are counted (default: 'UTC')
+
+    Queries take a single MayaDT (or epoch) or a sequence of them, e.g.
+    a TimestampArray, and return a single result or one result per
+    timestamp respectively.
+    """
+
+    def __init__(self, weekmask="1111100", holidays=(), timezone="UTC"):
+        self.weekmask = _parse_weekmask(weekmask)
+        self.timezone = timezone
+        self._table = get_transition_table(timezone)
+        # Indexed by day number modulo 7.
+        self._week_bits = [self.weekmask[(i + _EPOCH_WEEKDAY) % 7] for i in range(7)]
+        self._per_week = sum(self.weekmask)
+        self._week_counts = [sum(self._week_bits[:i]) for i in range(7)]
+        self._week_days = [i for i in range(7) if self._week_bits[i]]
+
+        days = sorted(
+            {
+                day
+                for day in map(self._holiday_day, holidays)
+                if self._week_bits[day % 7]
+            }
+        )
+        self.holidays = tuple(
+            Date.fromordinal(day + _UNIX_EPOCH_ORDINAL) for day in days
+        )
+        # The holiday span as a bitmap of business days, the number of
+        # business days before each of its days and the business days in it.
+        self._first = days[0] if days else 0
+        self._last = days[-1] + 1 if days else 0
+        holiday_set = set(days)
+        self._bitmap = bytearray(
+            self._week_bits[day % 7] and day not in holiday_set
+            for day in range(self._first, self._last)
+        )
+        self._counts = array(EPOCH_TYPECODE, [0])
+        self._business_days = array(EPOCH_TYPECODE)
+        for offset, bit in enumerate(self._bitmap):
+            self._counts.append(self._counts[-1] + bit)
+            if bit:
+                self._business_days.append(self._first + offset)
+        self._count_first = self._weekly_count(self._first)
+
+    def __repr__(self):
+        weekmask = "".join("1" if day else "0" for day in self.weekmask)
+        return "<BusinessCalendar weekmask={} holidays={} timezone={!r}>".format(
+            weekmask, len(self.holidays), self.timezone
+        )
+
+    def _holiday_day(self, holiday):
+        """Returns the day number of a holiday."""
+        if isinstance(holiday, MayaDT):
+            return self._day(holiday.epoch)
+
+        if isinstance(holiday, str):
+            holiday = Datetime.strptime(holiday, "%Y-%m-%d")
+        if isinstance(holiday, Datetime):
+            holiday = holiday.date()
+        return holiday.toordinal() - _UNIX_EPOCH_ORDINAL
+
+    def _day(self, epoch):
+        """Returns the number of the local day containing the epoch."""
+        return (epoch + self._table.utcoffset(epoch)) // _DAY
+
+    def _weekly_count(self, day):
+        """Returns the number of weekmask days before the given day (from day 0)."""
+        weeks, weekday = divmod(day, 7)
+        return weeks * self._per_week + self._week_counts[weekday]
+
+    def _weekly_day(self, count):
+        """Returns the weekmask day with ``count`` weekmask days before it."""
+        weeks, index = divmod(count, self._per_week)
+        return weeks * 7 + self._week_days[index]
+
+    def _count(self, day):
+        """Returns the number of business days before the given day (from day 0)."""
+        if day < self._first:
+            return self._weekly_count(day)
+
+        if day >= self._last:
+            return self._weekly_count(day) - len(self.holidays)
+
+        return self._count_first + self._counts[day - self._first]
+
+    def _nth_day(self, count):
+        """Returns the business day with ``count`` business days before it."""
+        index = count - self._count_first
+        if index < 0:
+            return self._weekly_day(count)
+
+        if index >= len(self._business_days):
+            return self._weekly_day(count + len(self.holidays))
+
+        return self._business_days[index]
+
+    def _is_business_day(self, day):
+        if self._first <= day < self._last:
+            return self._bitmap[day - self._first] == 1
+
+        return self._week_bits[day % 7]
+
+    def is_business_day(self, timestamps):
+        """Returns whether the day of the given timestamp(s) is a business day."""
+        if _is_scalar(timestamps):
+            return self._is_business_day(self._day(_to_epoch(timestamps)))
+
+        return [
+            self._is_business_day(day // _DAY)
+            for day in self._table.to_local(_epoch_column(timestamps))
+        ]
+
+    def _add(self, epoch, days, roll):
+        local = epoch + self._table.utcoffset(epoch)
+        day, seconds = divmod(local, _DAY)
+        count = self._count(day)
+        if not self._is_business_day(day):
+            if roll == "raise":
+                raise ValueError("not a business day: {}".format(MayaDT(epoch)))
+
+            if roll == "backward":
+                count -= 1
+        new_day = self._nth_day(count + days)
+        if new_day == day:
+            return epoch
+
+        return self._table.localize_wall(
+            new_day * _DAY + seconds, "earliest", "shift_forward"
+        )
+
+    def add_business_days(self, timestamps, days, roll="forward"):
+        """Returns the timestamp(s) moved by the given number of business days.
+
+        The local time of day is kept.
+
+        Keyword Arguments:
+            timestamps -- a MayaDT (or epoch) or a sequence of them
+            days -- the number of business days to add (negative to go
+                    back), a single number or one per timestamp
+            roll -- how a timestamp on a day which is not a business day
+                    is treated: 'forward' counts from the next business
+                    day, 'backward' from the previous one, 'raise' raises
+                    a ValueError (default: 'forward')
+        """
+        if roll not in ROLL_POLICIES:
+            raise ValueError("invalid roll policy: {!r}".format(roll))
+
+        if _is_scalar(timestamps):
+            return MayaDT(self._add(_to_epoch(timestamps), days, roll))
+
+        epochs = _epoch_column(timestamps)
+        if isinstance(days, int):
+            days = [days] * len(epochs)
+        elif len(days) != len(epochs):
+            raise ValueError("days must have the same length as timestamps")
+
+        return TimestampArray._from_column(
+            array(
+                EPOCH_TYPECODE,
+                [self._add(epoch, n, roll) for epoch, n in zip(epochs, days)],
+            )
+        )
+
+    def business_days_between(self, start, end=None):
+        """Returns the number of business days from start (inclusive) to end
+        (exclusive), negative if end is before start.
+
+        Keyword Arguments:
+            start -- a MayaDT (or epoch) or a sequence of them, or a
+                     MayaInterval or IntervalArray (without an end)
+            end -- a MayaDT (or epoch) or a sequence of them
+        """
+        if isinstance(start, MayaInterval):
+            start, end = start.start, start.end
+        elif isinstance(start, IntervalArray):
+            start, end = start.starts, start.ends
+        if end is None:
+            raise ValueError("business_days_between requires an end")
+
+        if _is_scalar(start):
+            return self._count(self._day(_to_epoch(end))) - self._count(
+                self._day(_to_epoch(start))
+            )
+
+        starts = self._table.to_local(_epoch_column(start))
+        ends = self._table.to_local(_epoch_column(end))
+        if len(starts) != len(ends):
+            raise ValueError("start and end must have the same length")
+
+        count = self._count
+        return array(
+            EPOCH_TYPECODE,
+            [count(e // _DAY) - count(s // _DAY) for s, e in zip(starts, ends)],
+        )
+
+    def business_days(self, interval):
+        """Returns the start of each business day beginning within the given
+        MayaInterval."""
+        starts = []
+        for day in range(
+            self._day(interval.start.epoch), self._day(interval.end.epoch) + 1
+        ):
+            if self._is_business_day(day):
+                epoch = self._table.localize_wall(
+                    day * _DAY, "earliest", "shift_forward"
+                )
+                if interval.start.epoch <= epoch < interval.end.epoch:
+                    starts.append(MayaDT(epoch))
+        return starts
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+maya.cli
+~~~~~~~~
+The ``maya`` command (also ``python -m maya``), which converts the
+timestamps in a column of delimited text, or whole lines, to ISO 8601,
+RFC 3339, RFC 2822 or epoch seconds::
+
+    $ maya --column 2 --timezone Europe/Berlin --format epoch access.csv
+    $ zcat huge.log.gz | maya --parser any --workers 8 > converted.txt
+
+Files are memory-mapped and converted in chunks, stdin in batches of
+lines (see ``maya.bulk``). With ``--workers``, chunks or batches are
+converted by a pool of processes and written in input order.
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+
+import pytz
+
+from .bulk import (
+    ERROR_POLICIES,
+    FORMATS,
+    PARSERS,
+    Converter,
+    convert_file,
+    convert_stream,
+    read_header,
+)
+from .core import warmup
+
+#: The size of the read and write buffers in bytes.
+BUFFER_SIZE = 1 << 20
+
+
+def _column(value, header, delimiter):
+    """Returns the zero-based index of a column given by 1-based number or
+    (with a header) by name."""
+    if value is None:
+        return None
+
+    if value.isdigit():
+        if int(value) < 1:
+            raise ValueError("columns are numbered from 1")
+        return int(value) - 1
+
+    if header is None:
+        raise ValueError("columns can only be given by name with --header")
+    names = next(csv.reader([header], delimiter=delimiter))
+    try:
+        return names.index(value)
+    except ValueError:
+        raise ValueError("no column named {!r}".format(value))
+
+
+def _timezone(name):
+    """Returns the name of a timezone given on the command line, if valid."""
+    try:
+        pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        raise argparse.ArgumentTypeError("unknown timezone: {!r}".format(name))
+    return name
+
+
+def _languages(value):
+    """Returns the list of languages given on the command line."""
+    return [language for language in value.split(",") if language] or None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="maya",
+        description="Convert the timestamps in a column of delimited text (or "
+        "whole lines) to ISO 8601, RFC 3339, RFC 2822 or epoch seconds.",
+    )
+    parser.add_argument(
+        "files", nargs="*", default=["-"], help="input files (default: stdin)"
+    )
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument(
+        "-c",
+        "--column",
+        help="the column to convert, by number (from 1) or by name with "
+        "--header (default: whole lines)",
+    )
+    parser.add_argument(
+        "-d", "--delimiter", default=",", help="the column delimiter (default: ',')"
+    )
+    parser.add_argument(
+        "--header",
+        action="store_true",
+        help="the first line of each file is a header, copied as it is",
+    )
+    parser.add_argument(
+        "-p",
+        "--parser",
+        choices=PARSERS,
+        default="parse",
+        help="parse (pendulum), when (dateparser, human input), any (ISO 8601, "
+        "pendulum, then dateparser) or iso (ISO 8601 only) (default: parse)",
+    )
+    parser.add_argument(
+        "-t",
+        "--timezone",
+        type=_timezone,
+        default="UTC",
+        help="timezone of timestamps without one (default: UTC)",
+    )
+    parser.add_argument(
+        "--day-first", action="store_true", help="parse ambiguous dates as day first"
+    )
+    parser.add_argument(
+        "--languages",
+        type=_languages,
+        help="comma-separated languages of the input for dateparser, e.g. en,de",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=sorted(FORMATS),
+        default="iso8601",
+        help="the output format (default: iso8601)",
+    )
+    parser.add_argument(
+        "--errors",
+        choices=ERROR_POLICIES,
+        default="fail",
+        help="what to do with values which cannot be parsed: fail, skip the line, "
+        "keep the value or blank it (default: fail)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--encoding", default="utf-8", help="input and output encoding (default: utf-8)"
+    )
+    return parser
+
+
+def _open_input(path, encoding):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding=encoding, newline="")
+
+    return io.open(path, encoding=encoding, newline="", buffering=BUFFER_SIZE)
+
+
+def _open_output(path, encoding):
+    if path is None:
+        return io.TextIOWrapper(sys.stdout.buffer, encoding=encoding, newline="")
+
+    return io.open(path, "w", encoding=encoding, newline="", buffering=BUFFER_SIZE)
+
+
+def _close(stream, path):
+    """Closes a file, but only detaches from stdin and stdout."""
+    if path in ("-", None):
+        if stream.writable():
+            stream.flush()
+        stream.detach()
+    else:
+        stream.close()
+
+
+def _convert(path, output, args):
+    """Converts one input file (or stdin) into the output."""
+    header = None
+    first_line_number = 1
+    if path == "-" or not os.path.isfile(path):
+        # Pipes cannot be memory-mapped, they are read as a stream.
+        source = _open_input(path, args.encoding)
+        try:
+            if args.header:
+                header = source.readline()
+                output.write(header)
+                first_line_number = 2
+            converter = _converter(args, header)
+            convert_stream(source, output, converter, args.workers, first_line_number)
+        finally:
+            _close(source, path)
+        return
+
+    start = 0
+    if args.header:
+        header, start = read_header(path, args.encoding)
+        output.write(header)
+        first_line_number = 2
+    convert_file(
+        path,
+        output,
+        _converter(args, header),
+        workers=args.workers,
+        start=start,
+        encoding=args.encoding,
+        first_line_number=first_line_number,
+    )
+
+
+def _converter(args, header):
+    return Converter(
+        parser=args.parser,
+        timezone=args.timezone,
+        day_first=args.day_first,
+        output_format=args.format,
+        column=_column(args.column, header, args.delimiter),
+        delimiter=args.delimiter,
+        errors=args.errors,
+        languages=args.languages,
+    )
+
+
+def main(argv=None):
+    """Runs the ``maya`` command and returns its exit status."""
+    args = build_parser().parse_args(argv)
+    if args.parser in ("when", "any") and args.workers > 1:
+        # Load dateparser's data once, before forking the workers.
+        warmup(languages=args.languages, timezone=args.timezone)
+
+    output = _open_output(args.output, args.encoding)
+    try:
+        for path in args.files:
+            _convert(path, output, args)
+    except (ValueError, IOError) as error:
+        sys.stderr.write("maya: {}\n".format(error))
+        return 1
+    finally:
+        _close(output, args.output)
+
+    return 0
@@ -2,6 +2,7 @@
 # || \/ | ||=|| \\// ||=||
 # ||    | || ||  //  || ||
 import email.utils
+import sys as _sys
 import time
 import functools
 from datetime import timedelta, datetime as Datetime
@@ -10,13 +11,17 @@ import re
 import pytz
 import humanize
 import dateparser
+from dateutil import parser as _dateutil_parser
 import pendulum
 import snaptime
 from tzlocal import get_localzone
-from dateutil.relativedelta import relativedelta
 from dateparser.languages.loader import default_loader
 
+from . import instrumentation as _instrumentation
 from .compat import cmp, comparable
+from .duration import Duration, add_months as _add_months
+from .icalendar import CRLF as _CRLF, format_utc as _format_utc
+from .timezones import utc_to_timezone as _utc_to_timezone
 
 
 def validate_class_type_arguments(operator):
@@ -118,6 +123,9 @@ class MayaDT(object):
         return hash(int(self.epoch))
 
     def __add__(self, duration):
+        if isinstance(duration, Duration):
+            return self._add_duration(duration)
+
         return self.add(seconds=_seconds_or_timedelta(duration).total_seconds())
 
     def __radd__(self, duration):
@@ -127,10 +135,21 @@ class MayaDT(object):
         if isinstance(duration_or_date, MayaDT):
             return self.subtract_date(dt=duration_or_date)
 
-        else:
-            return self.subtract(
-                seconds=_seconds_or_timedelta(duration_or_date).total_seconds()
-            )
+        if isinstance(duration_or_date, Duration):
+            return self._add_duration(-duration_or_date)
+
+        return self.subtract(
+            seconds=_seconds_or_timedelta(duration_or_date).total_seconds()
+        )
+
+    def _add_duration(self, duration):
+        """Returns a new MayaDT object the given Duration later."""
+        epoch = self._epoch
+        if duration.months:
+            epoch = self.from_datetime(
+                _add_months(self.datetime(), duration.months)
+            )._epoch
+        return MayaDT(epoch + duration.nanoseconds / 10**9)
 
     def add(self, **kwargs):
         """Returns a new MayaDT object with the given offsets."""
@@ -228,7 +247,7 @@ class MayaDT(object):
         """Returns MayaDT instance from Maya Long Count string."""
         days_since_creation = -1856305
         factors = (144000, 7200, 360, 20, 1)
-        for i, value in enumerate(long_count_string.split('.')):
+        for i, value in enumerate(long_count_string.split(".")):
             days_since_creation += int(value) * factors[i]
         days_since_creation *= 3600 * 24
         return klass(epoch=days_since_creation)
@@ -255,12 +274,14 @@ class MayaDT(object):
                             the tzinfo is simply dropped (default: False)
         """
         if to_timezone:
-            dt = self.datetime().astimezone(pytz.timezone(to_timezone))
+            dt = _utc_to_timezone(self.datetime(), to_timezone)
         else:
             try:
                 dt = Datetime.utcfromtimestamp(self._epoch)
-            except: # Fallback for before year 1970 issue
-                dt = Datetime.utcfromtimestamp(0) + timedelta(microseconds=self._epoch*1000000)
+            except:  # Fallback for before year 1970 issue
+                dt = Datetime.utcfromtimestamp(0) + timedelta(
+                    microseconds=self._epoch * 1000000
+                )
             dt.replace(tzinfo=self._tz)
         # Strip the timezone info if requested to do so.
         if naive:
@@ -279,16 +300,19 @@ class MayaDT(object):
         """
         return self.datetime(to_timezone=self.local_timezone, naive=False)
 
+    @_instrumentation.timed("format.iso8601")
     def iso8601(self):
         """Returns an ISO 8601 representation of the MayaDT."""
         # Get a timezone-naive datetime.
         dt = self.datetime(naive=True)
         return "{}Z".format(dt.isoformat())
 
+    @_instrumentation.timed("format.rfc2822")
     def rfc2822(self):
         """Returns an RFC 2822 representation of the MayaDT."""
         return email.utils.formatdate(self.epoch, usegmt=True)
 
+    @_instrumentation.timed("format.rfc3339")
     def rfc3339(self):
         """Returns an RFC 3339 representation of the MayaDT."""
         return self.datetime().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-5] + "Z"
@@ -307,7 +331,7 @@ class MayaDT(object):
             elif lc_date[i] < 0:
                 lc_date[i - 1] += int(lc_date[i] / caps[i])
                 lc_date[i] = 0
-        return '.'.join(str(i) for i in lc_date)
+        return ".".join(str(i) for i in lc_date)
 
     # Properties
     # ----------
@@ -361,8 +385,9 @@ class MayaDT(object):
 
     # Human Slang Extras
     # ------------------
+    @_instrumentation.timed("format.slang_date")
     def slang_date(self, locale="en"):
-        """"Returns human slang representation of date.
+        """Returns human slang representation of date.
 
         Keyword Arguments:
             locale -- locale to translate to, e.g. 'fr' for french.
@@ -385,8 +410,9 @@ class MayaDT(object):
 
         return dt.format(format_string, locale=locale).title()
 
+    @_instrumentation.timed("format.slang_time")
     def slang_time(self, locale="en"):
-        """"Returns human slang representation of time.
+        """Returns human slang representation of time.
 
         Keyword Arguments:
             locale -- locale to translate to, e.g. 'fr' for french.
@@ -465,7 +491,7 @@ class MayaInterval(object):
             raise ValueError("Exactly 2 of start, end, and duration must be specified")
 
         # Convert duration to timedelta if seconds were provided.
-        if duration:
+        if duration and not isinstance(duration, Duration):
             duration = _seconds_or_timedelta(duration)
         if not start:
             start = end - duration
@@ -477,6 +503,14 @@ class MayaInterval(object):
         self.start = start
         self.end = end
 
+    @classmethod
+    def _from_bounds(cls, start, end):
+        """Returns a MayaInterval for bounds which are known to be valid."""
+        interval = cls.__new__(cls)
+        interval.start = start
+        interval.end = end
+        return interval
+
     def __repr__(self):
         return "<MayaInterval start={0!r} end={1!r}>".format(self.start, self.end)
 
@@ -486,46 +520,67 @@ class MayaInterval(object):
 
     @classmethod
     def parse_iso8601_duration(cls, duration, start=None, end=None):
-        match = re.match(
-            r"(?:P(?P<weeks>\d+)W)|(?:P(?:(?:(?P<years>\d+)Y)?(?:(?P<months>\d+)M)?(?:(?P<days>\d+)D))?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?)",  # noqa
-            duration,
-        )
-
-        time_components = {}
-        if match:
-            time_components = match.groupdict(0)
-            for key, value in time_components.items():
-                time_components[key] = int(value)
-
-            duration = relativedelta(**time_components)
-
+        """Returns the MayaDT the given ISO 8601 duration after start (or
+        before end), or None if the duration is invalid."""
+        duration = _parse_iso8601_duration(duration)
+        if duration is not None:
             if start:
-                return parse(start.datetime() + duration)
+                return start + duration
 
             if end:
-                return parse(end.datetime() - duration)
+                return end - duration
 
         return None
 
     @classmethod
     def from_iso8601(cls, s):
-        # # Start and end, such as "2007-03-01T13:00:00Z/2008-05-11T15:30:00Z"
-        start, end = s.split("/")
-        try:
-            start = parse(start)
-        except pendulum.parsing.exceptions.ParserError:
-            # start = self._parse_iso8601_duration(start, end=end)
-            raise NotImplementedError()
+        """Returns the MayaInterval of an ISO 8601 time interval.
 
-        try:
-            end = parse(end)
-        except (pendulum.parsing.exceptions.ParserError, TypeError):
-            end = cls.parse_iso8601_duration(end, start=start)
+        Supports all forms of time intervals:
+            start and end, e.g. "2007-03-01T13:00:00Z/2008-05-11T15:30:00Z"
+                (the end may omit the leading parts it shares with the
+                start, e.g. "2007-12-14T13:30/15:30")
+            start and duration, e.g. "2007-03-01T13:00:00Z/P1Y2M10DT2H30M"
+            duration and end, e.g. "P1Y2M10DT2H30M/2008-05-11T15:30:00Z"
 
-        return cls(start=start, end=end)
+        Repeating intervals, e.g. "R5/2008-03-01T13:00:00Z/P1Y2M10DT2H30M",
+        return a lazy ``MayaIntervalRepetition`` instead.
+        """
+        parts = s.strip().split("/")
+        if _ISO8601_REPETITIONS.match(parts[0]):
+            count = parts[0][1:]
+            interval = cls.from_iso8601("/".join(parts[1:]))
+            backwards = parts[1].startswith("P")
+            duration = _parse_iso8601_duration(parts[1 if backwards else -1])
+            return MayaIntervalRepetition(
+                interval, duration, None if count == "" else int(count), backwards
+            )
 
-        # # Start and duration, such as "2007-03-01T13:00:00Z/P1Y2M10DT2H30M"
-        # # Duration and end, such as "P1Y2M10DT2H30M/2008-05-11T15:30:00Z"
+        if len(parts) != 2:
+            raise ValueError("invalid ISO 8601 time interval: {!r}".format(s))
+
+        first, second = parts
+        if any(_ISO8601_SIGNED_DURATION.match(part) for part in parts):
+            raise ValueError(
+                "ISO 8601 time intervals have no signed durations: {!r}".format(s)
+            )
+        if first.startswith("P"):
+            if second.startswith("P"):
+                raise ValueError("invalid ISO 8601 time interval: {!r}".format(s))
+            end = parse(second)
+            start = cls.parse_iso8601_duration(first, end=end)
+        else:
+            start = parse(first)
+            if second.startswith("P"):
+                end = cls.parse_iso8601_duration(second, start=start)
+            elif _ISO8601_FULL_DATE.match(second):
+                end = parse(second)
+            else:
+                end = parse(_complete_iso8601_end(first, second))
+        if start is None or end is None:
+            raise ValueError("invalid ISO 8601 duration: {!r}".format(s))
+
+        return cls(start=start, end=end)
 
     @validate_arguments_type_of_function()
     def __and__(self, maya_interval):
@@ -585,7 +640,7 @@ class MayaInterval(object):
 
     @validate_arguments_type_of_function()
     def subtract(self, maya_interval):
-        """"Removes the given interval."""
+        """Removes the given interval."""
         if not self & maya_interval:
             return [self]
 
@@ -600,20 +655,12 @@ class MayaInterval(object):
         return interval_list
 
     def split(self, duration, include_remainder=True):
-        # Convert seconds to timedelta, if appropriate.
-        duration = _seconds_or_timedelta(duration)
-        if duration <= timedelta(seconds=0):
-            raise ValueError("cannot call split with a non-positive timedelta")
+        """Returns a lazy sequence of consecutive intervals of the given duration.
 
-        start = self.start
-        while start < self.end:
-            if start + duration <= self.end:
-                yield MayaInterval(start, start + duration)
-
-            elif include_remainder:
-                yield MayaInterval(start, self.end)
-
-            start += duration
+        The chunk bounds are computed arithmetically, so the sequence
+        supports ``len()``, indexing, slicing and reverse iteration.
+        """
+        return MayaIntervalSplit(self, duration, include_remainder=include_remainder)
 
     def quantize(self, duration, snap_out=False, timezone="UTC"):
         """Returns a quantized interval."""
@@ -669,23 +716,16 @@ class MayaInterval(object):
 
     @property
     def icalendar(self):
-        ical_dt_format = "%Y%m%dT%H%M%SZ"
-        return (
-            """
-        BEGIN:VCALENDAR
-        VERSION:2.0
-        BEGIN:VEVENT
-        DTSTART:{0}
-        DTEND:{1}
-        END:VEVENT
-        END:VCALENDAR
-        """.format(
-                self.start.datetime().strftime(ical_dt_format),
-                self.end.datetime().strftime(ical_dt_format),
+        return _CRLF.join(
+            (
+                "BEGIN:VCALENDAR",
+                "VERSION:2.0",
+                "BEGIN:VEVENT",
+                "DTSTART:" + _format_utc(self.start._epoch),
+                "DTEND:" + _format_utc(self.end._epoch),
+                "END:VEVENT",
+                "END:VCALENDAR",
             )
-            .replace(" ", "")
-            .strip("\r\n")
-            .replace("\n", "\r\n")
         )
 
     @staticmethod
@@ -707,14 +747,375 @@ class MayaInterval(object):
         return cls(start=start, end=end, duration=duration)
 
 
+_MICROSECONDS = 10**6
+
+
+def _epoch_to_microseconds(epoch):
+    """Returns the given epoch in whole microseconds."""
+    return int(round(epoch * _MICROSECONDS))
+
+
+def _timedelta_to_microseconds(delta):
+    """Returns the given timedelta in whole microseconds."""
+    return (delta.days * 86400 + delta.seconds) * _MICROSECONDS + delta.microseconds
+
+
+def _truncated_seconds(microseconds):
+    """Returns ``int(microseconds / 10 ** 6)`` without going through floats."""
+    if microseconds < 0:
+        return -(-microseconds // _MICROSECONDS)
+
+    return microseconds // _MICROSECONDS
+
+
+def _microseconds_below(epoch):
+    """Returns the exclusive bound ``b`` in microseconds for which
+    ``int(x) < epoch`` holds exactly if ``x < b``.
+
+    MayaDT objects compare by their truncated epoch, this lets lazy
+    sequences reproduce those comparisons with integer arithmetic.
+    """
+    if epoch > 0:
+        return epoch * _MICROSECONDS
+
+    return (epoch - 1) * _MICROSECONDS + 1
+
+
+def _count_steps_below(start, step, bound):
+    """Returns the number of ``k >= 0`` for which ``start + k * step < bound``."""
+    if start >= bound:
+        return 0
+
+    return -(-(bound - start) // step)
+
+
+class _LazySequence(object):
+    """Base class for sequences whose items are computed from their index.
+
+    Subclasses implement ``_item(index)`` and keep the indices they cover
+    in a ``range``, which makes slicing and reversing cheap.
+    """
+
+    def __init__(self, indices):
+        self._indices = indices
+
+    def _item(self, index):
+        raise NotImplementedError()
+
+    def _with_indices(self, indices):
+        sequence = self.__class__.__new__(self.__class__)
+        sequence.__dict__.update(self.__dict__)
+        sequence._indices = indices
+        return sequence
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __iter__(self):
+        return map(self._item, self._indices)
+
+    def __reversed__(self):
+        return map(self._item, reversed(self._indices))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._with_indices(self._indices[index])
+
+        return self._item(self._indices[index])
+
+    def __repr__(self):
+        return "<{} length={}>".format(type(self).__name__, len(self))
+
+
+class MayaIntervalSplit(_LazySequence):
+    """
+    The lazy result of ``MayaInterval.split``: consecutive intervals of
+    a fixed duration, the last of which may be a shorter remainder.
+    """
+
+    def __init__(self, interval, duration, include_remainder=True):
+        # Convert seconds to timedelta, if appropriate.
+        duration = _seconds_or_timedelta(duration)
+        if duration <= timedelta(seconds=0):
+            raise ValueError("cannot call split with a non-positive timedelta")
+
+        self.interval = interval
+        self.duration = duration
+        self.include_remainder = include_remainder
+        self._start = _epoch_to_microseconds(interval.start._epoch)
+        self._step = _timedelta_to_microseconds(duration)
+
+        end = interval.end.epoch
+        starts = _count_steps_below(self._start, self._step, _microseconds_below(end))
+        # A chunk is complete if its end (the next start) is not after the end.
+        below_end = _microseconds_below(end + 1)
+        full = max(_count_steps_below(self._start, self._step, below_end) - 1, 0)
+        self._full = min(full, starts)
+        length = starts if include_remainder else self._full
+        super(MayaIntervalSplit, self).__init__(range(length))
+
+    def _bounds(self, index):
+        """Returns the start and end of a chunk in microseconds."""
+        start = self._start + index * self._step
+        if index < self._full:
+            return start, start + self._step
+
+        return start, None
+
+    def _item(self, index):
+        start, end = self._bounds(index)
+        end = self.interval.end if end is None else MayaDT(end / _MICROSECONDS)
+        return MayaInterval._from_bounds(MayaDT(start / _MICROSECONDS), end)
+
+    def to_array(self):
+        """Returns the chunks as an ``IntervalArray``."""
+        from array import array
+        from .arrays import EPOCH_TYPECODE, IntervalArray
+
+        end_epoch = self.interval.end.epoch
+        starts = array(EPOCH_TYPECODE)
+        ends = array(EPOCH_TYPECODE)
+        for index in self._indices:
+            start, end = self._bounds(index)
+            starts.append(_truncated_seconds(start))
+            ends.append(end_epoch if end is None else _truncated_seconds(end))
+        return IntervalArray._from_columns(starts, ends)
+
+
+class MayaIntervalRepetition(_LazySequence):
+    """
+    The lazy result of ``MayaInterval.from_iso8601`` for a repeating
+    interval ("R5/..."): consecutive intervals of the same duration,
+    starting with the given interval.
+
+    Intervals given by a duration and an end repeat backwards in time.
+    Without a number of repetitions ("R/...") the sequence is unbounded:
+    it can be iterated and sliced from the start, but has no length and
+    raises TypeError when reversed or indexed from the end.
+    """
+
+    def __init__(self, interval, duration=None, count=None, backwards=False):
+        if duration is None:
+            duration = interval.timedelta
+        self.interval = interval
+        self.duration = duration
+        self.count = count
+        self.backwards = backwards
+        self._anchor = (interval.end if backwards else interval.start).datetime()
+        super(MayaIntervalRepetition, self).__init__(
+            range(_sys.maxsize if count is None else count)
+        )
+
+    def _item(self, index):
+        if index == 0:
+            return self.interval
+
+        if self.backwards:
+            return MayaInterval._from_bounds(
+                MayaDT.from_datetime(self._anchor - self.duration * (index + 1)),
+                MayaDT.from_datetime(self._anchor - self.duration * index),
+            )
+
+        return MayaInterval._from_bounds(
+            MayaDT.from_datetime(self._anchor + self.duration * index),
+            MayaDT.from_datetime(self._anchor + self.duration * (index + 1)),
+        )
+
+    @property
+    def _unbounded(self):
+        return self.count is None and self._indices.stop == _sys.maxsize
+
+    def _check_bounded(self, operation):
+        if self._unbounded:
+            raise TypeError(
+                "an unbounded MayaIntervalRepetition has no {}".format(operation)
+            )
+
+    def __len__(self):
+        self._check_bounded("length")
+        return super(MayaIntervalRepetition, self).__len__()
+
+    def __reversed__(self):
+        self._check_bounded("end to reverse from")
+        return super(MayaIntervalRepetition, self).__reversed__()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            bounds = (index.start, index.stop, index.step)
+        else:
+            bounds = (index,)
+        if any(bound is not None and bound < 0 for bound in bounds):
+            self._check_bounded("end to index from")
+        return super(MayaIntervalRepetition, self).__getitem__(index)
+
+    def __repr__(self):
+        if self._unbounded:
+            return "<MayaIntervalRepetition unbounded>"
+
+        return super(MayaIntervalRepetition, self).__repr__()
+
+
+class MayaDTRange(_LazySequence):
+    """
+    A range of MayaDT objects from start (inclusive) to end (exclusive),
+    spaced by a fixed interval.
+    """
+
+    def __init__(self, start, end, interval):
+        interval = _seconds_or_timedelta(interval)
+        if interval <= timedelta(seconds=0):
+            raise ValueError("cannot create a range with a non-positive interval")
+
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self._start = _epoch_to_microseconds(start._epoch)
+        self._step = _timedelta_to_microseconds(interval)
+        length = _count_steps_below(
+            self._start, self._step, _microseconds_below(end.epoch)
+        )
+        super(MayaDTRange, self).__init__(range(length))
+
+    def _item(self, index):
+        if index == 0:
+            return self.start
+
+        return MayaDT((self._start + index * self._step) / _MICROSECONDS)
+
+    def __contains__(self, maya_dt):
+        if not isinstance(maya_dt, MayaDT):
+            return False
+
+        # MayaDTs are equal if their truncated epochs are, so look for
+        # the steps which fall into the same second as the given MayaDT.
+        epoch = maya_dt.epoch
+        first = _count_steps_below(self._start, self._step, _microseconds_below(epoch))
+        stop = _count_steps_below(
+            self._start, self._step, _microseconds_below(epoch + 1)
+        )
+        indices = self._indices if self._indices.step > 0 else self._indices[::-1]
+        if first > indices.start:
+            skip = -(-(first - indices.start) // indices.step)
+            first = indices.start + skip * indices.step
+        else:
+            first = indices.start
+        return first < stop and first in indices
+
+    def to_array(self):
+        """Returns the epochs of the range as a ``TimestampArray``."""
+        from array import array
+        from .arrays import EPOCH_TYPECODE, TimestampArray
+
+        start, step = self._start, self._step
+        return TimestampArray._from_column(
+            array(
+                EPOCH_TYPECODE,
+                [_truncated_seconds(start + index * step) for index in self._indices],
+            )
+        )
+
+
 def now():
     """Returns a MayaDT instance for this exact moment."""
     epoch = time.time()
     return MayaDT(epoch=epoch)
 
 
-def when(string, timezone="UTC", prefer_dates_from="current_period"):
-    """"Returns a MayaDT instance for the human moment specified.
+#: The languages and locales ``when`` is restricted to, see ``configure_when``.
+_when_defaults = {"languages": None, "locales": None}
+
+# A sample exercising dateparser's date, time and relative date parsing.
+_WARMUP_SAMPLE = "1 January 2000 10:00"
+
+
+def configure_when(languages=None, locales=None):
+    """Restricts the languages (e.g. ['en', 'de']) and/or locales (e.g.
+    ['en-GB']) ``when`` considers, for all calls which do not pass their
+    own. None (the default) lets dateparser detect the language among all
+    it knows, which is considerably slower.
+    """
+    _when_defaults["languages"] = None if languages is None else tuple(languages)
+    _when_defaults["locales"] = None if locales is None else tuple(locales)
+
+
+@dateparser.conf.apply_settings
+def _dateparser_settings(settings=None):
+    """Returns the dateparser Settings for a dict of settings."""
+    return settings
+
+
+@functools.lru_cache(maxsize=64)
+def _when_settings(timezone, prefer_dates_from):
+    """Returns the (shared) dateparser Settings for the given ``when`` options."""
+    return _dateparser_settings(
+        settings={
+            "TIMEZONE": timezone,
+            "RETURN_AS_TIMEZONE_AWARE": True,
+            "TO_TIMEZONE": "UTC",
+            "PREFER_DATES_FROM": prefer_dates_from,
+        }
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _date_data_parser(languages, locales, timezone, prefer_dates_from):
+    """Returns the (shared) dateparser parser for the given ``when`` options."""
+    return dateparser.DateDataParser(
+        languages=None if languages is None else list(languages),
+        locales=None if locales is None else list(locales),
+        # Only the given languages and locales, in every dateparser version.
+        try_previous_locales=False,
+        settings=_when_settings(timezone, prefer_dates_from),
+    )
+
+
+def _when_parser(timezone, prefer_dates_from, languages, locales):
+    if languages is None:
+        languages = _when_defaults["languages"]
+    if locales is None:
+        locales = _when_defaults["locales"]
+    return _date_data_parser(
+        None if languages is None else tuple(languages),
+        None if locales is None else tuple(locales),
+        timezone,
+        prefer_dates_from,
+    )
+
+
+def warmup(languages=None, locales=None, timezone="UTC"):
+    """Loads the dateparser data ``when`` needs for the given languages
+    and/or locales (default: those set with ``configure_when``, or all).
+
+    dateparser loads the data of a language the first time it is used.
+    Call this before forking worker processes, so that the data is loaded
+    once and shared, and the first requests are not slowed down by it.
+    """
+    if languages is None:
+        languages = _when_defaults["languages"]
+    if locales is None:
+        locales = _when_defaults["locales"]
+    _when_parser(timezone, "current_period", languages, locales).get_date_data(
+        _WARMUP_SAMPLE
+    )
+    settings = _when_settings(timezone, "current_period")
+    for locale in default_loader.get_locales(
+        languages=None if languages is None else list(languages),
+        locales=None if locales is None else list(locales),
+        allow_conflicting_locales=True,
+    ):
+        locale.translate(_WARMUP_SAMPLE, settings=settings)
+        locale.get_wordchars_for_detection(settings)
+
+
+@_instrumentation.timed("when")
+def when(
+    string,
+    timezone="UTC",
+    prefer_dates_from="current_period",
+    languages=None,
+    locales=None,
+):
+    """Returns a MayaDT instance for the human moment specified.
 
     Powered by dateparser. Useful for scraping websites.
 
@@ -727,26 +1128,51 @@ def when(string, timezone="UTC", prefer_dates_from="current_period"):
         prefer_dates_from -- what dates are preferred when `string` is ambiguous.
                              options are 'past', 'future', and 'current_period'
                              (default: 'current_period'). see: [1]
+        languages -- languages to consider, e.g. ['en', 'de']
+                     (default: as set with `configure_when`, or all)
+        locales -- locales to consider, e.g. ['en-GB']
+                   (default: as set with `configure_when`, or all)
 
     Reference:
         [1] dateparser.readthedocs.io/en/latest/usage.html#handling-incomplete-dates
     """
-    settings = {
-        "TIMEZONE": timezone,
-        "RETURN_AS_TIMEZONE_AWARE": True,
-        "TO_TIMEZONE": "UTC",
-        "PREFER_DATES_FROM": prefer_dates_from,
-    }
-
-    dt = dateparser.parse(string, settings=settings)
+    tracer = _instrumentation.when_tracer
+    if tracer is not None:
+        return _traced_when(
+            tracer, string, timezone, prefer_dates_from, languages, locales
+        )
+
+    parser = _when_parser(timezone, prefer_dates_from, languages, locales)
+    dt = parser.get_date_data(string)["date_obj"]
     if dt is None:
         raise ValueError("invalid datetime input specified.")
 
     return MayaDT.from_datetime(dt)
 
 
+def _traced_when(tracer, string, timezone, prefer_dates_from, languages, locales):
+    """``when`` recording the duration of each stage with the given tracer."""
+    clock = _instrumentation.clock
+    start = clock()
+    parser = _when_parser(timezone, prefer_dates_from, languages, locales)
+    setup = clock()
+    data = parser.get_date_data(string)
+    parsed = clock()
+    stages = {"setup": setup - start, "dateparser": parsed - setup}
+    dt = data["date_obj"]
+    if dt is None:
+        tracer.record(string, timezone, stages)
+        raise ValueError("invalid datetime input specified.")
+
+    maya_dt = MayaDT.from_datetime(dt)
+    stages["convert"] = clock() - parsed
+    tracer.record(string, timezone, stages, data["locale"], data["period"])
+    return maya_dt
+
+
+@_instrumentation.timed("parse")
 def parse(string, timezone="UTC", day_first=False, year_first=True, strict=False):
-    """"Returns a MayaDT instance for the machine-produced moment specified.
+    """Returns a MayaDT instance for the machine-produced moment specified.
 
     Powered by pendulum.
     Accepts most known formats. Useful for working with data.
@@ -769,24 +1195,102 @@ def parse(string, timezone="UTC", day_first=False, year_first=True, strict=False
     options["year_first"] = year_first
     options["strict"] = strict
 
-    dt = pendulum.parse(str(string), **options)
+    if strict or not _instrumentation.is_enabled():
+        dt = pendulum.parse(str(string), **options)
+    else:
+        # Count the strings pendulum cannot parse itself.
+        try:
+            dt = pendulum.parse(str(string), **dict(options, strict=True))
+        except ValueError:
+            _instrumentation.increment("parse.fallback")
+            dt = _parse_with_dateutil(str(string), timezone, day_first, year_first)
     return MayaDT.from_datetime(dt)
 
 
+def _parse_with_dateutil(string, timezone, day_first, year_first):
+    """Returns what pendulum's fallback on dateutil (``strict=False``) returns
+    for a string pendulum cannot parse itself, without trying pendulum's
+    own parsers again."""
+    try:
+        dt = _dateutil_parser.parse(string, dayfirst=day_first, yearfirst=year_first)
+    except (ValueError, OverflowError):
+        raise pendulum.parsing.exceptions.ParserError(
+            "Invalid date string: {}".format(string)
+        )
+
+    return pendulum.datetime(
+        dt.year,
+        dt.month,
+        dt.day,
+        dt.hour,
+        dt.minute,
+        dt.second,
+        dt.microsecond,
+        tz=dt.tzinfo or timezone,
+    )
+
+
+_ISO8601_REPETITIONS = re.compile(r"R\d*$")
+_ISO8601_FULL_DATE = re.compile(r"[+-]?\d{4}-?\d\d-?\d\d")
+_ISO8601_OFFSET = re.compile(r"(?:Z|[+-]\d\d(?::?\d\d)?)$")
+_ISO8601_SIGNED_DURATION = re.compile(r"[+-]P")
+
+
+def _complete_iso8601_end(start, end):
+    """Returns the end of an ISO 8601 time interval which omits the leading
+    components it shares with the start, e.g. '15:30' of
+    '2007-12-14T13:30/15:30', with those components taken from the start.
+    An end without offset has the offset of the start.
+
+    Raises ValueError for starts in basic format (e.g. '20071213T1330').
+    """
+    start_date, _, start_time = start.partition("T")
+    if "-" not in start_date:
+        # e.g. '1530' of '20071213T1330/1530' could be a date or a time.
+        raise ValueError(
+            "shortened ends of ISO 8601 time intervals in basic format are not "
+            "supported: {!r}".format(end)
+        )
+    if "T" in end or ":" not in end:
+        end_date, _, end_time = end.partition("T")
+        date = start_date[: len(start_date) - len(end_date)] + end_date
+    else:
+        date, end_time = start_date, end
+    if not end_time:
+        return date
+
+    offset = _ISO8601_OFFSET.search(start_time)
+    if offset is not None and not _ISO8601_OFFSET.search(end_time):
+        end_time += offset.group()
+    return "{}T{}".format(date, end_time)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_iso8601_duration(duration):
+    """Returns the Duration of an ISO 8601 duration (or None if invalid)."""
+    try:
+        return Duration.from_iso8601(duration)
+    except ValueError:
+        return None
+
+
 def _seconds_or_timedelta(duration):
     """Returns `datetime.timedelta` object for the passed duration.
 
     Keyword Arguments:
-        duration -- `datetime.timedelta` object or seconds in `int` format.
+        duration -- `datetime.timedelta` object, `maya.Duration` object
+                    without months or seconds in `int` format.
     """
     if isinstance(duration, int):
         dt_timedelta = timedelta(seconds=duration)
     elif isinstance(duration, timedelta):
         dt_timedelta = duration
+    elif isinstance(duration, Duration):
+        dt_timedelta = duration.to_timedelta()
     else:
         raise TypeError(
-            "Expects argument as `datetime.timedelta` object "
-            "or seconds in `int` format"
+            "Expects argument as `datetime.timedelta` object, `maya.Duration` "
+            "object or seconds in `int` format"
         )
 
     return dt_timedelta
@@ -804,12 +1308,9 @@ def _translate(dt, target_locale):
 
 def intervals(start, end, interval):
     """
-    Yields MayaDT objects between the start and end MayaDTs given,
-    at a given interval (seconds or timedelta).
-    """
-    interval = _seconds_or_timedelta(interval)
-    current_timestamp = start
-    while current_timestamp.epoch < end.epoch:
-        yield current_timestamp
+    Returns a range of MayaDT objects between the start and end MayaDTs
+    given, at a given interval (seconds or timedelta).
 
-        current_timestamp = current_timestamp.add(seconds=interval.total_seconds())
+    The returned MayaDTRange behaves like Python's ``range``.
+    """
+    return MayaDTRange(start, end, interval)
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+maya.cron
+~~~~~~~~~
+This module parses cron expressions and computes their fire times.
+
+An expression is compiled once into one bitset per field. The next fire
+time is found by jumping field by field (month, day, hour, minute) to the
+next set bit instead of scanning minute by minute.
+"""
+
+import calendar
+from datetime import date
+
+from .core import MayaDT
+from .timezones import _UNIX_EPOCH_ORDINAL, get_transition_table
+
+#: Shortcuts for common expressions.
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_MONTH_NAMES = {
+    name.upper(): number for number, name in enumerate(calendar.month_abbr) if name
+}
+_WEEKDAY_NAMES = {
+    "SUN": 0,
+    "MON": 1,
+    "TUE": 2,
+    "WED": 3,
+    "THU": 4,
+    "FRI": 5,
+    "SAT": 6,
+}
+
+# (name, lowest value, highest value, value names) of the five fields.
+_FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, _MONTH_NAMES),
+    ("day of week", 0, 7, _WEEKDAY_NAMES),
+)
+
+#: Years searched for a fire time before an expression is considered
+#: to never fire (a full cycle of the Gregorian calendar).
+_SEARCH_YEARS = 400
+
+
+def _next_bit(mask, value):
+    """Returns the lowest set bit of ``mask`` at or above ``value`` (or None)."""
+    mask >>= value
+    if not mask:
+        return None
+
+    return value + (mask & -mask).bit_length() - 1
+
+
+def _parse_value(value, field):
+    name, low, high, names = field
+    try:
+        number = names[value.upper()] if value.upper() in names else int(value)
+    except ValueError:
+        raise ValueError("invalid {} value: {!r}".format(name, value))
+
+    if not low <= number <= high:
+        raise ValueError("{} value out of range: {!r}".format(name, value))
+
+    return number
+
+
+def _parse_field(text, field):
+    """Returns the bitset of the values matched by a cron field."""
+    name, low, high, _ = field
+    mask = 0
+    for item in text.split(","):
+        item, _, step = item.partition("/")
+        step = int(step) if step else 1
+        if step < 1:
+            raise ValueError("invalid {} step: {!r}".format(name, text))
+
+        if item == "*":
+            start, stop = low, high
+        elif "-" in item:
+            start, stop = (_parse_value(value, field) for value in item.split("-", 1))
+        else:
+            start = _parse_value(item, field)
+            stop = high if step > 1 else start
+        if start > stop:
+            raise ValueError("invalid {} range: {!r}".format(name, text))
+
+        for value in range(start, stop + 1, step):
+            mask |= 1 << value
+    return mask
+
+
+class CronExpression(object):
+    """
+    A compiled cron expression ("minute hour day-of-month month day-of-week").
+
+    Fire times follow the wall-clock time of the given timezone. Like Vixie
+    cron, an expression restricting both day of month and day of week fires
+    on days matching either, and wall-clock times skipped by a DST gap do
+    not fire. Also like Vixie cron, wall-clock times occurring twice fire
+    at both occurrences if the minute or hour field is a wildcard or has a
+    step (e.g. '* * * * *' or '*/15 * * * *'), otherwise only at their
+    first occurrence.
+    """
+
+    def __init__(self, expression, timezone="UTC"):
+        self.expression = expression
+        self.timezone = timezone
+        fields = MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError("cron expressions have 5 fields: {!r}".format(expression))
+
+        masks = [_parse_field(text, field) for text, field in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = masks
+        # Sunday can be written as 0 or 7.
+        if self.weekdays & 1 << 7:
+            self.weekdays = (self.weekdays | 1) & 0x7F
+        self._days_restricted = not fields[2].startswith("*")
+        self._weekdays_restricted = not fields[4].startswith("*")
+        self._repeats = any(text.startswith("*") or "/" in text for text in fields[:2])
+        self._table = get_transition_table(timezone)
+        self._day_masks = {}
+
+    def __repr__(self):
+        return "<CronExpression {!r} timezone={!r}>".format(
+            self.expression, self.timezone
+        )
+
+    def _day_mask(self, year, month):
+        """Returns the bitset of the days of the month on which to fire."""
+        key = (year, month)
+        try:
+            return self._day_masks[key]
+        except KeyError:
+            pass
+
+        first_weekday, days = calendar.monthrange(year, month)
+        # calendar counts weekdays from Monday, cron from Sunday.
+        weekday = (first_weekday + 1) % 7
+        weekday_mask = 0
+        for day in range(1, days + 1):
+            if self.weekdays >> ((weekday + day - 1) % 7) & 1:
+                weekday_mask |= 1 << day
+        if self._days_restricted and self._weekdays_restricted:
+            mask = self.days | weekday_mask
+        elif self._weekdays_restricted:
+            mask = weekday_mask
+        else:
+            mask = self.days
+        mask &= (1 << (days + 1)) - 2
+        if len(self._day_masks) > 1024:
+            self._day_masks.clear()
+        self._day_masks[key] = mask
+        return mask
+
+    def _next_wall(self, year, month, day, hour, minute):
+        """Returns the first matching wall-clock time at or after the given one."""
+        last_year = year + _SEARCH_YEARS
+        while year <= last_year:
+            next_month = _next_bit(self.months, month)
+            if next_month is None:
+                year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+                continue
+            if next_month != month:
+                month, day, hour, minute = next_month, 1, 0, 0
+
+            next_day = _next_bit(self._day_mask(year, month), day)
+            if next_day is None:
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                day, hour, minute = 1, 0, 0
+                continue
+            if next_day != day:
+                day, hour, minute = next_day, 0, 0
+
+            next_hour = _next_bit(self.hours, hour)
+            if next_hour is None:
+                # Days past the end of the month match no bit of the day mask.
+                day, hour, minute = day + 1, 0, 0
+                continue
+            if next_hour != hour:
+                hour, minute = next_hour, 0
+
+            next_minute = _next_bit(self.minutes, minute)
+            if next_minute is None:
+                hour, minute = hour + 1, 0
+                continue
+
+            return year, month, day, hour, next_minute
+
+        raise ValueError("cron expression never fires: {!r}".format(self.expression))
+
+    def _first_fire(self, fields, epoch):
+        """Returns the first fire time after ``epoch`` of the wall-clock times
+        at or after the given fields, in their order."""
+        while True:
+            year, month, day, hour, minute = self._next_wall(*fields)
+            days = date(year, month, day).toordinal() - _UNIX_EPOCH_ORDINAL
+            wall_seconds = days * 86400 + hour * 3600 + minute * 60
+            fire = self._table.localize_wall(wall_seconds, "earliest", "NaT")
+            if fire <= epoch and self._repeats:
+                fire = self._table.localize_wall(wall_seconds, "latest", "NaT")
+            if fire > epoch:
+                return fire
+
+            # Skipped or already passed, continue after it.
+            fields = year, month, day, hour, minute + 1
+
+    def _fold(self, after, before):
+        """Returns the index of the first transition after ``after`` and not
+        after ``before`` which turns the clocks back (or None)."""
+        transitions, offsets = self._table.transitions, self._table.offsets
+        for index in range(self._table.index(after) + 1, len(transitions)):
+            if transitions[index] > before:
+                return None
+            if offsets[index] < offsets[index - 1]:
+                return index
+        return None
+
+    def next_after(self, dt):
+        """Returns the first fire time after the given MayaDT."""
+        epoch = dt.epoch
+        wall = dt.datetime(to_timezone=self.timezone, naive=True)
+        fields = wall.year, wall.month, wall.day, wall.hour, wall.minute + 1
+        after = epoch
+        while True:
+            fire = self._first_fire(fields, epoch)
+            fold = self._fold(after, fire) if self._repeats else None
+            if fold is None:
+                return MayaDT(fire)
+
+            # No fire time is left before the clocks are turned back, the
+            # wall-clock times repeated after it come first.
+            after = self._table.transitions[fold]
+            wall_seconds = after + self._table.offsets[fold] + 59
+            days, seconds = divmod(wall_seconds, 86400)
+            day = date.fromordinal(days + _UNIX_EPOCH_ORDINAL)
+            fields = day.year, day.month, day.day, seconds // 3600, seconds // 60 % 60
+
+    def next_n(self, dt, n):
+        """Returns the next ``n`` fire times after the given MayaDT."""
+        fire_times = []
+        for _ in range(n):
+            dt = self.next_after(dt)
+            fire_times.append(dt)
+        return fire_times
+
+    def matches(self, dt):
+        """Returns whether the expression fires at the minute of the given MayaDT."""
+        wall = dt.datetime(to_timezone=self.timezone, naive=True)
+        bits = (
+            self.minutes >> wall.minute,
+            self.hours >> wall.hour,
+            self.months >> wall.month,
+            self._day_mask(wall.year, wall.month) >> wall.day,
+        )
+        return all(bit & 1 for bit in bits)
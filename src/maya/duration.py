@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+maya.duration
+~~~~~~~~~~~~~
+This module provides ``Duration``, an immutable length of time made of
+calendar months and a fixed number of nanoseconds.
+
+Both parts are plain integers, so arithmetic, comparisons and hashing
+never go through ``timedelta`` or ``relativedelta``. Days and weeks are
+fixed (24 hours and 7 days), years are 12 months.
+"""
+
+import calendar
+import re
+from datetime import datetime as Datetime
+from datetime import timedelta
+
+_NANOSECONDS = {
+    "weeks": 7 * 86400 * 10**9,
+    "days": 86400 * 10**9,
+    "hours": 3600 * 10**9,
+    "minutes": 60 * 10**9,
+    "seconds": 10**9,
+    "milliseconds": 10**6,
+    "microseconds": 10**3,
+    "nanoseconds": 1,
+}
+
+_ISO8601 = re.compile(
+    r"(?P<sign>[+-])?P(?:(?P<weeks>\d+(?:[.,]\d+)?)W"
+    r"|(?:(?P<years>\d+)Y)?(?:(?P<months>\d+)M)?(?:(?P<days>\d+(?:[.,]\d+)?)D)?"
+    r"(?:T(?=\d)(?:(?P<hours>\d+(?:[.,]\d+)?)H)?(?:(?P<minutes>\d+(?:[.,]\d+)?)M)?"
+    r"(?:(?P<seconds>\d+(?:[.,]\d+)?)S)?)?)$"
+)
+
+
+def _to_nanoseconds(value, unit):
+    """Returns a (possibly fractional) number of units in nanoseconds."""
+    if isinstance(value, int):
+        return value * _NANOSECONDS[unit]
+
+    return int(round(value * _NANOSECONDS[unit]))
+
+
+def _microseconds(nanoseconds):
+    """Returns nanoseconds as microseconds, truncated towards zero."""
+    if nanoseconds < 0:
+        return -(-nanoseconds // 1000)
+
+    return nanoseconds // 1000
+
+
+def add_months(dt, months):
+    """Returns the datetime the given number of calendar months later.
+
+    Like ``relativedelta``, days beyond the end of the resulting month
+    are clipped to its last day.
+    """
+    month = dt.month - 1 + months
+    year = dt.year + month // 12
+    month = month % 12 + 1
+    day = min(dt.day, calendar.monthrange(year, month)[1])
+    return dt.replace(year=year, month=month, day=day)
+
+
+class Duration(object):
+    """
+    An immutable duration of calendar months plus a fixed length of time.
+
+    Keyword Arguments:
+        years, months -- calendar months (integers, a year is 12 months)
+        weeks, days, hours, minutes, seconds, milliseconds, microseconds,
+        nanoseconds -- the fixed part, which may be fractional
+
+    Adding a Duration to a datetime (or MayaDT) first adds the months,
+    then the fixed part. Durations with months can only be compared for
+    equality, their length in seconds depends on where they are applied.
+    """
+
+    __slots__ = ("_months", "_nanoseconds")
+
+    def __init__(
+        self,
+        years=0,
+        months=0,
+        weeks=0,
+        days=0,
+        hours=0,
+        minutes=0,
+        seconds=0,
+        milliseconds=0,
+        microseconds=0,
+        nanoseconds=0,
+    ):
+        if not (isinstance(years, int) and isinstance(months, int)):
+            raise TypeError("years and months must be integers")
+
+        fixed = (
+            (weeks, "weeks"),
+            (days, "days"),
+            (hours, "hours"),
+            (minutes, "minutes"),
+            (seconds, "seconds"),
+            (milliseconds, "milliseconds"),
+            (microseconds, "microseconds"),
+            (nanoseconds, "nanoseconds"),
+        )
+        self._months = years * 12 + months
+        self._nanoseconds = sum(
+            _to_nanoseconds(value, unit) for value, unit in fixed if value
+        )
+
+    @classmethod
+    def _from_parts(cls, months, nanoseconds):
+        duration = cls.__new__(cls)
+        duration._months = months
+        duration._nanoseconds = nanoseconds
+        return duration
+
+    @classmethod
+    def from_timedelta(cls, delta):
+        """Returns the Duration of a timedelta."""
+        microseconds = (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds
+        return cls._from_parts(0, microseconds * 1000)
+
+    @classmethod
+    def from_iso8601(cls, string):
+        """Returns the Duration of an ISO 8601 duration, e.g. 'P1Y2M10DT2H30M'.
+
+        A leading '-' negates the duration.
+        """
+        match = _ISO8601.match(string.strip())
+        if not match:
+            raise ValueError("invalid ISO 8601 duration: {!r}".format(string))
+
+        components = match.groupdict()
+        sign = components.pop("sign")
+        kwargs = {}
+        for key, value in components.items():
+            if value is not None:
+                value = value.replace(",", ".")
+                kwargs[key] = float(value) if "." in value else int(value)
+        if not kwargs:
+            raise ValueError("invalid ISO 8601 duration: {!r}".format(string))
+
+        duration = cls(**kwargs)
+        return -duration if sign == "-" else duration
+
+    @property
+    def months(self):
+        """Returns the calendar months of the Duration."""
+        return self._months
+
+    @property
+    def nanoseconds(self):
+        """Returns the fixed part of the Duration in nanoseconds."""
+        return self._nanoseconds
+
+    def _check_fixed(self):
+        if self._months:
+            raise ValueError(
+                "a Duration with months has no fixed length: {}".format(self)
+            )
+
+    def total_seconds(self):
+        """Returns the length of a Duration without months in seconds."""
+        self._check_fixed()
+        return self._nanoseconds / 10**9
+
+    def to_timedelta(self):
+        """Returns a Duration without months as a timedelta (truncated to
+        microseconds)."""
+        self._check_fixed()
+        return timedelta(microseconds=_microseconds(self._nanoseconds))
+
+    def iso8601(self):
+        """Returns an ISO 8601 representation of the Duration."""
+        months, nanoseconds = self._months, self._nanoseconds
+        if months * nanoseconds < 0:
+            raise ValueError(
+                "ISO 8601 cannot represent mixed signs: months={} nanoseconds={}".format(
+                    months, nanoseconds
+                )
+            )
+
+        sign = "-" if months < 0 or nanoseconds < 0 else ""
+        years, months = divmod(abs(months), 12)
+        days, nanoseconds = divmod(abs(nanoseconds), _NANOSECONDS["days"])
+        hours, nanoseconds = divmod(nanoseconds, _NANOSECONDS["hours"])
+        minutes, nanoseconds = divmod(nanoseconds, _NANOSECONDS["minutes"])
+        seconds, nanoseconds = divmod(nanoseconds, _NANOSECONDS["seconds"])
+
+        date = ""
+        for value, designator in ((years, "Y"), (months, "M"), (days, "D")):
+            if value:
+                date += "{}{}".format(value, designator)
+        time = ""
+        for value, designator in ((hours, "H"), (minutes, "M")):
+            if value:
+                time += "{}{}".format(value, designator)
+        if nanoseconds:
+            time += "{}.{}S".format(seconds, "{:09d}".format(nanoseconds).rstrip("0"))
+        elif seconds:
+            time += "{}S".format(seconds)
+        if not (date or time):
+            return "PT0S"
+
+        return "{}P{}{}".format(sign, date, "T" + time if time else "")
+
+    def __repr__(self):
+        return "<Duration {}>".format(self)
+
+    def __str__(self):
+        try:
+            return self.iso8601()
+        except ValueError:
+            return "months={} nanoseconds={}".format(self._months, self._nanoseconds)
+
+    def __eq__(self, other):
+        if isinstance(other, timedelta):
+            other = Duration.from_timedelta(other)
+        if not isinstance(other, Duration):
+            return NotImplemented
+
+        return self._months == other._months and self._nanoseconds == other._nanoseconds
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        # Durations equal to a timedelta must hash like it.
+        if self._months == 0 and self._nanoseconds % 1000 == 0:
+            try:
+                return hash(timedelta(microseconds=self._nanoseconds // 1000))
+            except OverflowError:
+                pass
+        return hash((self._months, self._nanoseconds))
+
+    def _fixed_nanoseconds(self, other):
+        """Returns the nanoseconds of both Durations for ordering them."""
+        if isinstance(other, timedelta):
+            other = Duration.from_timedelta(other)
+        if not isinstance(other, Duration):
+            raise TypeError(
+                "unorderable types: Duration() and {}()".format(type(other).__name__)
+            )
+
+        self._check_fixed()
+        other._check_fixed()
+        return self._nanoseconds, other._nanoseconds
+
+    def __lt__(self, other):
+        a, b = self._fixed_nanoseconds(other)
+        return a < b
+
+    def __le__(self, other):
+        a, b = self._fixed_nanoseconds(other)
+        return a <= b
+
+    def __gt__(self, other):
+        a, b = self._fixed_nanoseconds(other)
+        return a > b
+
+    def __ge__(self, other):
+        a, b = self._fixed_nanoseconds(other)
+        return a >= b
+
+    def __bool__(self):
+        return bool(self._months or self._nanoseconds)
+
+    __nonzero__ = __bool__
+
+    def __neg__(self):
+        return Duration._from_parts(-self._months, -self._nanoseconds)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self._months < 0 or self._nanoseconds < 0 else self
+
+    def __add__(self, other):
+        if isinstance(other, timedelta):
+            other = Duration.from_timedelta(other)
+        if isinstance(other, Duration):
+            return Duration._from_parts(
+                self._months + other._months, self._nanoseconds + other._nanoseconds
+            )
+
+        if isinstance(other, Datetime):
+            if self._months:
+                other = add_months(other, self._months)
+            return other + timedelta(microseconds=_microseconds(self._nanoseconds))
+
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, (timedelta, Duration)):
+            return self + -other
+
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, (timedelta, Datetime)):
+            return other + -self
+
+        return NotImplemented
+
+    def __mul__(self, factor):
+        if not isinstance(factor, int):
+            return NotImplemented
+
+        return Duration._from_parts(self._months * factor, self._nanoseconds * factor)
+
+    __rmul__ = __mul__
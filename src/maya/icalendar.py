@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+maya.icalendar
+~~~~~~~~~~~~~~
+This module writes intervals as iCalendar (RFC 5545) events and reads
+them back.
+
+``ICalendarWriter`` streams a single VCALENDAR to a file-like object one
+VEVENT at a time, so exporting many intervals needs constant memory.
+UTC date-times are formatted with integer arithmetic instead of
+``strftime``. Reading works line by line as well, ``read_intervals``
+yields a MayaInterval per VEVENT as soon as it has been read.
+"""
+
+import re
+import time
+import uuid
+from array import array
+from datetime import date as Date
+
+from .timezones import _UNIX_EPOCH_ORDINAL, _civil_from_days, get_transition_table
+
+#: The default PRODID of written calendars.
+PRODID = "-//maya//maya//EN"
+
+CRLF = "\r\n"
+
+# Lines longer than this many octets (without the line break) are folded.
+_LINE_OCTETS = 75
+
+_TEXT_ESCAPES = (("\\", "\\\\"), (";", "\\;"), (",", "\\,"), ("\n", "\\n"))
+
+
+def format_utc(epoch):
+    """Returns the iCalendar UTC date-time (e.g. 20180325T013000Z) of an epoch."""
+    days, seconds = divmod(int(epoch // 1), 86400)
+    year, month, day = _civil_from_days(days)
+    return "{:04d}{:02d}{:02d}T{:02d}{:02d}{:02d}Z".format(
+        year, month, day, seconds // 3600, seconds // 60 % 60, seconds % 60
+    )
+
+
+def escape_text(text):
+    """Returns text escaped for use as an iCalendar TEXT value."""
+    for character, escaped in _TEXT_ESCAPES:
+        text = text.replace(character, escaped)
+    return text
+
+
+def fold_line(line):
+    """Returns a content line folded into lines of at most 75 octets."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= _LINE_OCTETS:
+        return line
+
+    parts = []
+    start = 0
+    limit = _LINE_OCTETS
+    while len(encoded) - start > limit:
+        end = start + limit
+        # Do not split multi-byte characters.
+        while encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        # Continuation lines start with a space.
+        limit = _LINE_OCTETS - 1
+    parts.append(encoded[start:].decode("utf-8"))
+    return (CRLF + " ").join(parts)
+
+
+def _epoch(dt):
+    """Returns the epoch of a MayaDT or number."""
+    return getattr(dt, "_epoch", dt)
+
+
+def _bounds(intervals):
+    """Yields the (start, end) epochs of MayaIntervals or an IntervalArray."""
+    if hasattr(intervals, "starts"):
+        return zip(intervals.starts, intervals.ends)
+
+    return ((_epoch(i.start), _epoch(i.end)) for i in intervals)
+
+
+class ICalendarWriter(object):
+    """
+    Writes a VCALENDAR with one VEVENT per interval to a file-like object.
+
+    Keyword Arguments:
+        fileobj -- a text file-like object; files should be opened with
+                   ``newline=""`` so the CRLF line breaks are kept
+        prodid -- the PRODID of the calendar (default: PRODID)
+        properties -- optional extra calendar properties, e.g.
+                      ``{"X-WR-CALNAME": "Deployments"}``
+
+    Usage:
+        with open("events.ics", "w", newline="") as f:
+            with ICalendarWriter(f) as writer:
+                writer.write_events(intervals)
+    """
+
+    def __init__(self, fileobj, prodid=PRODID, properties=None):
+        self.fileobj = fileobj
+        self.prodid = prodid
+        self.properties = dict(properties or {})
+        self.count = 0
+        self._uid_prefix = uuid.uuid4().hex
+        self._dtstamp = format_utc(time.time())
+        self._started = False
+        self._closed = False
+
+    def __repr__(self):
+        return "<ICalendarWriter count={}>".format(self.count)
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def begin(self):
+        """Writes the start of the calendar (done by the first event otherwise)."""
+        if self._started:
+            return
+
+        self._started = True
+        lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:" + escape_text(self.prodid)]
+        lines.extend(
+            fold_line("{}:{}".format(name, value))
+            for name, value in self.properties.items()
+        )
+        self.fileobj.write(CRLF.join(lines) + CRLF)
+
+    def _event(self, start, end, summary=None, description=None, uid=None):
+        self.count += 1
+        if uid is None:
+            uid = "{}-{}@maya".format(self._uid_prefix, self.count)
+        lines = [
+            "BEGIN:VEVENT",
+            fold_line("UID:" + uid),
+            "DTSTAMP:" + self._dtstamp,
+            "DTSTART:" + format_utc(start),
+            "DTEND:" + format_utc(end),
+        ]
+        if summary is not None:
+            lines.append(fold_line("SUMMARY:" + escape_text(summary)))
+        if description is not None:
+            lines.append(fold_line("DESCRIPTION:" + escape_text(description)))
+        lines.append("END:VEVENT")
+        return CRLF.join(lines) + CRLF
+
+    def write_event(self, interval, summary=None, description=None, uid=None):
+        """Writes a single MayaInterval as a VEVENT.
+
+        Keyword Arguments:
+            interval -- the MayaInterval of the event
+            summary -- optional SUMMARY of the event
+            description -- optional DESCRIPTION of the event
+            uid -- the UID of the event (default: unique per writer and event)
+        """
+        if self._closed:
+            raise ValueError("the calendar has already been closed")
+
+        self.begin()
+        self.fileobj.write(
+            self._event(
+                _epoch(interval.start), _epoch(interval.end), summary, description, uid
+            )
+        )
+
+    def write_events(self, intervals, summaries=None):
+        """Writes a VEVENT for each of the given MayaIntervals (or each
+        interval of an IntervalArray).
+
+        Keyword Arguments:
+            intervals -- an iterable of MayaIntervals or an IntervalArray
+            summaries -- an optional iterable of SUMMARY texts, one per interval
+        """
+        if self._closed:
+            raise ValueError("the calendar has already been closed")
+
+        self.begin()
+        write = self.fileobj.write
+        if summaries is None:
+            for start, end in _bounds(intervals):
+                write(self._event(start, end))
+        else:
+            for (start, end), summary in zip(_bounds(intervals), summaries):
+                write(self._event(start, end, summary))
+
+    def close(self):
+        """Writes the end of the calendar, the file object is left open."""
+        if self._closed:
+            return
+
+        self.begin()
+        self.fileobj.write("END:VCALENDAR" + CRLF)
+        self._closed = True
+
+
+def write_calendar(fileobj, intervals, **kwargs):
+    """Writes a VCALENDAR with one VEVENT per interval and returns the
+    number of events written. See ``ICalendarWriter``."""
+    with ICalendarWriter(fileobj, **kwargs) as writer:
+        writer.write_events(intervals)
+    return writer.count
+
+
+_DATE_TIME = re.compile(r"(\d{4})(\d\d)(\d\d)(?:T(\d\d)(\d\d)(\d\d)(Z?))?$")
+
+_DURATION = re.compile(
+    r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+
+
+def _unfold(lines):
+    """Yields the content lines of iCalendar data with folding undone."""
+    current = None
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current += line[1:]
+            continue
+
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _parse_content_line(line):
+    """Returns the name, parameters and value of a content line."""
+    # The value starts at the first colon outside of quoted parameter values.
+    quoted = False
+    for index, character in enumerate(line):
+        if character == '"':
+            quoted = not quoted
+        elif character == ":" and not quoted:
+            break
+    else:
+        raise ValueError("invalid iCalendar content line: {!r}".format(line))
+
+    name, *parameters = line[:index].split(";")
+    params = {}
+    for parameter in parameters:
+        key, _, value = parameter.partition("=")
+        params[key.upper()] = value.strip('"')
+    return name.upper(), params, line[index + 1 :]
+
+
+def parse_duration(value):
+    """Returns the (days, seconds) of an iCalendar DURATION value.
+
+    Days (and weeks) are nominal, they are added in wall-clock time.
+    """
+    match = _DURATION.match(value.strip())
+    if not match or not any(match.groups()[1:]):
+        raise ValueError("invalid iCalendar duration: {!r}".format(value))
+
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    sign = -1 if sign == "-" else 1
+    days = int(weeks or 0) * 7 + int(days or 0)
+    seconds = int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds or 0)
+    return sign * days, sign * seconds
+
+
+class _Localizer(object):
+    """Converts DATE and DATE-TIME values to epochs, caching timezones."""
+
+    def __init__(self, timezone, tzids):
+        self.timezone = timezone
+        self.tzids = dict(tzids or {})
+        self._tables = {}
+
+    def table(self, tzid):
+        try:
+            return self._tables[tzid]
+        except KeyError:
+            pass
+
+        zone = self.tzids.get(tzid, tzid)
+        try:
+            table = get_transition_table(zone)
+        except KeyError:
+            raise ValueError("unknown iCalendar TZID: {!r}".format(tzid))
+
+        self._tables[tzid] = table
+        return table
+
+    def wall(self, value, params):
+        """Returns the wall-clock seconds, the table to localize them with
+        (None for UTC) and whether the value is a DATE."""
+        match = _DATE_TIME.match(value.strip())
+        if not match:
+            raise ValueError("invalid iCalendar date-time: {!r}".format(value))
+
+        year, month, day, hour, minute, second, utc = match.groups()
+        days = Date(int(year), int(month), int(day)).toordinal() - _UNIX_EPOCH_ORDINAL
+        wall = days * 86400
+        is_date = hour is None or params.get("VALUE") == "DATE"
+        if hour is not None:
+            wall += int(hour) * 3600 + int(minute) * 60 + int(second)
+        if utc:
+            return wall, None, is_date
+
+        return wall, self.table(params.get("TZID", self.timezone)), is_date
+
+    @staticmethod
+    def localize(wall, table):
+        """Returns the epoch of a wall-clock time, resolving wall-clock times
+        around DST transitions like ``maya.Recurrence``."""
+        if table is None:
+            return wall
+
+        epoch = table.localize_wall(wall, "earliest", "shift_forward")
+        if epoch + table.utcoffset(epoch) != wall:
+            epoch = wall - table.utcoffset(epoch - 1)
+        return epoch
+
+
+def iter_bounds(fileobj, timezone="UTC", tzids=None):
+    """Yields the (start, end) epochs of the VEVENTs of iCalendar data.
+
+    Keyword Arguments:
+        fileobj -- a file-like object (text or binary) or any iterable of lines
+        timezone -- the timezone of floating date-times and dates, which
+                    have neither a UTC designator nor a TZID (default: 'UTC')
+        tzids -- an optional mapping of TZIDs to timezone names, for TZIDs
+                 which are not timezone names themselves
+
+    Events without DTEND or DURATION end when they start, or a day later
+    if their start is a DATE.
+    """
+    localizer = _Localizer(timezone, tzids)
+    depth = 0
+    event = None
+    for line in _unfold(fileobj):
+        name, params, value = _parse_content_line(line)
+        if name == "BEGIN":
+            depth += 1
+            if value.upper() == "VEVENT" and event is None:
+                event, event_depth = {}, depth
+        elif name == "END":
+            if event is not None and depth == event_depth:
+                yield _event_bounds(event, localizer)
+                event = None
+            depth -= 1
+        elif event is not None and depth == event_depth:
+            if name in ("DTSTART", "DTEND", "DURATION"):
+                event[name] = (value, params)
+
+
+def _event_bounds(event, localizer):
+    if "DTSTART" not in event:
+        raise ValueError("VEVENT without DTSTART")
+
+    wall, table, is_date = localizer.wall(*event["DTSTART"])
+    start = localizer.localize(wall, table)
+    if "DTEND" in event:
+        end = localizer.localize(*localizer.wall(*event["DTEND"])[:2])
+    elif "DURATION" in event:
+        days, seconds = parse_duration(event["DURATION"][0])
+        end = localizer.localize(wall + days * 86400, table) + seconds
+    elif is_date:
+        end = localizer.localize(wall + 86400, table)
+    else:
+        end = start
+    return start, end
+
+
+def read_intervals(fileobj, timezone="UTC", tzids=None):
+    """Yields a MayaInterval for each VEVENT of iCalendar data, see
+    ``iter_bounds``."""
+    from .core import MayaDT, MayaInterval
+
+    for start, end in iter_bounds(fileobj, timezone, tzids):
+        yield MayaInterval(start=MayaDT(start), end=MayaDT(end))
+
+
+def read_interval_array(fileobj, timezone="UTC", tzids=None):
+    """Returns an IntervalArray of the VEVENTs of iCalendar data, see
+    ``iter_bounds``."""
+    from .arrays import EPOCH_TYPECODE, IntervalArray
+
+    starts = array(EPOCH_TYPECODE)
+    ends = array(EPOCH_TYPECODE)
+    for start, end in iter_bounds(fileobj, timezone, tzids):
+        starts.append(start)
+        ends.append(end)
+    return IntervalArray(starts, ends)
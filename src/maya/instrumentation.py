@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""
+maya.instrumentation
+~~~~~~~~~~~~~~~~~~~~
+This module counts and times maya's hot paths: parsing (``parse`` and
+``when``), formatting and timezone conversion.
+
+Instrumentation is off by default, and while it is off maya's functions
+are not wrapped at all. Turning it on globally with ``enable()``, or for
+a block of code with ``collect()``, replaces them with instrumented ones
+in maya's modules and classes::
+
+    with maya.instrumentation.collect() as metrics:
+        maya.parse("2018-03-25T01:30:00Z")
+    metrics.counters["parse.calls"]  # 1
+
+References to maya's functions taken elsewhere while it is off (e.g. with
+``from maya import parse``) keep calling the uninstrumented functions.
+
+Listeners added with ``add_listener`` receive every observation while
+instrumentation is on, e.g. to forward it to a metrics system.
+
+Independently of that, ``trace_when`` keeps the slowest ``when`` calls
+(with their input, detected locale and the time spent per stage) in a
+bounded ring buffer, to find inputs worth handling differently.
+"""
+
+import contextlib
+import functools
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+#: The clock used for timings.
+clock = time.perf_counter
+
+# Upper bounds (in seconds) of the histogram buckets: 1us to ~67s,
+# doubling from one bucket to the next, plus one for everything slower.
+BUCKET_BOUNDS = tuple(1e-6 * 2**i for i in range(27)) + (float("inf"),)
+
+#: A ``when`` call recorded by a ``WhenTracer``. ``stages`` maps the
+#: stages of the call ('setup', 'dateparser' and 'convert') to their
+#: duration, ``stage`` is the slowest of them. ``locale`` and ``period``
+#: are as detected by dateparser (None if the input could not be parsed).
+WhenTrace = namedtuple(
+    "WhenTrace", "input timezone duration locale period stage stages timestamp"
+)
+
+# The registries observations are recorded into, empty while off.
+_registries = []
+_listeners = []
+_global_registry = None
+
+#: The active ``WhenTracer`` (or None).
+when_tracer = None
+
+# The functions decorated with ``timed``, mapped to their instrumented
+# wrappers, and whether the wrappers are currently in place.
+_wrappers = {}
+_installed = False
+_install_lock = threading.RLock()
+
+
+class Histogram(object):
+    """A timing histogram with fixed, exponentially growing buckets."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * len(BUCKET_BOUNDS)
+
+    def __repr__(self):
+        return "<Histogram count={} sum={:.6f}>".format(self.count, self.sum)
+
+    def observe(self, seconds):
+        """Records a duration in seconds."""
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        for index, bound in enumerate(BUCKET_BOUNDS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+
+    @property
+    def mean(self):
+        """Returns the mean duration (or None if nothing was recorded)."""
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, percent):
+        """Returns the upper bound of the bucket containing the given
+        percentile, capped at the maximum (or None if nothing was recorded)."""
+        if not self.count:
+            return None
+
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+        }
+
+
+class Registry(object):
+    """Counters and timing histograms by name."""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<Registry counters={} histograms={}>".format(
+            len(self.counters), len(self.histograms)
+        )
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            try:
+                histogram = self.histograms[name]
+            except KeyError:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """Returns the counters, histograms and cache statistics as a dict."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: histogram.as_dict()
+                    for name, histogram in self.histograms.items()
+                },
+                "caches": cache_info(),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+def cache_info():
+    """Returns the statistics of maya's caches."""
+    from .core import _parse_iso8601_duration
+    from .timezones import offset_cache_info
+
+    return {
+        "timezone_offsets": offset_cache_info()._asdict(),
+        "iso8601_durations": _parse_iso8601_duration.cache_info()._asdict(),
+    }
+
+
+def is_enabled():
+    """Returns whether observations are currently recorded."""
+    return bool(_registries)
+
+
+def _rebind(replacements):
+    """Replaces functions by the given mapping (keyed by their ids) wherever
+    maya's modules and the classes defined in them refer to them."""
+    for module_name, module in list(sys.modules.items()):
+        if module is None or module_name.split(".")[0] != "maya":
+            continue
+
+        namespaces = [module]
+        for value in list(vars(module).values()):
+            if isinstance(value, type) and value.__module__ == module_name:
+                namespaces.append(value)
+        for namespace in namespaces:
+            for attribute, value in list(vars(namespace).items()):
+                replacement = replacements.get(id(value))
+                if replacement is not None and replacement[0] is value:
+                    setattr(namespace, attribute, replacement[1])
+
+
+def _update():
+    """Puts the instrumented wrappers in place while any registry is active,
+    and the original functions otherwise."""
+    global _installed
+    with _install_lock:
+        if bool(_registries) == _installed:
+            return
+
+        _installed = not _installed
+        if _installed:
+            pairs = _wrappers.items()
+        else:
+            pairs = [(wrapper, function) for function, wrapper in _wrappers.items()]
+        _rebind({id(old): (old, new) for old, new in pairs})
+
+
+def enable():
+    """Starts recording into the global registry and returns it."""
+    global _global_registry
+    with _install_lock:
+        if _global_registry is None:
+            _global_registry = Registry()
+        if _global_registry not in _registries:
+            _registries.append(_global_registry)
+        _update()
+    return _global_registry
+
+
+def disable():
+    """Stops recording into the global registry (its data is kept)."""
+    with _install_lock:
+        if _global_registry in _registries:
+            _registries.remove(_global_registry)
+        _update()
+
+
+def registry():
+    """Returns the global registry (or None if never enabled)."""
+    return _global_registry
+
+
+def snapshot():
+    """Returns a snapshot of the global registry, see ``Registry.snapshot``."""
+    return (_global_registry or Registry()).snapshot()
+
+
+def reset():
+    """Clears the counters and histograms of the global registry."""
+    if _global_registry is not None:
+        _global_registry.reset()
+
+
+@contextlib.contextmanager
+def collect():
+    """Records into a new registry for the duration of the block.
+
+    Collection scopes can be nested and coexist with ``enable()``; each
+    active registry receives every observation.
+    """
+    collector = Registry()
+    with _install_lock:
+        _registries.append(collector)
+        _update()
+    try:
+        yield collector
+    finally:
+        with _install_lock:
+            _registries.remove(collector)
+            _update()
+
+
+def add_listener(listener):
+    """Registers ``listener(kind, name, value)``, called for each observation
+    while instrumentation is on. ``kind`` is 'counter' (with the increment
+    as value) or 'timing' (with the duration in seconds)."""
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    _listeners.remove(listener)
+
+
+def increment(name, value=1):
+    """Increments a counter of all active registries."""
+    for active in list(_registries):
+        active.increment(name, value)
+    for listener in list(_listeners):
+        listener("counter", name, value)
+
+
+def observe(name, seconds):
+    """Records a duration in all active registries."""
+    for active in list(_registries):
+        active.observe(name, seconds)
+    for listener in list(_listeners):
+        listener("timing", name, seconds)
+
+
+def timed(name):
+    """Decorates a function to count its calls ('<name>.calls') and errors
+    ('<name>.errors') and to time it ('<name>') while instrumentation is on.
+
+    The function itself is returned unchanged: the instrumented wrapper
+    only replaces it while instrumentation is on.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                increment(name + ".errors")
+                raise
+            finally:
+                observe(name, clock() - start)
+                increment(name + ".calls")
+
+        _wrappers[function] = wrapper
+        return function
+
+    return decorator
+
+
+class WhenTracer(object):
+    """Keeps the ``when`` calls slower than ``threshold`` seconds, up to
+    ``capacity`` of them (the oldest are dropped first)."""
+
+    def __init__(self, threshold=0.05, capacity=256):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.calls = 0
+        self._traces = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<WhenTracer threshold={} traces={}>".format(
+            self.threshold, len(self._traces)
+        )
+
+    def __len__(self):
+        return len(self._traces)
+
+    def record(self, text, timezone, stages, locale=None, period=None):
+        """Records a ``when`` call if its stages took longer than the threshold."""
+        duration = sum(stages.values())
+        with self._lock:
+            self.calls += 1
+            if duration < self.threshold:
+                return
+
+            stage = max(stages, key=stages.get)
+            self._traces.append(
+                WhenTrace(
+                    text, timezone, duration, locale, period, stage, stages, time.time()
+                )
+            )
+
+    def traces(self):
+        """Returns the recorded calls, oldest first."""
+        with self._lock:
+            return list(self._traces)
+
+    def slowest(self, n=10):
+        """Returns the ``n`` slowest recorded calls, slowest first."""
+        return sorted(self.traces(), key=lambda trace: trace.duration, reverse=True)[:n]
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+def trace_when(threshold=0.05, capacity=256):
+    """Starts tracing ``when`` calls slower than ``threshold`` seconds and
+    returns the ``WhenTracer`` holding them."""
+    global when_tracer
+    when_tracer = WhenTracer(threshold, capacity)
+    return when_tracer
+
+
+def stop_tracing_when():
+    """Stops tracing ``when`` calls and returns the tracer (or None)."""
+    global when_tracer
+    tracer, when_tracer = when_tracer, None
+    return tracer
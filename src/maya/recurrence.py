@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+maya.recurrence
+~~~~~~~~~~~~~~~
+This module provides recurrence rules (RFC 5545 RRULEs), e.g.
+"every 2nd Tuesday at 09:00 in Europe/Berlin", producing MayaDTs lazily.
+
+Occurrences are computed in the wall-clock time of the rule's timezone by
+dateutil's rrule. Querying a window jumps straight to the rule's period
+containing the window instead of iterating from the start of the rule.
+"""
+
+import calendar
+from collections import OrderedDict
+from datetime import timedelta
+
+import pytz
+from dateutil import rrule as _rrule
+
+from .core import MayaDT, MayaInterval, _seconds_or_timedelta, parse
+
+#: Names of the supported frequencies.
+FREQUENCIES = {
+    "yearly": _rrule.YEARLY,
+    "monthly": _rrule.MONTHLY,
+    "weekly": _rrule.WEEKLY,
+    "daily": _rrule.DAILY,
+    "hourly": _rrule.HOURLY,
+    "minutely": _rrule.MINUTELY,
+    "secondly": _rrule.SECONDLY,
+}
+
+_WEEKDAYS = {
+    "MO": _rrule.MO,
+    "TU": _rrule.TU,
+    "WE": _rrule.WE,
+    "TH": _rrule.TH,
+    "FR": _rrule.FR,
+    "SA": _rrule.SA,
+    "SU": _rrule.SU,
+}
+
+_MARGIN = timedelta(days=1)
+
+_PERIOD_SECONDS = {_rrule.HOURLY: 3600, _rrule.MINUTELY: 60, _rrule.SECONDLY: 1}
+
+
+def _parse_weekday(value):
+    """Returns the dateutil weekday for an RRULE weekday like 'TU' or '-1FR'."""
+    weekday = _WEEKDAYS[value[-2:].upper()]
+    if len(value) > 2:
+        return weekday(int(value[:-2]))
+
+    return weekday
+
+
+def _parse_integers(value):
+    return tuple(int(part) for part in value.split(","))
+
+
+class Recurrence(object):
+    """
+    A recurrence rule producing MayaDT occurrences.
+
+    Keyword Arguments:
+        freq -- 'yearly', 'monthly', 'weekly', 'daily', 'hourly',
+                'minutely' or 'secondly'
+        dtstart -- MayaDT of the first occurrence
+        timezone -- timezone whose wall-clock time the rule follows
+                    (default: 'UTC')
+        interval -- the number of periods between occurrences (default: 1)
+        count -- the maximum number of occurrences (default: unlimited)
+        until -- MayaDT after which there are no occurrences
+        duration -- seconds or timedelta, used by ``intervals``
+        cache_size -- the number of ``between`` windows kept (default: 128)
+        **rules -- dateutil rrule arguments like ``byweekday``, ``byhour``,
+                   ``bymonthday``, ``bysetpos`` or ``wkst``
+
+    Like RFC 5545, wall-clock times which occur twice use their first
+    occurrence and wall-clock times skipped by a DST gap are interpreted
+    with the UTC offset before the gap.
+    """
+
+    def __init__(
+        self,
+        freq,
+        dtstart,
+        timezone="UTC",
+        interval=1,
+        count=None,
+        until=None,
+        duration=None,
+        cache_size=128,
+        **rules
+    ):
+        if not isinstance(freq, int):
+            freq = FREQUENCIES[freq.lower()]
+
+        self.freq = freq
+        self.dtstart = dtstart
+        self.timezone = timezone
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.duration = None if duration is None else _seconds_or_timedelta(duration)
+        self.cache_size = cache_size
+        self._tz = pytz.timezone(timezone)
+        self._wall_start = dtstart.datetime(to_timezone=timezone, naive=True).replace(
+            microsecond=0
+        )
+        self._wall_until = (
+            None if until is None else until.datetime(to_timezone=timezone, naive=True)
+        )
+        self._rules = dict(rules)
+        self._rules.setdefault("wkst", calendar.firstweekday())
+        self._rule = self._make_rule(self._wall_start, count=count)
+        self._pinned_rules = self._pin_defaults()
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_rrule(cls, rule, dtstart, timezone="UTC", **kwargs):
+        """Returns a Recurrence for an RFC 5545 RRULE value.
+
+        Example:
+            Recurrence.from_rrule("FREQ=WEEKLY;INTERVAL=2;BYDAY=TU;BYHOUR=9",
+                                  dtstart, timezone="Europe/Berlin")
+        """
+        arguments = {}
+        for part in rule.upper().replace("RRULE:", "").split(";"):
+            if not part:
+                continue
+            name, _, value = part.partition("=")
+            if name == "FREQ":
+                arguments["freq"] = value.lower()
+            elif name in ("INTERVAL", "COUNT"):
+                arguments[name.lower()] = int(value)
+            elif name == "UNTIL":
+                arguments["until"] = parse(value)
+            elif name == "BYDAY":
+                arguments["byweekday"] = tuple(
+                    _parse_weekday(day) for day in value.split(",")
+                )
+            elif name == "WKST":
+                arguments["wkst"] = _WEEKDAYS[value].weekday
+            elif name in (
+                "BYMONTH",
+                "BYMONTHDAY",
+                "BYYEARDAY",
+                "BYWEEKNO",
+                "BYHOUR",
+                "BYMINUTE",
+                "BYSECOND",
+                "BYSETPOS",
+            ):
+                arguments[name.lower()] = _parse_integers(value)
+            else:
+                raise ValueError("unsupported RRULE part: {}".format(part))
+
+        if "freq" not in arguments:
+            raise ValueError("RRULE requires a FREQ")
+
+        arguments.update(kwargs)
+        return cls(dtstart=dtstart, timezone=timezone, **arguments)
+
+    def __repr__(self):
+        return "<Recurrence freq={} interval={} dtstart={!r} timezone={!r}>".format(
+            _rrule.FREQNAMES[self.freq], self.interval, self.dtstart, self.timezone
+        )
+
+    def _make_rule(self, wall_start, count=None, rules=None):
+        return _rrule.rrule(
+            self.freq,
+            dtstart=wall_start,
+            interval=self.interval,
+            count=count,
+            until=self._wall_until,
+            **(self._rules if rules is None else rules)
+        )
+
+    def _pin_defaults(self):
+        """Returns the rule arguments with the values dateutil derives from
+        dtstart made explicit, so the rule can be restarted at any period."""
+        rules = dict(self._rules)
+        start = self._wall_start
+        if not any(
+            rules.get(name) is not None
+            for name in ("byweekno", "byyearday", "bymonthday", "byweekday", "byeaster")
+        ):
+            if self.freq == _rrule.YEARLY:
+                if rules.get("bymonth") is None:
+                    rules["bymonth"] = start.month
+                rules["bymonthday"] = start.day
+            elif self.freq == _rrule.MONTHLY:
+                rules["bymonthday"] = start.day
+            elif self.freq == _rrule.WEEKLY:
+                rules["byweekday"] = start.weekday()
+        for name, freq, value in (
+            ("byhour", _rrule.HOURLY, start.hour),
+            ("byminute", _rrule.MINUTELY, start.minute),
+            ("bysecond", _rrule.SECONDLY, start.second),
+        ):
+            if rules.get(name) is None and self.freq < freq:
+                rules[name] = value
+        return rules
+
+    def _period_start(self, wall):
+        """Returns the start of the first period of the rule that is at most
+        a whole number of intervals before the period containing ``wall``."""
+        start = self._wall_start
+        if self.freq == _rrule.YEARLY:
+            periods = wall.year - start.year
+        elif self.freq == _rrule.MONTHLY:
+            periods = (wall.year - start.year) * 12 + wall.month - start.month
+        elif self.freq in (_rrule.WEEKLY, _rrule.DAILY):
+            start = start.replace(hour=0, minute=0, second=0)
+            if self.freq == _rrule.WEEKLY:
+                start -= timedelta(days=(start.weekday() - self._rules["wkst"]) % 7)
+                periods = (wall - start).days // 7
+            else:
+                periods = (wall - start).days
+        else:
+            seconds = _PERIOD_SECONDS[self.freq]
+            start -= timedelta(seconds=(start.minute * 60 + start.second) % seconds)
+            periods = int((wall - start).total_seconds()) // seconds
+
+        periods -= periods % self.interval
+        if periods <= 0:
+            return None
+
+        midnight = start.replace(hour=0, minute=0, second=0)
+        if self.freq == _rrule.YEARLY:
+            return midnight.replace(year=start.year + periods, month=1, day=1)
+        if self.freq == _rrule.MONTHLY:
+            month = start.month - 1 + periods
+            return midnight.replace(
+                year=start.year + month // 12, month=month % 12 + 1, day=1
+            )
+        if self.freq == _rrule.WEEKLY:
+            return start + timedelta(weeks=periods)
+        if self.freq == _rrule.DAILY:
+            return start + timedelta(days=periods)
+        return start + timedelta(seconds=periods * _PERIOD_SECONDS[self.freq])
+
+    def _rule_from(self, wall):
+        """Returns a rule producing (at least) all occurrences from ``wall`` on."""
+        if self.count is not None:
+            return self._rule
+
+        anchor = self._period_start(wall)
+        if anchor is None:
+            return self._rule
+
+        return self._make_rule(anchor, rules=self._pinned_rules)
+
+    def _to_maya(self, wall):
+        """Returns the MayaDT of a wall-clock time in the rule's timezone."""
+        try:
+            dt = self._tz.localize(wall, is_dst=None)
+        except pytz.AmbiguousTimeError:
+            dt = self._tz.localize(wall, is_dst=True)
+        except pytz.NonExistentTimeError:
+            dt = self._tz.localize(wall, is_dst=False)
+        return MayaDT.from_datetime(dt)
+
+    def _walls_from(self, start):
+        """Yields the wall-clock times of the occurrences around and after
+        the given MayaDT."""
+        # Start a day early, timezone offsets change by less than that.
+        wall = start.datetime(to_timezone=self.timezone, naive=True) - _MARGIN
+        for occurrence in self._rule_from(wall):
+            if occurrence >= wall:
+                yield occurrence
+
+    def __iter__(self):
+        return (self._to_maya(occurrence) for occurrence in self._rule)
+
+    def after(self, dt, inc=False):
+        """Returns the first occurrence after (or at, if ``inc``) the given MayaDT."""
+        found = None
+        last_wall = None
+        for wall in self._walls_from(dt):
+            if last_wall is not None and wall > last_wall:
+                break
+            occurrence = self._to_maya(wall)
+            if occurrence > dt or (inc and occurrence == dt):
+                if found is None or occurrence < found:
+                    found = occurrence
+                # Later wall-clock times can still map to an earlier
+                # instant around a DST gap, so keep looking a bit further.
+                last_wall = last_wall or wall + _MARGIN * 2
+        return found
+
+    def between(self, start, end):
+        """Returns the occurrences from start (inclusive) to end (exclusive)."""
+        key = (start.epoch, end.epoch)
+        try:
+            occurrences = self._cache.pop(key)
+        except KeyError:
+            last_wall = end.datetime(to_timezone=self.timezone, naive=True) + _MARGIN
+            occurrences = []
+            for wall in self._walls_from(start):
+                if wall > last_wall:
+                    break
+                occurrence = self._to_maya(wall)
+                if start <= occurrence < end:
+                    occurrences.append(occurrence)
+            occurrences = tuple(sorted(occurrences))
+
+        self._cache[key] = occurrences
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return list(occurrences)
+
+    def intervals(self, start, end):
+        """Returns MayaIntervals of the rule's duration for the occurrences
+        from start (inclusive) to end (exclusive)."""
+        if self.duration is None:
+            raise ValueError("intervals requires a Recurrence with a duration")
+
+        return [
+            MayaInterval(start=occurrence, duration=self.duration)
+            for occurrence in self.between(start, end)
+        ]
+
+    def clear_cache(self):
+        """Forgets the occurrences of previously queried windows."""
+        self._cache.clear()
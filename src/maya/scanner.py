@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+maya.scanner
+~~~~~~~~~~~~
+This module finds and parses the dates and times mentioned in text or
+HTML documents, e.g. scraped web pages.
+
+A single regular expression locates the candidates (ISO 8601 and RFC 2822
+timestamps, numeric dates, English dates like 'March 25, 2018 at 10:30
+am' and relative dates like '3 days ago'), so the expensive parsers only
+ever see strings which look like dates. Candidates are parsed by the
+cheapest parser able to handle their form and are skipped if that fails,
+e.g. '2018-13-45'.
+
+Documents can be scanned at once with ``scan`` or fed in chunks of any
+size with ``TimestampScanner.feed``, e.g. while reading a large file.
+"""
+
+import email.utils
+import html
+import re
+from collections import namedtuple
+
+from .core import MayaDT, parse, when
+
+#: A date or time found in a document: the span (``start`` and ``end``
+#: offsets into the document), the ``text`` of it and its MayaDT.
+TimestampMatch = namedtuple("TimestampMatch", "start end text dt")
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_WEEKDAY = (
+    r"(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?"
+    r"|fri(?:day)?|sat(?:urday)?|sun(?:day)?)"
+)
+# Whitespace, including the non-breaking spaces of HTML documents.
+_SPACE = r"(?:\s|&nbsp;|&#160;){1,3}"
+_DAY = r"(?:[12]\d|3[01]|0?[1-9])(?:st|nd|rd|th)?"
+_TIME = (
+    r"(?:[01]?\d|2[0-3]):[0-5]\d(?::[0-5]\d)?(?:(?:{space})?(?:[ap]m|[ap]\.m\.))?"
+    r"|(?:1[0-2]|0?[1-9])(?:{space})?(?:[ap]m|[ap]\.m\.)"
+).format(space=_SPACE)
+_AT_TIME = r"(?:,?{space}(?:at{space})?(?:{time}))?".format(space=_SPACE, time=_TIME)
+
+_CANDIDATES = re.compile(
+    r"(?<![\w.:/-])(?:"
+    # ISO 8601 / RFC 3339, e.g. 2018-03-25T01:30:00+02:00
+    r"(?P<iso>\d{{4}}-[01]\d-[0-3]\d"
+    r"(?:[T ][0-2]\d:[0-5]\d(?::[0-5]\d(?:[.,]\d{{1,9}})?)?(?:Z|[+-][0-2]\d:?[0-5]\d)?)?)"
+    # RFC 2822, e.g. Sun, 25 Mar 2018 01:30:00 +0200
+    r"|(?P<rfc2822>(?:{weekday},?{space})?{day}{space}{month}{space}\d{{4}}{space}"
+    r"[0-2]\d:[0-5]\d(?::[0-5]\d)?{space}(?:[+-]\d{{4}}|GMT|UTC|UT|[ECMP][SD]T|Z))"
+    # Numeric dates, e.g. 03/25/2018 or 25.03.2018
+    r"|(?P<numeric>[0-3]?\d[/.][0-3]?\d[/.]\d{{4}}(?:,?{space}(?:{time}))?)"
+    # English dates, e.g. Sunday, March 25th, 2018 at 10:30 am or 25 March 2018
+    r"|(?P<human>(?:{weekday},?{space})?"
+    r"(?:{month}{space}{day},?{space}\d{{4}}|{day}{space}(?:of{space})?{month},?{space}\d{{4}})"
+    r"{at_time})"
+    # Relative dates, e.g. 3 days ago, yesterday at 5pm
+    r"|(?P<relative>(?:\d{{1,4}}|an?){space}(?:second|minute|hour|day|week|month|year)s?"
+    r"{space}ago|(?:yesterday|today|tomorrow){at_time})"
+    r")(?![\w:/-]|\.\d)".format(
+        weekday=_WEEKDAY,
+        month=_MONTH,
+        day=_DAY,
+        space=_SPACE,
+        time=_TIME,
+        at_time=_AT_TIME,
+    ),
+    re.IGNORECASE,
+)
+
+# Every candidate contains a hint (a number or one of the relative words)
+# at most _LOOKBACK characters after its start. Hints are searched in the
+# lowercased text, which is much faster than searching candidates.
+_HINTS = re.compile(r"\d+|yesterday|today|tomorrow|ago\b")
+_LOOKBACK = 64
+# The positions a candidate can start at.
+_WORD_STARTS = re.compile(r"(?<![\w.:/-])[^\W_]")
+
+# The longest text a candidate can span. Chunks are only scanned up to
+# this many characters before their end until more input arrives.
+_MAX_CANDIDATE_LENGTH = 256
+# The length of the windows searched where hints are dense.
+_WINDOW_LENGTH = 2048
+# The characters kept before the scan position for the lookbehind.
+_CONTEXT_LENGTH = 8
+# The number of parsed candidates a scanner remembers.
+_CACHE_SIZE = 4096
+
+
+def _candidates(text, position=0, end=None):
+    """Yields the regular expression matches of the candidates starting in
+    ``text[position:end]``, like ``_CANDIDATES.finditer`` would."""
+    if end is None:
+        end = len(text)
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Lowercasing moved the offsets of the hints, match everywhere.
+        for match in _CANDIDATES.finditer(text, position):
+            if match.start() >= end:
+                return
+            yield match
+        return
+
+    length = len(text)
+    while True:
+        hint = _HINTS.search(lowered, position, end + _LOOKBACK)
+        if hint is None:
+            return
+
+        lowest = max(position, hint.start() - _LOOKBACK)
+        if lowest >= end:
+            return
+
+        if hint.start() - position > _LOOKBACK:
+            # A lone hint: only try the words before it.
+            for start in _WORD_STARTS.finditer(text, lowest, hint.start() + 1):
+                if start.start() >= end:
+                    return
+                match = _CANDIDATES.match(text, start.start())
+                if match is not None:
+                    yield match
+                    position = match.end()
+                    break
+            else:
+                position = hint.end()
+            continue
+
+        # Hints follow each other closely (e.g. in tables of numbers), so
+        # it is cheaper to search a window of the text at once. Matches too
+        # close to the end of the window may be cut short by it and are
+        # matched again in the full text.
+        window = min(hint.end() + _WINDOW_LENGTH, length)
+        match = _CANDIDATES.search(text, lowest, window)
+        if match is None:
+            position = max(window - _MAX_CANDIDATE_LENGTH, hint.end())
+            continue
+
+        start = match.start()
+        if start >= end:
+            return
+        if window < length and start + _MAX_CANDIDATE_LENGTH > window:
+            match = _CANDIDATES.match(text, start)
+            if match is None:
+                position = start + 1
+                continue
+        yield match
+        position = match.end()
+
+
+class TimestampScanner(object):
+    """
+    Finds the dates and times in text, at once (``scan``) or fed in chunks
+    (``feed`` and ``close``).
+
+    Keyword Arguments:
+        timezone -- timezone of dates and times without one (default: 'UTC')
+        day_first -- parse numeric dates like 05/03/2018 as day first
+                     (default: False)
+        relative -- include relative dates like '3 days ago', which are
+                    relative to the current time (default: True)
+    """
+
+    def __init__(self, timezone="UTC", day_first=False, relative=True):
+        self.timezone = timezone
+        self.day_first = day_first
+        self.relative = relative
+        self._cache = {}
+        self._buffer = ""
+        self._offset = 0
+        self._position = 0
+
+    def __repr__(self):
+        return "<TimestampScanner timezone={!r}>".format(self.timezone)
+
+    def _parse(self, kind, text):
+        """Returns the MayaDT of a candidate (or None if it is no date)."""
+        if kind == "relative":
+            # Relative dates depend on the current time, so they are not cached.
+            return self._parse_uncached(kind, text)
+
+        key = (kind, text)
+        try:
+            return self._cache[key]
+        except KeyError:
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            dt = self._cache[key] = self._parse_uncached(kind, text)
+            return dt
+
+    def _parse_uncached(self, kind, text):
+        text = " ".join(html.unescape(text).split())
+        try:
+            if kind == "iso":
+                return parse(text, timezone=self.timezone)
+
+            if kind == "rfc2822":
+                parsed = email.utils.parsedate_tz(text)
+                if parsed is not None and parsed[9] is not None:
+                    return MayaDT(email.utils.mktime_tz(parsed))
+
+            if kind == "numeric":
+                return parse(text, timezone=self.timezone, day_first=self.day_first)
+
+            # Candidates are English, so dateparser needs no language detection.
+            return when(text, timezone=self.timezone, languages=["en"])
+        except ValueError:
+            return None
+
+    def _matches(self, text, position, limit, offset):
+        """Yields the matches starting in ``text[position:limit]``."""
+        for match in _candidates(text, position, limit):
+            kind = match.lastgroup
+            if kind == "relative" and not self.relative:
+                continue
+
+            dt = self._parse(kind, match.group())
+            if dt is not None:
+                yield TimestampMatch(
+                    match.start() + offset, match.end() + offset, match.group(), dt
+                )
+
+    def iter_scan(self, text):
+        """Yields a TimestampMatch for each date or time in the text."""
+        return self._matches(text, 0, None, 0)
+
+    def scan(self, text):
+        """Returns a list of TimestampMatches for the dates and times in the
+        text, in the order they appear."""
+        return list(self.iter_scan(text))
+
+    def feed(self, chunk):
+        """Returns the TimestampMatches completed by the next chunk of input.
+
+        Their offsets are relative to the start of all input fed so far.
+        A date spanning two chunks is found once the second one was fed.
+        """
+        buffer = self._buffer + chunk
+        limit = max(len(buffer) - _MAX_CANDIDATE_LENGTH, self._position)
+        matches = []
+        position = self._position
+        for match in self._matches(buffer, position, limit, self._offset):
+            matches.append(match)
+            position = match.end - self._offset
+        self._keep(buffer, max(position, limit))
+        return matches
+
+    def close(self):
+        """Returns the TimestampMatches in the remaining input and resets the
+        scanner for a new document."""
+        matches = list(self._matches(self._buffer, self._position, None, self._offset))
+        self._buffer = ""
+        self._offset = 0
+        self._position = 0
+        return matches
+
+    def _keep(self, buffer, position):
+        """Keeps the part of the buffer which may still contain candidates."""
+        cut = max(position - _CONTEXT_LENGTH, 0)
+        self._buffer = buffer[cut:]
+        self._offset += cut
+        self._position = position - cut
+
+
+def scan(text, timezone="UTC", day_first=False, relative=True):
+    """Returns a list of TimestampMatches (spans, texts and MayaDTs) for the
+    dates and times in a text or HTML document.
+
+    Keyword Arguments:
+        text -- the text to scan
+        timezone -- timezone of dates and times without one (default: 'UTC')
+        day_first -- parse numeric dates like 05/03/2018 as day first
+                     (default: False)
+        relative -- include relative dates like '3 days ago' (default: True)
+    """
+    return TimestampScanner(timezone, day_first, relative).scan(text)
+
+
+def scan_stream(chunks, timezone="UTC", day_first=False, relative=True):
+    """Yields the TimestampMatches in a document given as an iterable of
+    chunks, e.g. a file object, without holding the whole document in
+    memory. See ``scan`` for the keyword arguments."""
+    scanner = TimestampScanner(timezone, day_first, relative)
+    for chunk in chunks:
+        for match in scanner.feed(chunk):
+            yield match
+
+    for match in scanner.close():
+        yield match
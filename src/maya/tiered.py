@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+maya.tiered
+~~~~~~~~~~~
+This module parses strings of unknown format by trying an ordered chain of
+parsing strategies, from the cheapest to the most lenient:
+
+    'iso' -- ISO 8601 / RFC 3339 timestamps, without any parsing library
+    'pendulum' -- ``maya.parse``, for other machine-produced formats
+    'dateparser' -- ``maya.when``, for human input like 'next week'
+
+The first strategy which succeeds wins. As values from the same source
+(e.g. a column of a file) usually share their format, the winning strategy
+of a source is tried first for its next value. Each parser counts the
+attempts and hits per strategy, see ``TieredParser.stats``.
+"""
+
+import calendar
+import re
+import threading
+from datetime import datetime as Datetime
+
+import pendulum
+
+from . import instrumentation
+from .core import MayaDT, parse, when
+
+_ISO8601 = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)"
+    r"(?:[T ](\d\d):(\d\d)(?::(\d\d)(?:[.,](\d{1,6})\d*)?)?(Z|[+-]\d\d(?::?\d\d)?)?)?$"
+)
+
+
+def parse_iso8601(string, timezone="UTC"):
+    """Returns a MayaDT for an ISO 8601 date or timestamp in extended format,
+    e.g. '2018-03-25T01:30:00.5+02:00', without going through a parsing
+    library. Timestamps without offset are in the given timezone.
+
+    Raises ValueError for everything else.
+    """
+    match = _ISO8601.match(string.strip())
+    if match is None:
+        raise ValueError("not an ISO 8601 timestamp: {!r}".format(string))
+
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    fields = (
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+    )
+    microseconds = int(fraction.ljust(6, "0")) if fraction else 0
+    if offset is None and timezone != "UTC":
+        # Local times are localized exactly like ``maya.parse`` does.
+        dt = pendulum.datetime(*fields, microsecond=microseconds, tz=timezone)
+        return MayaDT.from_datetime(dt)
+
+    # Validates the fields, e.g. February 30th.
+    Datetime(*fields)
+    seconds = calendar.timegm(fields)
+    if offset and offset != "Z":
+        sign = -1 if offset[0] == "-" else 1
+        digits = offset[1:].replace(":", "")
+        seconds -= sign * (int(digits[:2]) * 3600 + int(digits[2:] or 0) * 60)
+    return MayaDT((seconds * 10**6 + microseconds) / 10**6)
+
+
+def _parse_pendulum(string, timezone):
+    return parse(string, timezone=timezone)
+
+
+def _parse_dateparser(string, timezone):
+    return when(string, timezone=timezone)
+
+
+#: The strategies available by name. Each is a function taking the string
+#: and a timezone, which returns a MayaDT or raises ValueError.
+STRATEGIES = {
+    "iso": parse_iso8601,
+    "pendulum": _parse_pendulum,
+    "dateparser": _parse_dateparser,
+}
+
+#: The default chain of strategies.
+DEFAULT_CHAIN = ("iso", "pendulum", "dateparser")
+
+
+class TieredParser(object):
+    """
+    Parses strings with the first successful strategy of an ordered chain.
+
+    Keyword Arguments:
+        strategies -- the chain, as names of ``STRATEGIES`` or (name,
+                      function) pairs (default: ('iso', 'pendulum',
+                      'dateparser'))
+        timezone -- timezone of timestamps without one (default: 'UTC')
+    """
+
+    def __init__(self, strategies=DEFAULT_CHAIN, timezone="UTC"):
+        self.timezone = timezone
+        self.strategies = []
+        for strategy in strategies:
+            if isinstance(strategy, tuple):
+                name, function = strategy
+            else:
+                name, function = strategy, STRATEGIES[strategy]
+            self.strategies.append((name, function))
+        if not self.strategies:
+            raise ValueError("at least one strategy is required")
+
+        self._winners = {}
+        self._attempts = dict.fromkeys(self.names, 0)
+        self._hits = dict.fromkeys(self.names, 0)
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<TieredParser strategies={}>".format(list(self.names))
+
+    @property
+    def names(self):
+        """Returns the names of the strategies, in order."""
+        return tuple(name for name, _ in self.strategies)
+
+    def _chain(self, source):
+        """Returns the strategies in the order to try them for a source."""
+        winner = self._winners.get(source)
+        if not winner:
+            return self.strategies
+
+        strategies = list(self.strategies)
+        strategies.insert(0, strategies.pop(winner))
+        return strategies
+
+    def parse(self, string, source=None, timezone=None):
+        """Returns a MayaDT for the string.
+
+        Keyword Arguments:
+            string -- string to be parsed
+            source -- any hashable naming where the string comes from, e.g.
+                      a column; the strategy which succeeded last for it is
+                      tried first (default: None, no memory)
+            timezone -- timezone of timestamps without one (default: the
+                        timezone of the parser)
+
+        Raises ValueError if no strategy succeeds.
+        """
+        if timezone is None:
+            timezone = self.timezone
+        tried = []
+        for name, function in self._chain(source):
+            tried.append(name)
+            try:
+                dt = function(string, timezone)
+            except (ValueError, OverflowError):
+                continue
+
+            self._record(tried, name)
+            if source is not None:
+                self._winners[source] = self.names.index(name)
+            return dt
+
+        self._record(tried, None)
+        raise ValueError("invalid datetime input specified: {!r}".format(string))
+
+    def _record(self, tried, winner):
+        with self._lock:
+            for name in tried:
+                self._attempts[name] += 1
+            if winner is None:
+                self._failures += 1
+            else:
+                self._hits[winner] += 1
+        if instrumentation.is_enabled():
+            for name in tried:
+                instrumentation.increment("parse_any.{}.attempts".format(name))
+            if winner is None:
+                instrumentation.increment("parse_any.failures")
+            else:
+                instrumentation.increment("parse_any.{}.hits".format(winner))
+
+    def winner(self, source):
+        """Returns the name of the strategy tried first for a source (or None)."""
+        index = self._winners.get(source)
+        return None if index is None else self.names[index]
+
+    def stats(self):
+        """Returns the attempts, hits and hit rate (hits per attempt) of each
+        strategy, the share of all successful parses it produced, and the
+        number of strings no strategy could parse."""
+        with self._lock:
+            total = sum(self._hits.values())
+            strategies = {}
+            for name in self.names:
+                attempts, hits = self._attempts[name], self._hits[name]
+                strategies[name] = {
+                    "attempts": attempts,
+                    "hits": hits,
+                    "hit_rate": hits / attempts if attempts else None,
+                    "share": hits / total if total else None,
+                }
+            return {"strategies": strategies, "failures": self._failures}
+
+    def reset_stats(self):
+        """Clears the statistics (but not the strategies remembered per source)."""
+        with self._lock:
+            self._attempts = dict.fromkeys(self.names, 0)
+            self._hits = dict.fromkeys(self.names, 0)
+            self._failures = 0
+
+    def forget(self, source=None):
+        """Forgets the strategy remembered for a source (default: all)."""
+        if source is None:
+            self._winners.clear()
+        else:
+            self._winners.pop(source, None)
+
+
+_default_parser = TieredParser()
+
+
+def default_parser():
+    """Returns the TieredParser used by ``parse_any``."""
+    return _default_parser
+
+
+def parse_any(string, timezone="UTC", source=None):
+    """Returns a MayaDT for a string of unknown format, trying ISO 8601,
+    then pendulum (``maya.parse``), then dateparser (``maya.when``).
+
+    Keyword Arguments:
+        string -- string to be parsed
+        timezone -- timezone of timestamps without one (default: 'UTC')
+        source -- any hashable naming where the string comes from, e.g. a
+                  column; the strategy which succeeded last for it is tried
+                  first (default: None)
+
+    The statistics of all calls are available from ``default_parser().stats()``.
+    """
+    return _default_parser.parse(string, source=source, timezone=timezone)
@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+"""
+maya.timezones
+~~~~~~~~~~~~~~
+This module converts epochs to local wall-clock time and naive
+wall-clock times to epochs in bulk.
+
+The UTC transition times and offsets of a timezone are extracted from
+pytz once and kept in sorted arrays, so converting an epoch is a single
+binary search followed by integer arithmetic. Results are identical to
+converting with pytz, which also uses the last known transition for
+times beyond its data.
+
+Tables can be compiled into a single binary snapshot file with
+``compile_snapshot``, which ``use_snapshot`` memory-maps so zones are
+loaded without parsing any tzfile data.
+"""
+
+import functools
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime as Datetime, timedelta
+
+import pytz
+
+from . import instrumentation
+
+#: Local wall-clock fields of ``to_local_fields``, one column per field.
+LocalFields = namedtuple("LocalFields", "year month day hour minute second utcoffset")
+
+#: Policies for ``localize`` with wall-clock times which occur twice.
+AMBIGUOUS_POLICIES = ("earliest", "latest", "raise", "NaT")
+#: Policies for ``localize`` with wall-clock times skipped by a transition.
+NONEXISTENT_POLICIES = ("shift_forward", "shift_backward", "raise", "NaT")
+
+#: Number of (zone, hour) entries kept by the UTC offset cache.
+OFFSET_CACHE_SIZE = 4096
+
+_EPOCH_START = Datetime(1970, 1, 1)
+_UNIX_EPOCH_ORDINAL = _EPOCH_START.toordinal()
+_SECOND = timedelta(seconds=1)
+_HOUR = timedelta(hours=1)
+
+_transition_tables = {}
+
+
+def _timedelta_seconds(delta):
+    return delta // _SECOND
+
+
+def _civil_from_days(days):
+    """Returns the (year, month, day) of the given number of days since
+    1970-01-01 in the proleptic Gregorian calendar.
+
+    See http://howardhinnant.github.io/date_algorithms.html#civil_from_days
+    """
+    days += 719468
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (
+        day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096
+    ) // 365
+    day_of_year = day_of_era - (
+        365 * year_of_era + year_of_era // 4 - year_of_era // 100
+    )
+    shifted_month = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * shifted_month + 2) // 5 + 1
+    month = shifted_month + 3 if shifted_month < 10 else shifted_month - 9
+    year = year_of_era + era * 400 + (1 if month <= 2 else 0)
+    return year, month, day
+
+
+def _epochs(values):
+    """Returns an epoch column for TimestampArrays, MayaDTs or numbers."""
+    from .arrays import _epoch_column
+
+    return _epoch_column(getattr(values, "epochs", values))
+
+
+class TransitionTable(object):
+    """
+    The UTC offsets of a timezone as sorted arrays.
+
+    ``transitions[i]`` is the UTC epoch from which on ``offsets[i]``
+    (and ``dst[i]`` and ``names[i]``) apply. The first transition is the
+    start of the supported range, earlier epochs use the first offset.
+    """
+
+    def __init__(self, zone, transitions, offsets, dst, names):
+        self.zone = zone
+        self.transitions = transitions
+        self.offsets = offsets
+        self.dst = dst
+        self.names = names
+        self._min_offset = min(offsets)
+        self._max_offset = max(offsets)
+
+    @classmethod
+    def from_pytz(cls, zone):
+        """Returns the TransitionTable of the given pytz timezone (or its name)."""
+        tz = pytz.timezone(zone) if not isinstance(zone, pytz.BaseTzInfo) else zone
+        transitions = array("q")
+        offsets = array("q")
+        dst = array("q")
+        names = []
+        if hasattr(tz, "_utc_transition_times"):
+            for transition, info in zip(tz._utc_transition_times, tz._transition_info):
+                utcoffset, dst_offset, name = info
+                transitions.append(_timedelta_seconds(transition - _EPOCH_START))
+                offsets.append(_timedelta_seconds(utcoffset))
+                dst.append(_timedelta_seconds(dst_offset))
+                names.append(name)
+        else:
+            transitions.append(_timedelta_seconds(Datetime.min - _EPOCH_START))
+            offsets.append(_timedelta_seconds(tz.utcoffset(_EPOCH_START)))
+            dst.append(0)
+            names.append(tz.tzname(_EPOCH_START))
+        return cls(tz.zone, transitions, offsets, dst, names)
+
+    def __repr__(self):
+        return "<TransitionTable zone={!r} transitions={}>".format(
+            self.zone, len(self.transitions)
+        )
+
+    def index(self, epoch):
+        """Returns the index of the transition in effect at the given epoch."""
+        return max(bisect_right(self.transitions, epoch) - 1, 0)
+
+    def utcoffset(self, epoch):
+        """Returns the UTC offset in seconds at the given epoch."""
+        return self.offsets[self.index(epoch)]
+
+    def utcoffsets(self, epochs):
+        """Returns the UTC offsets in seconds at the given epochs."""
+        transitions, offsets = self.transitions, self.offsets
+        return array(
+            "q",
+            [
+                offsets[max(bisect_right(transitions, e) - 1, 0)]
+                for e in _epochs(epochs)
+            ],
+        )
+
+    def to_local(self, epochs):
+        """Returns the local wall-clock times as seconds since 1970-01-01."""
+        transitions, offsets = self.transitions, self.offsets
+        return array(
+            "q",
+            [
+                e + offsets[max(bisect_right(transitions, e) - 1, 0)]
+                for e in _epochs(epochs)
+            ],
+        )
+
+    def to_local_fields(self, epochs):
+        """Returns the local wall-clock fields of the given epochs."""
+        epochs = _epochs(epochs)
+        offsets = self.utcoffsets(epochs)
+        columns = [array("q") for _ in LocalFields._fields[:-1]]
+        year, month, day, hour, minute, second = columns
+        for epoch, offset in zip(epochs, offsets):
+            days, seconds = divmod(epoch + offset, 86400)
+            y, m, d = _civil_from_days(days)
+            year.append(y)
+            month.append(m)
+            day.append(d)
+            hour.append(seconds // 3600)
+            minute.append(seconds // 60 % 60)
+            second.append(seconds % 60)
+        return LocalFields(year, month, day, hour, minute, second, offsets)
+
+    def _check_wall(self, wall, index):
+        """Returns whether the given wall-clock time exists in period ``index``."""
+        utc = wall - self.offsets[index]
+        if index and utc < self.transitions[index]:
+            return False
+
+        return index + 1 == len(self.transitions) or utc < self.transitions[index + 1]
+
+    def localize(self, walls, ambiguous="raise", nonexistent="raise"):
+        """Returns the UTC epochs of naive wall-clock times in this timezone.
+
+        Keyword Arguments:
+            walls -- naive datetimes or wall-clock seconds since 1970-01-01
+            ambiguous -- what to do with wall-clock times occurring twice:
+                         'earliest', 'latest', 'raise' or 'NaT'
+                         (default: 'raise')
+            nonexistent -- what to do with wall-clock times skipped by a
+                           transition: 'shift_forward' (to the transition),
+                           'shift_backward' (to the second before it),
+                           'raise' or 'NaT' (default: 'raise')
+
+        'NaT' stores ``maya.arrays.NAT`` for the affected values, 'raise'
+        raises pytz's ``AmbiguousTimeError`` or ``NonExistentTimeError``.
+        """
+        if ambiguous not in AMBIGUOUS_POLICIES:
+            raise ValueError("invalid ambiguous policy: {!r}".format(ambiguous))
+        if nonexistent not in NONEXISTENT_POLICIES:
+            raise ValueError("invalid nonexistent policy: {!r}".format(nonexistent))
+
+        return array(
+            "q",
+            [
+                self.localize_wall(wall, ambiguous, nonexistent)
+                for wall in _walls(walls)
+            ],
+        )
+
+    def localize_wall(self, wall, ambiguous="raise", nonexistent="raise"):
+        """Returns the UTC epoch of a single wall-clock time in seconds since
+        1970-01-01, see ``localize``."""
+        from .arrays import NAT
+
+        transitions, offsets = self.transitions, self.offsets
+        # Only periods which start within this distance can contain the wall time.
+        first = self.index(wall - self._max_offset)
+        last = self.index(wall - self._min_offset)
+        candidates = [
+            wall - offsets[index]
+            for index in range(first, last + 1)
+            if self._check_wall(wall, index)
+        ]
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if candidates:
+            if ambiguous == "earliest":
+                return min(candidates)
+            if ambiguous == "latest":
+                return max(candidates)
+            if ambiguous == "NaT":
+                return NAT
+            if ambiguous == "raise":
+                raise pytz.AmbiguousTimeError(_wall_datetime(wall))
+            raise ValueError("invalid ambiguous policy: {!r}".format(ambiguous))
+
+        if nonexistent == "NaT":
+            return NAT
+        if nonexistent == "raise":
+            raise pytz.NonExistentTimeError(_wall_datetime(wall))
+
+        for index in range(first + 1, last + 1):
+            transition = transitions[index]
+            if wall - offsets[index - 1] >= transition > wall - offsets[index]:
+                break
+        if nonexistent == "shift_forward":
+            return transition
+        if nonexistent == "shift_backward":
+            return transition - 1
+        raise ValueError("invalid nonexistent policy: {!r}".format(nonexistent))
+
+
+def _wall_datetime(wall):
+    return _EPOCH_START + timedelta(seconds=wall)
+
+
+def _walls(values):
+    """Yields wall-clock seconds since 1970-01-01 for naive datetimes or numbers."""
+    for value in getattr(values, "epochs", values):
+        if isinstance(value, Datetime):
+            if value.tzinfo is not None:
+                raise ValueError("Not naive datetime (tzinfo is already set)")
+            yield _timedelta_seconds(value - _EPOCH_START)
+        else:
+            yield int(value)
+
+
+def get_transition_table(zone):
+    """Returns the (cached) TransitionTable of the timezone with the given name.
+
+    Zones are taken from the snapshot registered with ``use_snapshot``
+    if it contains them, and from pytz otherwise.
+    """
+    try:
+        return _transition_tables[zone]
+    except KeyError:
+        if _snapshot is not None and zone in _snapshot:
+            table = _snapshot.table(zone)
+        else:
+            table = TransitionTable.from_pytz(zone)
+        _transition_tables[zone] = table
+        return table
+
+
+# Snapshots
+# ---------
+# A snapshot file consists of a header, an index with one entry per zone
+# and the data of each zone, aligned to 8 bytes:
+#
+#   header: magic, byte order, number of zones
+#   entry:  length of the zone name, zone name (UTF-8),
+#           number of transitions, size of the names, data offset
+#   data:   transitions (int64), offsets (int32), dst offsets (int32),
+#           name indices (uint8), names (NUL separated, UTF-8)
+#
+# Columns are stored in the native byte order of the compiling machine.
+_SNAPSHOT_MAGIC = b"MAYATZ\x00\x01"
+_SNAPSHOT_HEADER = struct.Struct("<8sBI")
+_SNAPSHOT_ENTRY = struct.Struct("<IIQ")
+_SNAPSHOT_BYTE_ORDERS = {"little": 0, "big": 1}
+
+_snapshot = None
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def compile_snapshot(path, zones=None):
+    """Writes the transition tables of the given zones to a snapshot file.
+
+    Keyword Arguments:
+        path -- the file to write
+        zones -- names of the zones to include (default: all pytz zones)
+    """
+    zones = list(pytz.all_timezones if zones is None else zones)
+    blobs = []
+    for zone in zones:
+        table = TransitionTable.from_pytz(zone)
+        names = sorted(set(table.names))
+        name_indices = array("B", [names.index(name) for name in table.names])
+        encoded_names = "\x00".join(names).encode("utf-8")
+        blob = b"".join(
+            (
+                table.transitions.tobytes(),
+                array("i", table.offsets).tobytes(),
+                array("i", table.dst).tobytes(),
+                name_indices.tobytes(),
+                encoded_names,
+            )
+        )
+        blobs.append(
+            (zone.encode("utf-8"), len(table.transitions), len(encoded_names), blob)
+        )
+
+    index_size = _SNAPSHOT_HEADER.size + sum(
+        2 + len(name) + _SNAPSHOT_ENTRY.size for name, _, _, _ in blobs
+    )
+    header = [
+        _SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC, _SNAPSHOT_BYTE_ORDERS[sys.byteorder], len(blobs)
+        )
+    ]
+    data = []
+    offset = _align(index_size)
+    for name, transitions, names_size, blob in blobs:
+        header.append(struct.pack("<H", len(name)) + name)
+        header.append(_SNAPSHOT_ENTRY.pack(transitions, names_size, offset))
+        padding = _align(len(blob)) - len(blob)
+        data.append(blob + b"\x00" * padding)
+        offset += len(blob) + padding
+
+    with open(path, "wb") as f:
+        index = b"".join(header)
+        f.write(index)
+        f.write(b"\x00" * (_align(index_size) - index_size))
+        for blob in data:
+            f.write(blob)
+
+
+class TimezoneSnapshot(object):
+    """
+    Transition tables read from a snapshot file written by ``compile_snapshot``.
+
+    The file is memory-mapped on first use, only its index is parsed.
+    Tables reference the mapped memory instead of copying it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._mmap = None
+        self._index = None
+
+    def _load(self):
+        if self._index is not None:
+            return
+
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, byte_order, count = _SNAPSHOT_HEADER.unpack_from(self._mmap, 0)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("{} is not a maya timezone snapshot".format(self.path))
+        if byte_order != _SNAPSHOT_BYTE_ORDERS[sys.byteorder]:
+            raise ValueError(
+                "{} was compiled with a different byte order".format(self.path)
+            )
+
+        index = {}
+        position = _SNAPSHOT_HEADER.size
+        for _ in range(count):
+            (length,) = struct.unpack_from("<H", self._mmap, position)
+            position += 2
+            zone = self._mmap[position : position + length].decode("utf-8")
+            position += length
+            index[zone] = _SNAPSHOT_ENTRY.unpack_from(self._mmap, position)
+            position += _SNAPSHOT_ENTRY.size
+        self._index = index
+
+    @property
+    def zones(self):
+        """Returns the names of the zones in the snapshot."""
+        self._load()
+        return sorted(self._index)
+
+    def __contains__(self, zone):
+        self._load()
+        return zone in self._index
+
+    def table(self, zone):
+        """Returns the TransitionTable of the given zone."""
+        self._load()
+        transitions, names_size, offset = self._index[zone]
+        view = memoryview(self._mmap)
+        columns = []
+        for typecode, size in (("q", 8), ("i", 4), ("i", 4), ("B", 1)):
+            end = offset + transitions * size
+            columns.append(view[offset:end].cast(typecode))
+            offset = end
+        names = self._mmap[offset : offset + names_size].decode("utf-8").split("\x00")
+        transition_times, offsets, dst, name_indices = columns
+        return TransitionTable(
+            zone, transition_times, offsets, dst, [names[i] for i in name_indices]
+        )
+
+    def close(self):
+        """Unmaps the snapshot file.
+
+        If tables of the snapshot are still in use, the mapping is
+        released once the last of them is garbage collected.
+        """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._file.close()
+        self._file = self._mmap = self._index = None
+
+
+def use_snapshot(path):
+    """Registers a snapshot file as the source of transition tables.
+
+    Pass None to go back to reading zones from pytz.
+    """
+    global _snapshot
+
+    _transition_tables.clear()
+    if _snapshot is not None:
+        _snapshot.close()
+    _snapshot = TimezoneSnapshot(path) if path is not None else None
+    return _snapshot
+
+
+def preload(zones=None):
+    """Loads the given zones (default: all pytz zones) ahead of their first use.
+
+    This loads the pytz timezones used by ``MayaDT.datetime`` as well as
+    the transition tables, e.g. before forking worker processes.
+    """
+    zones = pytz.all_timezones if zones is None else zones
+    for zone in zones:
+        pytz.timezone(zone)
+        get_transition_table(zone)
+    return len(zones)
+
+
+@instrumentation.timed("tz.to_local")
+def to_local(epochs, timezone):
+    """Returns the local wall-clock times of the epochs in the given timezone
+    as seconds since 1970-01-01."""
+    return get_transition_table(timezone).to_local(epochs)
+
+
+@instrumentation.timed("tz.to_local_fields")
+def to_local_fields(epochs, timezone):
+    """Returns the local wall-clock fields of the epochs in the given timezone."""
+    return get_transition_table(timezone).to_local_fields(epochs)
+
+
+@instrumentation.timed("tz.utcoffsets")
+def utcoffsets(epochs, timezone):
+    """Returns the UTC offsets in seconds of the epochs in the given timezone."""
+    return get_transition_table(timezone).utcoffsets(epochs)
+
+
+@instrumentation.timed("tz.localize")
+def localize(walls, timezone, ambiguous="raise", nonexistent="raise"):
+    """Returns the UTC epochs of naive wall-clock times in the given timezone.
+
+    See ``TransitionTable.localize`` for the available policies.
+    """
+    return get_transition_table(timezone).localize(
+        walls, ambiguous=ambiguous, nonexistent=nonexistent
+    )
+
+
+@functools.lru_cache(maxsize=OFFSET_CACHE_SIZE)
+def _hourly_tzinfo(zone, hour):
+    """Returns the pytz tzinfo in effect during the given hour since epoch
+    in the given timezone, or None if it changes within that hour."""
+    tz = pytz.timezone(zone)
+    start = _EPOCH_START + timedelta(hours=hour)
+    tzinfo = tz.fromutc(start).tzinfo
+    if tz.fromutc(start + _HOUR - timedelta.resolution).tzinfo is not tzinfo:
+        return None
+
+    return tzinfo
+
+
+def utc_to_timezone(dt, zone):
+    """Converts a UTC datetime to the timezone with the given name.
+
+    Same as ``dt.astimezone(pytz.timezone(zone))``, but the tzinfo in
+    effect is memoized per zone and hour, so repeated conversions within
+    the same hour skip pytz's lookup.
+    """
+    hour = (dt.replace(tzinfo=None) - _EPOCH_START) // _HOUR
+    tzinfo = _hourly_tzinfo(zone, hour)
+    if tzinfo is None:
+        return dt.astimezone(pytz.timezone(zone))
+
+    return (dt + tzinfo._utcoffset).replace(tzinfo=tzinfo)
+
+
+def offset_cache_info():
+    """Returns the hits, misses, maxsize and currsize of the UTC offset cache."""
+    return _hourly_tzinfo.cache_info()
+
+
+def clear_offset_cache():
+    """Empties the UTC offset cache and resets its statistics."""
+    _hourly_tzinfo.cache_clear()
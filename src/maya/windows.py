@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+maya.windows
+~~~~~~~~~~~~
+This module assigns timestamps to time windows and aggregates values
+per window. Timestamps are handled as epoch seconds, see ``maya.arrays``.
+"""
+
+from array import array
+from collections import namedtuple
+
+from .arrays import (
+    EPOCH_TYPECODE,
+    IntervalArray,
+    _epoch_column,
+    _quantize_origin,
+    _to_epoch,
+)
+from .core import MayaDT, _seconds_or_timedelta
+
+#: The per bucket result of ``TumblingWindow.aggregate``.
+#: ``ids`` and ``count`` are epoch columns, ``sum``, ``min`` and ``max``
+#: are lists (or None if no values were given), all sorted by bucket id.
+BucketAggregates = namedtuple("BucketAggregates", "ids edges count sum min max")
+
+
+def _window_seconds(width):
+    """Returns the given width (seconds or timedelta) in whole seconds."""
+    width = _seconds_or_timedelta(width)
+    seconds = width.total_seconds()
+    if seconds <= 0:
+        raise ValueError("window width must be positive")
+
+    if seconds != int(seconds):
+        raise ValueError("window width must be a whole number of seconds")
+
+    return int(seconds)
+
+
+class TumblingWindow(object):
+    """
+    Fixed-width, non-overlapping time buckets.
+
+    Bucket ``n`` covers ``[origin + n * width, origin + (n + 1) * width)``.
+    Without an explicit origin the buckets are aligned to midnight of
+    1970-01-01 in the given timezone, like ``MayaInterval.quantize``.
+    """
+
+    def __init__(self, width, origin=None, timezone="UTC"):
+        self.width = _window_seconds(width)
+        if origin is None:
+            self.origin = _quantize_origin(timezone)
+        else:
+            self.origin = _to_epoch(origin)
+
+    def __repr__(self):
+        return "<TumblingWindow width={} origin={}>".format(self.width, self.origin)
+
+    def bucket_id(self, timestamp):
+        """Returns the bucket id of a single MayaDT (or epoch)."""
+        return (_to_epoch(timestamp) - self.origin) // self.width
+
+    def bucket_ids(self, timestamps):
+        """Returns the bucket ids of the given timestamps as an epoch column."""
+        origin, width = self.origin, self.width
+        return array(
+            EPOCH_TYPECODE,
+            [(epoch - origin) // width for epoch in _epoch_column(timestamps)],
+        )
+
+    def bucket_start(self, bucket_id):
+        """Returns the MayaDT at which the given bucket starts."""
+        return MayaDT(self.origin + bucket_id * self.width)
+
+    def edges(self, bucket_ids):
+        """Returns the bounds of the given buckets as an IntervalArray."""
+        origin, width = self.origin, self.width
+        starts = array(EPOCH_TYPECODE, [origin + i * width for i in bucket_ids])
+        ends = array(EPOCH_TYPECODE, [start + width for start in starts])
+        return IntervalArray._from_columns(starts, ends)
+
+    def aggregate(self, timestamps, values=None):
+        """Returns the count (and sum, min and max of the values) per bucket.
+
+        Keyword Arguments:
+            timestamps -- MayaDTs or epochs to assign to buckets
+            values -- optional sequence of numbers, one per timestamp
+        """
+        ids = self.bucket_ids(timestamps)
+        counts = {}
+        for bucket_id in ids:
+            counts[bucket_id] = counts.get(bucket_id, 0) + 1
+
+        sorted_ids = array(EPOCH_TYPECODE, sorted(counts))
+        count_column = array(EPOCH_TYPECODE, [counts[i] for i in sorted_ids])
+        if values is None:
+            return BucketAggregates(
+                sorted_ids, self.edges(sorted_ids), count_column, None, None, None
+            )
+
+        values = list(values)
+        if len(values) != len(ids):
+            raise ValueError("values must have the same length as timestamps")
+
+        sums, mins, maxs = {}, {}, {}
+        for bucket_id, value in zip(ids, values):
+            if bucket_id in sums:
+                sums[bucket_id] += value
+                if value < mins[bucket_id]:
+                    mins[bucket_id] = value
+                if value > maxs[bucket_id]:
+                    maxs[bucket_id] = value
+            else:
+                sums[bucket_id] = mins[bucket_id] = maxs[bucket_id] = value
+
+        return BucketAggregates(
+            sorted_ids,
+            self.edges(sorted_ids),
+            count_column,
+            [sums[i] for i in sorted_ids],
+            [mins[i] for i in sorted_ids],
+            [maxs[i] for i in sorted_ids],
+        )
+
+
+def _event_time(timestamp):
+    """Returns the (possibly fractional) epoch of a MayaDT or number."""
+    if isinstance(timestamp, MayaDT):
+        return timestamp._epoch
+
+    return timestamp
+
+
+class SlidingWindow(object):
+    """
+    Aggregates over the events of the trailing ``width`` seconds.
+
+    Events have to be pushed in chronological order. An event pushed at
+    ``t`` stays in the window until an event (or ``advance``) at
+    ``t + width`` or later. Reducers are associative binary functions,
+    e.g. ``operator.add``, ``min`` or ``max``; they are maintained with
+    two stacks, which costs amortized O(1) reducer calls per event.
+    """
+
+    def __init__(self, width, reducers=None):
+        width = _seconds_or_timedelta(width).total_seconds()
+        if width <= 0:
+            raise ValueError("window width must be positive")
+
+        self.width = width
+        self.reducers = dict(reducers or {})
+        self._names = list(self.reducers)
+        self._functions = [self.reducers[name] for name in self._names]
+        self._now = None
+        # Newer events with the aggregate of all of them.
+        self._back = []
+        self._back_aggregate = None
+        # Older events (oldest last), each with the aggregate of itself
+        # and all newer events on this stack.
+        self._front = []
+
+    def __repr__(self):
+        return "<SlidingWindow width={} count={}>".format(self.width, len(self))
+
+    def __len__(self):
+        return len(self._front) + len(self._back)
+
+    @property
+    def count(self):
+        """Returns the number of events in the window."""
+        return len(self)
+
+    def _combine(self, older, newer):
+        return tuple(
+            function(a, b) for function, a, b in zip(self._functions, older, newer)
+        )
+
+    def _flip(self):
+        """Moves the events from the back to the front stack."""
+        aggregate = None
+        for epoch, value in reversed(self._back):
+            lifted = (value,) * len(self._functions)
+            aggregate = (
+                lifted if aggregate is None else self._combine(lifted, aggregate)
+            )
+            self._front.append((epoch, aggregate))
+        self._back = []
+        self._back_aggregate = None
+
+    def _oldest(self):
+        if self._front:
+            return self._front[-1][0]
+
+        return self._back[0][0]
+
+    def advance(self, timestamp):
+        """Moves the window to end at the given MayaDT (or epoch)."""
+        now = _event_time(timestamp)
+        if self._now is not None and now < self._now:
+            raise ValueError("events must be pushed in chronological order")
+
+        self._now = now
+        horizon = now - self.width
+        while len(self) and self._oldest() <= horizon:
+            if not self._front:
+                self._flip()
+            self._front.pop()
+
+    def push(self, timestamp, value=None):
+        """Adds an event and returns the aggregates of the window."""
+        self.advance(timestamp)
+        self._back.append((self._now, value))
+        lifted = (value,) * len(self._functions)
+        if self._back_aggregate is None:
+            self._back_aggregate = lifted
+        else:
+            self._back_aggregate = self._combine(self._back_aggregate, lifted)
+        return self.result()
+
+    def result(self):
+        """Returns the event count and the reducer aggregates of the window.
+
+        The aggregates are None while the window is empty.
+        """
+        if self._front and self._back:
+            aggregate = self._combine(self._front[-1][1], self._back_aggregate)
+        elif self._front:
+            aggregate = self._front[-1][1]
+        else:
+            aggregate = self._back_aggregate
+
+        result = {"count": len(self)}
+        for index, name in enumerate(self._names):
+            result[name] = None if aggregate is None else aggregate[index]
+        return result
+
+    def process(self, events):
+        """Pushes ``(timestamp, value)`` pairs and yields ``(timestamp, result)``."""
+        for timestamp, value in events:
+            yield timestamp, self.push(timestamp, value)
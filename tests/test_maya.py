@@ -33,9 +33,9 @@ def test_iso8601(string, expected):
 @pytest.mark.parametrize(
     "string,expected",
     [
-        ('January 1, 1970', "12.17.16.7.5"),
-        ('December 21, 2012', "13.0.0.0.0"),
-        ('March 4, 1900', "12.14.5.10.0"),
+        ("January 1, 1970", "12.17.16.7.5"),
+        ("December 21, 2012", "13.0.0.0.0"),
+        ("March 4, 1900", "12.14.5.10.0"),
     ],
 )
 def test_long_count(string, expected):
@@ -86,6 +86,7 @@ def test_issue_104():
     t = maya.MayaDT.from_struct(t)
     assert str(t) == "Wed, 11 Oct 2017 21:12:11 GMT"
 
+
 def test_before_1970():
     d1 = maya.when("1899-17-11 08:09:10")
     assert d1.year == 1899
@@ -109,6 +110,7 @@ def test_before_1970():
     assert d2.second == 34
     assert d2.microsecond == 0
 
+
 def test_human_when():
     r1 = maya.when("yesterday")
     r2 = maya.when("today")
@@ -117,38 +119,38 @@ def test_human_when():
 
 @pytest.mark.usefixtures("frozen_2020_08_11_in_paris")
 def test_human_when_today_with_timezone_summer_time():
-    d = maya.when("today", timezone='Europe/Paris')
-    assert str(d.datetime(to_timezone="Europe/Paris").date()) == '2020-08-11'
+    d = maya.when("today", timezone="Europe/Paris")
+    assert str(d.datetime(to_timezone="Europe/Paris").date()) == "2020-08-11"
 
 
 @pytest.mark.usefixtures("frozen_2020_02_11_in_paris")
 def test_human_when_today_with_timezone_winter_time():
-    d = maya.when("today", timezone='Europe/Paris')
-    assert str(d.datetime(to_timezone="Europe/Paris").date()) == '2020-02-11'
+    d = maya.when("today", timezone="Europe/Paris")
+    assert str(d.datetime(to_timezone="Europe/Paris").date()) == "2020-02-11"
 
 
 @pytest.mark.usefixtures("frozen_2020_08_11_in_paris")
 def test_human_when_yesterday_with_timezone_summer_time():
-    d = maya.when("yesterday", timezone='Europe/Paris')
-    assert str(d.datetime(to_timezone="Europe/Paris").date()) == '2020-08-10'
+    d = maya.when("yesterday", timezone="Europe/Paris")
+    assert str(d.datetime(to_timezone="Europe/Paris").date()) == "2020-08-10"
 
 
 @pytest.mark.usefixtures("frozen_2020_02_11_in_paris")
 def test_human_when_yesterday_with_timezone_winter_time():
-    d = maya.when("yesterday", timezone='Europe/Paris')
-    assert str(d.datetime(to_timezone="Europe/Paris").date()) == '2020-02-10'
+    d = maya.when("yesterday", timezone="Europe/Paris")
+    assert str(d.datetime(to_timezone="Europe/Paris").date()) == "2020-02-10"
 
 
 @pytest.mark.usefixtures("frozen_2020_08_11_in_paris")
 def test_human_when_midnight_with_timezone_summer_time():
-    d = maya.when("midnight", timezone='Europe/Paris')
-    assert str(d.datetime(to_timezone="Europe/Paris")) == '2020-08-11 00:00:00+02:00'
+    d = maya.when("midnight", timezone="Europe/Paris")
+    assert str(d.datetime(to_timezone="Europe/Paris")) == "2020-08-11 00:00:00+02:00"
 
 
 @pytest.mark.usefixtures("frozen_2020_02_11_in_paris")
 def test_human_when_midnight_with_timezone_winter_time():
-    d = maya.when("midnight", timezone='Europe/Paris')
-    assert str(d.datetime(to_timezone="Europe/Paris")) == '2020-02-11 00:00:00+01:00'
+    d = maya.when("midnight", timezone="Europe/Paris")
+    assert str(d.datetime(to_timezone="Europe/Paris")) == "2020-02-11 00:00:00+01:00"
 
 
 def test_machine_parse():
@@ -297,6 +299,28 @@ def test_when_future_day_name():
     assert future_date > maya.now()
 
 
+def test_when_languages():
+    assert maya.when("1 März 2018", languages=["de"]) == maya.parse("2018-03-01")
+    with pytest.raises(ValueError):
+        maya.when("1 März 2018", languages=["fr"])
+
+    maya.configure_when(languages=["de"])
+    try:
+        assert maya.when("1 März 2018") == maya.parse("2018-03-01")
+        # Per-call languages take precedence over the configured ones.
+        assert maya.when("March 1 2018", languages=["en"]) == maya.parse("2018-03-01")
+        with pytest.raises(ValueError):
+            maya.when("1 mars 2018")
+    finally:
+        maya.configure_when()
+
+
+def test_warmup():
+    maya.warmup(languages=["en", "de"])
+    maya.warmup(locales=["en-GB"])
+    assert maya.when("1/3/2018", locales=["en-GB"]) == maya.parse("2018-03-01")
+
+
 def test_datetime_to_timezone():
     dt = maya.when("2016-01-01").datetime(to_timezone="US/Eastern")
     assert dt.tzinfo.zone == "US/Eastern"
@@ -461,3 +485,10 @@ def test_snaptime_tz(when_str, snap_str, timezone, expected_when):
     dt = dt.snap_tz(snap_str, timezone)
     # then
     assert dt == maya.when(expected_when)
+
+
+def test_no_helpers_in_namespace():
+    for name in ("sys", "CRLF", "format_utc", "add_months", "utc_to_timezone"):
+        assert not hasattr(maya, name)
+    # The submodule, not a name imported by maya.core.
+    assert maya.instrumentation.__name__ == "maya.instrumentation"
@@ -0,0 +1,144 @@
+import multiprocessing
+import pickle
+from array import array
+from datetime import timedelta
+
+import pytest
+
+import maya
+from maya.arrays import IntervalArray, TimestampArray, shared_memory
+
+requires_shared_memory = pytest.mark.skipif(
+    shared_memory is None, reason="shared memory requires Python 3.8 or later"
+)
+
+
+def make_intervals(bounds, base=None):
+    base = base or maya.parse("2018-03-25T00:00:00Z")
+    return [
+        maya.MayaInterval(start=base.add(seconds=start), end=base.add(seconds=end))
+        for start, end in bounds
+    ]
+
+
+def test_interval_array_roundtrip():
+    intervals = make_intervals([(0, 10), (5, 5), (-20, 40)])
+    interval_array = IntervalArray.from_intervals(intervals)
+    assert len(interval_array) == 3
+    assert interval_array.to_intervals() == intervals
+    assert interval_array[1] == intervals[1]
+    assert interval_array[-1] == intervals[-1]
+    assert interval_array[1:].to_intervals() == intervals[1:]
+    assert isinstance(interval_array.starts, array)
+
+
+def test_interval_array_requires_end_after_start():
+    with pytest.raises(ValueError):
+        IntervalArray([10], [5])
+    with pytest.raises(ValueError):
+        IntervalArray([1, 2], [3])
+
+
+def test_interval_array_vectorized_properties():
+    intervals = make_intervals([(0, 10), (5, 5), (-20, 41)])
+    interval_array = IntervalArray.from_intervals(intervals)
+    assert list(interval_array.duration) == [i.duration for i in intervals]
+    assert interval_array.is_instant == [i.is_instant for i in intervals]
+    assert [maya.MayaDT(m) for m in interval_array.midpoint] == [
+        i.midpoint for i in intervals
+    ]
+
+
+def test_interval_array_contains_dt():
+    intervals = make_intervals([(0, 10), (5, 5), (-20, 40)])
+    interval_array = IntervalArray.from_intervals(intervals)
+    point = intervals[0].start.add(seconds=5)
+    assert interval_array.contains_dt(point) == [
+        i.contains_dt(point) for i in intervals
+    ]
+
+    points = [i.start for i in intervals]
+    assert interval_array.contains_dt(points) == [
+        i.contains_dt(p) for i, p in zip(intervals, points)
+    ]
+    with pytest.raises(ValueError):
+        interval_array.contains_dt(points[:2])
+
+
+@pytest.mark.parametrize("snap_out", (False, True))
+@pytest.mark.parametrize("timezone", ("UTC", "US/Eastern", "Asia/Kolkata"))
+def test_interval_array_quantize(snap_out, timezone):
+    intervals = make_intervals([(0, 4000), (731, 9001), (17, 19), (-3600, 1)])
+    interval_array = IntervalArray.from_intervals(intervals)
+    quantized = interval_array.quantize(
+        timedelta(minutes=15), snap_out=snap_out, timezone=timezone
+    )
+    assert quantized.to_intervals() == [
+        i.quantize(timedelta(minutes=15), snap_out=snap_out, timezone=timezone)
+        for i in intervals
+    ]
+    with pytest.raises(ValueError):
+        interval_array.quantize(0)
+
+
+def test_interval_array_sort_and_unique():
+    intervals = make_intervals([(5, 10), (0, 10), (5, 6), (0, 10)])
+    interval_array = IntervalArray.from_intervals(intervals)
+    assert interval_array.sort().to_intervals() == sorted(intervals)
+    assert interval_array.unique().to_intervals() == sorted(set(intervals))
+
+
+def test_timestamp_array():
+    base = maya.parse("2018-03-25T00:00:00Z")
+    timestamps = [base.add(seconds=s) for s in (30, -10, 30, 0)]
+    timestamp_array = TimestampArray(timestamps)
+    assert len(timestamp_array) == 4
+    assert timestamp_array.to_list() == timestamps
+    assert timestamp_array[1] == timestamps[1]
+    assert timestamp_array[:2].to_list() == timestamps[:2]
+    assert timestamp_array.sort().to_list() == sorted(timestamps)
+    assert timestamp_array.unique().to_list() == sorted(set(timestamps))
+    assert timestamp_array.take(timestamp_array.argsort()) == timestamp_array.sort()
+
+
+def total_duration(interval_array):
+    return sum(
+        end - start for start, end in zip(interval_array.starts, interval_array.ends)
+    )
+
+
+@requires_shared_memory
+def test_shared_timestamp_array():
+    timestamp_array = TimestampArray(range(-5, 1000))
+    with timestamp_array.to_shared_memory() as shared:
+        assert shared == timestamp_array
+        assert shared.shared_memory_name is not None
+        assert timestamp_array.shared_memory_name is None
+
+        attached = TimestampArray.from_shared_memory(shared.shared_memory_name)
+        assert len(pickle.dumps(shared)) < 200
+        unpickled = pickle.loads(pickle.dumps(shared))
+        # All of them share the same memory.
+        attached.epochs[0] = 42
+        assert shared[0] == unpickled[0] == maya.MayaDT(42)
+        assert shared.sort()[-1] == timestamp_array[-1]
+        attached.close()
+        unpickled.close()
+
+    # Unshared arrays still pickle their epochs.
+    assert pickle.loads(pickle.dumps(timestamp_array)) == timestamp_array
+    with TimestampArray().to_shared_memory() as shared:
+        assert len(pickle.loads(pickle.dumps(shared))) == 0
+
+
+@requires_shared_memory
+def test_shared_interval_array_in_workers():
+    interval_array = IntervalArray(range(0, 1000), range(10, 1010))
+    with interval_array.to_shared_memory() as shared:
+        assert shared.to_intervals() == interval_array.to_intervals()
+        pool = multiprocessing.Pool(2)
+        try:
+            assert pool.map(total_duration, [shared] * 4) == [10000] * 4
+        finally:
+            pool.terminate()
+            pool.join()
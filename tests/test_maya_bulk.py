@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import io
+import pickle
+
+import pytest
+
+import maya
+from maya.arrays import NAT
+from maya.bulk import (
+    ConversionError,
+    Converter,
+    chunk_bounds,
+    convert_file,
+    convert_stream,
+    read_header,
+    read_timestamps,
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "input.csv"
+    lines = ["id,timestamp\n"]
+    for i in range(500):
+        lines.append(
+            "{},2018-03-{:02d}T{:02d}:30:00Z\r\n".format(i, i % 28 + 1, i % 24)
+        )
+    path.write_bytes("".join(lines).encode("utf-8"))
+    return path
+
+
+def test_converter():
+    converter = Converter(parser="any", output_format="epoch", timezone="Europe/Berlin")
+    assert converter.convert_lines(["2018-03-25 03:30\n", "\n", "March 1, 2018\n"]) == [
+        "1521941400\n",
+        "\n",
+        "1519858800\n",
+    ]
+    copy = pickle.loads(pickle.dumps(converter))
+    assert copy.convert("2018-03-25 03:30") == "1521941400"
+    with pytest.raises(ConversionError) as error:
+        converter.convert_lines(["not a date"], first_line_number=7)
+    assert pickle.loads(pickle.dumps(error.value)).line_number == 7
+    with pytest.raises(ValueError):
+        Converter(output_format="unknown")
+
+
+@pytest.mark.parametrize("parser", ["when", "any"])
+def test_converter_languages(parser):
+    # Languages travel with the converter, e.g. to spawned worker processes.
+    german = pickle.loads(pickle.dumps(Converter(parser=parser, languages=["de"])))
+    assert german.convert("1 März 2018") == "2018-03-01T00:00:00Z"
+    french = pickle.loads(pickle.dumps(Converter(parser=parser, languages=["fr"])))
+    with pytest.raises(ValueError):
+        french.convert("1 März 2018")
+
+
+def test_chunk_bounds(log_file):
+    data = log_file.read_bytes()
+    _, start = read_header(str(log_file))
+    bounds = chunk_bounds(str(log_file), chunk_size=1000, start=start)
+    assert bounds[0][0] == start
+    assert bounds[-1][1] == len(data)
+    for (_, end), (next_start, _) in zip(bounds, bounds[1:]):
+        assert end == next_start
+        assert data[end - 1 : end] == b"\n"
+    assert len(bounds) == len(data) // 1000 + 1
+    assert chunk_bounds(str(log_file), start=len(data)) == []
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_convert_file(log_file, workers):
+    converter = Converter(output_format="epoch", column=1)
+    header, start = read_header(str(log_file))
+    assert header == "id,timestamp\n"
+
+    expected = io.StringIO()
+    with io.open(str(log_file), newline="") as f:
+        f.readline()
+        convert_stream(f, expected, converter)
+
+    output = io.StringIO()
+    convert_file(
+        str(log_file), output, converter, workers=workers, chunk_size=1000, start=start
+    )
+    assert output.getvalue() == expected.getvalue()
+    assert output.getvalue().startswith("0,1519864200\n1,1519954200\n")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_read_timestamps(tmp_path, workers):
+    path = tmp_path / "input.txt"
+    path.write_text("2018-03-25T01:30:00Z\n\ninvalid\n" * 100)
+    timestamps = read_timestamps(
+        str(path), Converter(errors="keep"), workers=workers, chunk_size=64
+    )
+    assert len(timestamps) == 200
+    assert list(timestamps.epochs[:2]) == [1521941400, NAT]
+
+    timestamps = read_timestamps(str(path), Converter(errors="skip"), workers=workers)
+    assert timestamps == maya.TimestampArray([1521941400] * 100)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_error_line_numbers(tmp_path, workers):
+    path = tmp_path / "input.txt"
+    path.write_text("2018-03-25T01:30:00Z\n" * 200 + "invalid\n")
+    with pytest.raises(ConversionError) as error:
+        convert_file(
+            str(path), io.StringIO(), Converter(), workers=workers, chunk_size=100
+        )
+    assert error.value.line_number == 201
+    with pytest.raises(ConversionError) as error:
+        read_timestamps(str(path), Converter(), workers=workers, chunk_size=100)
+    assert error.value.line_number == 201
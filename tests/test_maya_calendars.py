@@ -0,0 +1,116 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import maya
+from maya.arrays import IntervalArray, TimestampArray
+from maya.calendars import BusinessCalendar
+
+HOLIDAYS = [
+    "2018-01-01",
+    "2018-03-30",
+    "2018-04-02",
+    "2018-12-25",
+    "2018-12-26",
+    "2019-01-01",
+]
+
+
+def is_business_day(calendar, day):
+    return calendar.weekmask[day.weekday()] and day not in calendar.holidays
+
+
+def naive_between(calendar, start, end):
+    sign = 1 if start <= end else -1
+    start, end = min(start, end), max(start, end)
+    days = (start + timedelta(days=i) for i in range((end - start).days))
+    return sign * sum(1 for day in days if is_business_day(calendar, day))
+
+
+def naive_add(calendar, day, n):
+    while not is_business_day(calendar, day):
+        day += timedelta(days=1)
+    step = 1 if n >= 0 else -1
+    for _ in range(abs(n)):
+        day += timedelta(days=step)
+        while not is_business_day(calendar, day):
+            day += timedelta(days=step)
+    return day
+
+
+@pytest.mark.parametrize("weekmask", ("1111100", "Sun Mon Tue Wed Thu", "0010000"))
+def test_matches_naive_counting(weekmask):
+    calendar = BusinessCalendar(weekmask, holidays=HOLIDAYS)
+    rng = random.Random(weekmask)
+    base = date(2018, 1, 1)
+    for _ in range(200):
+        start = base + timedelta(days=rng.randint(-400, 800))
+        end = start + timedelta(days=rng.randint(-60, 60))
+        n = rng.randint(-30, 30)
+        start_dt = maya.parse(start.isoformat())
+        end_dt = maya.parse(end.isoformat())
+        assert calendar.is_business_day(start_dt) == is_business_day(calendar, start)
+        assert calendar.business_days_between(start_dt, end_dt) == naive_between(
+            calendar, start, end
+        )
+        assert calendar.add_business_days(start_dt, n).date == naive_add(
+            calendar, start, n
+        )
+
+
+def test_vectorized_queries():
+    calendar = BusinessCalendar(holidays=HOLIDAYS)
+    base = maya.parse("2018-03-28T10:00:00Z")
+    timestamps = TimestampArray([base.add(days=i) for i in range(10)])
+    assert calendar.is_business_day(timestamps) == [
+        calendar.is_business_day(t) for t in timestamps
+    ]
+    assert calendar.add_business_days(timestamps, 3).to_list() == [
+        calendar.add_business_days(t, 3) for t in timestamps
+    ]
+    assert calendar.add_business_days(timestamps, range(10)).to_list() == [
+        calendar.add_business_days(t, n) for n, t in enumerate(timestamps)
+    ]
+    intervals = [maya.MayaInterval(start=base, end=t) for t in timestamps]
+    assert list(
+        calendar.business_days_between(IntervalArray.from_intervals(intervals))
+    ) == [calendar.business_days_between(i) for i in intervals]
+    with pytest.raises(ValueError):
+        calendar.add_business_days(timestamps, [1, 2])
+
+
+def test_time_of_day_and_timezone():
+    calendar = BusinessCalendar(timezone="Europe/Berlin", holidays=["2018-03-30"])
+    # Thursday 23:30 in Berlin, before the Good Friday holiday and DST change.
+    thursday = maya.parse("2018-03-29T21:30:00Z")
+    tuesday = calendar.add_business_days(thursday, 2)
+    assert tuesday == maya.parse("2018-04-03T21:30:00Z")
+    assert calendar.is_business_day(maya.parse("2018-03-29T22:30:00Z")) is False
+
+
+def test_roll_policies():
+    calendar = BusinessCalendar()
+    saturday = maya.parse("2018-03-24T12:00:00Z")
+    assert calendar.add_business_days(saturday, 0) == maya.parse("2018-03-26T12:00:00Z")
+    assert calendar.add_business_days(saturday, 0, roll="backward") == maya.parse(
+        "2018-03-23T12:00:00Z"
+    )
+    with pytest.raises(ValueError):
+        calendar.add_business_days(saturday, 1, roll="raise")
+    with pytest.raises(ValueError):
+        calendar.add_business_days(saturday, 1, roll="sideways")
+
+
+def test_business_days_of_interval():
+    calendar = BusinessCalendar(holidays=HOLIDAYS)
+    interval = maya.MayaInterval(
+        start=maya.parse("2018-03-29T12:00:00Z"), end=maya.parse("2018-04-05T00:00:00Z")
+    )
+    assert [dt.day for dt in calendar.business_days(interval)] == [3, 4]
+
+
+def test_invalid_weekmasks():
+    for weekmask in ("0000000", "11111", "Mon Fun"):
+        with pytest.raises(ValueError):
+            BusinessCalendar(weekmask)
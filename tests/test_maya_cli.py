@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+
+import pytest
+
+import maya
+from maya.cli import main
+
+CSV = (
+    "id,timestamp,note\n"
+    "1,2018-03-25T01:30:00+02:00,a\n"
+    '2,"Sun, 25 Mar 2018 01:30:00 +0200","b, c"\n'
+    "3,not a date,d\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text(CSV)
+    return path
+
+
+def run(*args):
+    return main([str(arg) for arg in args])
+
+
+def test_convert_column_by_name(csv_file, tmp_path):
+    output = tmp_path / "output.csv"
+    status = run(
+        csv_file, "--header", "-c", "timestamp", "-f", "epoch", "--errors", "keep",
+        "-o", output,
+    )  # fmt: skip
+    assert status == 0
+    assert output.read_text() == (
+        "id,timestamp,note\n"
+        "1,1521934200,a\n"
+        '2,1521934200,"b, c"\n'
+        "3,not a date,d\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "errors, expected",
+    [("skip", ["1", "2"]), ("blank", ["1", "2", "3"])],
+)
+def test_error_policies(csv_file, tmp_path, errors, expected):
+    output = tmp_path / "output.csv"
+    assert run(csv_file, "--header", "-c", "2", "--errors", errors, "-o", output) == 0
+    lines = output.read_text().splitlines()[1:]
+    assert [line.split(",")[0] for line in lines] == expected
+    assert lines[0] == "1,2018-03-24T23:30:00Z,a"
+
+
+def test_failure(csv_file, tmp_path, capsys):
+    assert run(csv_file, "--header", "-c", "2", "-o", tmp_path / "output.csv") == 1
+    error = "maya: line 4: invalid datetime input: 'not a date'\n"
+    assert capsys.readouterr().err == error
+    assert run(csv_file, "-c", "timestamp") == 1
+    assert "--header" in capsys.readouterr().err
+
+
+def test_unknown_timezone(csv_file, capsys):
+    with pytest.raises(SystemExit) as error:
+        run(csv_file, "-t", "Mars/Olympus_Mons")
+    assert error.value.code == 2
+    assert "unknown timezone: 'Mars/Olympus_Mons'" in capsys.readouterr().err
+
+
+def test_languages(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1 März 2018\n", encoding="utf-8")
+    output = tmp_path / "output.txt"
+    args = ("-p", "when", "--errors", "keep", "-o", output)
+    assert run(path, "--languages", "fr", "-w", "2", *args) == 0
+    assert output.read_text(encoding="utf-8") == "1 März 2018\n"
+    assert run(path, "--languages", "de", *args) == 0
+    assert output.read_text(encoding="utf-8") == "2018-03-01T00:00:00Z\n"
+    # The languages only apply to the command.
+    assert maya.when("1 März 2018") == maya.parse("2018-03-01")
+
+
+def test_whole_lines_with_workers(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text(
+        "".join("2018-03-{:02d}T10:00:00Z\n".format(day % 28 + 1) for day in range(100))
+    )
+    single = tmp_path / "single.txt"
+    parallel = tmp_path / "parallel.txt"
+    assert run(path, "-p", "iso", "-f", "rfc2822", "-o", single) == 0
+    assert run(path, "-p", "iso", "-f", "rfc2822", "-w", "2", "-o", parallel) == 0
+    assert single.read_text() == parallel.read_text()
+    assert single.read_text().splitlines()[:2] == [
+        "Thu, 01 Mar 2018 10:00:00 GMT",
+        "Fri, 02 Mar 2018 10:00:00 GMT",
+    ]
+
+
+def test_module_entry_point():
+    process = subprocess.run(
+        [sys.executable, "-m", "maya", "-f", "epoch"],
+        input=b"2018-03-25T01:30:00Z\n",
+        stdout=subprocess.PIPE,
+    )
+    assert process.returncode == 0
+    assert process.stdout == b"1521941400\n"
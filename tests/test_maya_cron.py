@@ -0,0 +1,186 @@
+import random
+from datetime import timedelta
+
+import pytest
+import pytz
+
+import maya
+from maya.cron import CronExpression
+
+
+def expand(text, low, high):
+    values = set()
+    for item in text.split(","):
+        item, _, step = item.partition("/")
+        if item == "*":
+            start, stop = low, high
+        elif "-" in item:
+            start, stop = map(int, item.split("-"))
+        else:
+            start = stop = int(item)
+            if step:
+                stop = high
+        values.update(range(start, stop + 1, int(step or 1)))
+    return values
+
+
+def brute_force_next(text, timezone, dt):
+    """Scans wall-clock minutes with a straightforward cron matcher."""
+    minute, hour, day, month, weekday = text.split()
+    minutes, hours, days, months = (
+        expand(minute, 0, 59),
+        expand(hour, 0, 23),
+        expand(day, 1, 31),
+        expand(month, 1, 12),
+    )
+    weekdays = {value % 7 for value in expand(weekday, 0, 7)}
+    # Wildcard or stepped minutes or hours fire at both occurrences of a
+    # repeated wall-clock time.
+    repeats = any(text.startswith("*") or "/" in text for text in (minute, hour))
+    tz = pytz.timezone(timezone)
+    # Repeated wall-clock times fire after later ones, so all candidates
+    # up to a few hours past the first one are compared.
+    wall = dt.datetime(to_timezone=timezone, naive=True).replace(
+        second=0, microsecond=0
+    )
+    wall -= timedelta(hours=3)
+    best = best_wall = None
+    while best is None or wall < best_wall + timedelta(hours=3):
+        wall += timedelta(minutes=1)
+        day_matches = (wall.day in days, wall.isoweekday() % 7 in weekdays)
+        if day != "*" and weekday != "*":
+            day_matches = any(day_matches)
+        else:
+            day_matches = all(day_matches)
+        fields = (wall.minute in minutes, wall.hour in hours, wall.month in months)
+        if not (day_matches and all(fields)):
+            continue
+        try:
+            occurrences = [tz.localize(wall, is_dst=None)]
+        except pytz.NonExistentTimeError:
+            continue
+        except pytz.AmbiguousTimeError:
+            occurrences = [tz.localize(wall, is_dst=True)]
+            if repeats:
+                occurrences.append(tz.localize(wall, is_dst=False))
+        for localized in occurrences:
+            fire = maya.MayaDT.from_datetime(localized)
+            if fire > dt and (best is None or fire < best):
+                best, best_wall = fire, wall
+    return best
+
+
+@pytest.mark.parametrize("timezone", ("UTC", "Europe/Berlin", "Australia/Lord_Howe"))
+@pytest.mark.parametrize(
+    "text",
+    (
+        "* * * * *",
+        "*/15 9-17 * * 1-5",
+        "0 0 13 * 5",
+        "30 2 * * *",
+        "0 * * * *",
+        "5,10 3 1-7 * 0",
+        "0 12 */10 * *",
+        "17 */5 * 2-11/3 *",
+    ),
+)
+def test_next_after_matches_brute_force(text, timezone):
+    expression = CronExpression(text, timezone=timezone)
+    rng = random.Random(text + timezone)
+    moments = [
+        maya.parse("2018-03-24T23:30:00Z"),
+        maya.parse("2018-10-27T23:30:00Z"),
+        maya.parse("2018-04-01T14:30:00Z"),
+        maya.parse("2018-09-30T15:30:00Z"),
+        maya.parse("2018-10-28T00:59:00Z"),
+        maya.parse("2018-10-28T01:10:00Z"),
+        maya.parse("2018-03-31T14:45:00Z"),
+    ]
+    moments += [maya.MayaDT(rng.randint(1500000000, 1600000000)) for _ in range(3)]
+    for moment in moments:
+        assert expression.next_after(moment) == brute_force_next(text, timezone, moment)
+        assert expression.matches(expression.next_after(moment))
+
+
+def test_macros_and_names():
+    assert CronExpression("@weekly").weekdays == CronExpression("0 0 * * SUN").weekdays
+    assert (
+        CronExpression("0 0 * JAN,jul 7").months == CronExpression("0 0 * 1,7 0").months
+    )
+    assert CronExpression("0 0 * * 7").weekdays == CronExpression("0 0 * * 0").weekdays
+
+
+def test_next_n():
+    expression = CronExpression("*/15 9-17 * * MON-FRI", timezone="Europe/Berlin")
+    start = maya.parse("2018-03-23T16:50:00Z")  # Friday, 17:50 in Berlin
+    fire_times = expression.next_n(start, 3)
+    assert [
+        f.datetime(to_timezone="Europe/Berlin").strftime("%a %H:%M") for f in fire_times
+    ] == ["Mon 09:00", "Mon 09:15", "Mon 09:30"]
+
+
+def test_leap_days_and_or_semantics():
+    expression = CronExpression("0 0 29 2 *")
+    assert expression.next_after(maya.parse("2018-01-01T00:00:00Z")) == maya.parse(
+        "2020-02-29T00:00:00Z"
+    )
+    expression = CronExpression("59 23 31 12 7")
+    assert expression.next_after(maya.parse("2018-01-01T00:00:00Z")) == maya.parse(
+        "2018-12-02T23:59:00Z"
+    )
+    # Restricting day of month and day of week fires on either.
+    expression = CronExpression("0 0 13 * 5")
+    fire_times = expression.next_n(maya.parse("2018-07-01T00:00:00Z"), 3)
+    assert [f.day for f in fire_times] == [6, 13, 20]
+
+
+def test_dst_transitions():
+    expression = CronExpression("30 2 * * *", timezone="Europe/Berlin")
+    # 02:30 does not exist on 2018-03-25 in Berlin.
+    assert expression.next_after(maya.parse("2018-03-24T12:00:00Z")) == maya.parse(
+        "2018-03-26T00:30:00Z"
+    )
+    # 02:30 happens twice on 2018-10-28 in Berlin and fires once.
+    fire_times = expression.next_n(maya.parse("2018-10-27T12:00:00Z"), 2)
+    assert fire_times == [
+        maya.parse("2018-10-28T00:30:00Z"),
+        maya.parse("2018-10-29T01:30:00Z"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, start, fire_times",
+    [
+        ("* * * * *", "00:57", ["00:58", "00:59", "01:00", "01:01"]),
+        ("* * * * *", "01:10", ["01:11", "01:12"]),
+        (
+            "*/15 * * * *",
+            "00:40",
+            ["00:45", "01:00", "01:15", "01:30", "01:45", "02:00"],
+        ),
+        ("*/15 * * * *", "01:10", ["01:15", "01:30"]),
+    ],
+)
+def test_wildcards_fire_through_repeated_hour(text, start, fire_times):
+    # 02:00 to 03:00 happens twice on 2018-10-28 in Berlin: from 00:00 to
+    # 01:00 and from 01:00 to 02:00 UTC.
+    expression = CronExpression(text, timezone="Europe/Berlin")
+    start = maya.parse("2018-10-28T{}:00Z".format(start))
+    assert [
+        f.datetime().strftime("%H:%M")
+        for f in expression.next_n(start, len(fire_times))
+    ] == fire_times
+
+
+@pytest.mark.parametrize(
+    "text",
+    ("* * * *", "60 * * * *", "* * 0 * *", "* * * FOO *", "5-1 * * * *", "*/0 * * * *"),
+)
+def test_invalid_expressions(text):
+    with pytest.raises(ValueError):
+        CronExpression(text)
+
+
+def test_never_firing_expression():
+    with pytest.raises(ValueError):
+        CronExpression("0 0 30 2 *").next_after(maya.now())
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+import maya
+from maya import Duration
+
+
+@pytest.mark.parametrize(
+    "string,expected",
+    [
+        ("P1Y2M10DT2H30M", "P1Y2M10DT2H30M"),
+        ("P2W", "P14D"),
+        ("PT36H", "P1DT12H"),
+        ("PT0,5S", "PT0.5S"),
+        ("PT1.000000001S", "PT1.000000001S"),
+        ("P0D", "PT0S"),
+        ("-P1MT1S", "-P1MT1S"),
+    ],
+)
+def test_iso8601_roundtrip(string, expected):
+    duration = Duration.from_iso8601(string)
+    assert duration.iso8601() == expected
+    assert Duration.from_iso8601(duration.iso8601()) == duration
+
+
+def test_invalid_iso8601():
+    for string in ("P", "PT", "1D", "P1.5Y", "P1DT"):
+        with pytest.raises(ValueError):
+            Duration.from_iso8601(string)
+    with pytest.raises(TypeError):
+        Duration(months=1.5)
+
+
+def test_fixed_arithmetic():
+    duration = Duration(hours=1, minutes=30)
+    assert duration.nanoseconds == 5400 * 10**9
+    assert duration.total_seconds() == 5400
+    assert duration == timedelta(minutes=90)
+    assert duration.to_timedelta() == timedelta(minutes=90)
+    assert duration + timedelta(minutes=30) == Duration(hours=2)
+    assert timedelta(minutes=30) + duration == Duration(hours=2)
+    assert duration - Duration(minutes=30) == Duration(hours=1)
+    assert duration * 2 == 2 * duration == Duration(hours=3)
+    assert -duration < Duration() < duration
+    assert abs(-duration) == duration
+    assert not Duration() and Duration(nanoseconds=1)
+    assert len({Duration(days=1), Duration(hours=24)}) == 1
+    assert Duration(microseconds=-1.5).to_timedelta() == timedelta(microseconds=-1)
+
+
+def test_hash_matches_timedelta():
+    assert hash(Duration(seconds=1)) == hash(timedelta(seconds=1))
+    assert len({Duration(seconds=1), timedelta(seconds=1)}) == 1
+    assert len({Duration(microseconds=-1.5), timedelta(microseconds=-1)}) == 2
+    assert {Duration(months=1): 1}[Duration(months=1)] == 1
+    assert hash(Duration(days=10**10)) == hash(Duration(days=10**10))
+
+
+def test_calendar_arithmetic():
+    duration = Duration(months=1, days=1)
+    with pytest.raises(ValueError):
+        duration.total_seconds()
+    with pytest.raises(ValueError):
+        duration < Duration(days=40)
+    start = datetime(2018, 1, 31, 12)
+    assert start + duration == start + relativedelta(months=1, days=1)
+    assert start - duration == start - relativedelta(months=1, days=1)
+    assert start + Duration(years=2, months=1) == datetime(2020, 2, 29, 12)
+
+
+def test_maya_arithmetic():
+    dt = maya.parse("2018-01-31T12:00:00Z")
+    assert dt + Duration(months=1) == maya.parse("2018-02-28T12:00:00Z")
+    assert dt - Duration(days=1, seconds=1.5) == maya.parse("2018-01-30T11:59:58.5Z")
+    assert (dt + Duration(milliseconds=250))._epoch == dt._epoch + 0.25
+    interval = maya.MayaInterval(start=dt, duration=Duration(years=1))
+    assert interval.end == maya.parse("2019-01-31T12:00:00Z")
+    interval = maya.MayaInterval(end=dt, duration=Duration(hours=2))
+    assert interval.duration == 7200
+    assert list(interval.split(Duration(hours=1))) == list(interval.split(3600))
+    with pytest.raises(ValueError):
+        interval.split(Duration(months=1))
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import io
+import random
+
+import pytest
+
+import maya
+from maya.arrays import IntervalArray
+from maya.icalendar import (
+    ICalendarWriter,
+    fold_line,
+    format_utc,
+    parse_duration,
+    read_interval_array,
+    read_intervals,
+    write_calendar,
+)
+
+CALENDAR = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VTIMEZONE
+TZID:Europe/Berlin
+BEGIN:STANDARD
+DTSTART:19701025T030000
+TZOFFSETFROM:+0200
+TZOFFSETTO:+0100
+END:STANDARD
+END:VTIMEZONE
+BEGIN:VEVENT
+UID:utc
+DTSTART:20180325T013000Z
+DTEND:20180325T020000Z
+END:VEVENT
+BEGIN:VEVENT
+UID:folded
+SUMMARY:A long summary which is folded
+ onto a second line
+DTSTART;TZID="Europe/Berlin":20180325T010000
+DURATION:PT2H
+BEGIN:VALARM
+TRIGGER:-PT15M
+DTSTART:20000101T000000Z
+END:VALARM
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20180325
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;TZID=W. Europe Standard Time:20180324T120000
+DURATION:P1D
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;TZID=Europe/Berlin:20180325T023000
+DTEND;TZID=Europe/Berlin:20181028T023000
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def make_intervals(n):
+    base = maya.parse("2018-03-25T00:00:00Z")
+    return [
+        maya.MayaInterval(start=base.add(hours=i), duration=1800 + i) for i in range(n)
+    ]
+
+
+def test_format_utc_matches_strftime():
+    rng = random.Random(0)
+    for _ in range(1000):
+        dt = maya.MayaDT(rng.uniform(-3e9, 4e9))
+        assert format_utc(dt._epoch) == dt.datetime().strftime("%Y%m%dT%H%M%SZ")
+
+
+def test_icalendar_property():
+    interval = maya.MayaInterval(
+        start=maya.parse("2018-03-25T01:30:00Z"), end=maya.parse("2018-03-25T02:00:00Z")
+    )
+    assert interval.icalendar == (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\n"
+        "DTSTART:20180325T013000Z\r\nDTEND:20180325T020000Z\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR"
+    )
+
+
+def test_writer_streams_a_single_calendar():
+    intervals = make_intervals(50)
+    output = io.StringIO()
+    with ICalendarWriter(output, properties={"X-WR-CALNAME": "Test"}) as writer:
+        writer.write_event(intervals[0], summary="First, and; only\none", uid="first")
+        writer.write_events(intervals[1:])
+    assert writer.count == 50
+    text = output.getvalue()
+    lines = text.split("\r\n")
+    assert lines[:4] == [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//maya//maya//EN",
+        "X-WR-CALNAME:Test",
+    ]
+    assert lines[-2:] == ["END:VCALENDAR", ""]
+    assert text.count("BEGIN:VEVENT") == text.count("END:VEVENT") == 50
+    assert "UID:first\r\n" in text
+    assert "SUMMARY:First\\, and\\; only\\none\r\n" in text
+    assert "DTSTART:20180325T010000Z\r\nDTEND:20180325T013001Z\r\n" in text
+    uids = [line for line in lines if line.startswith("UID:")]
+    assert len(set(uids)) == 50
+
+
+def test_interval_array_export():
+    intervals = make_intervals(10)
+    from_list = io.StringIO()
+    from_array = io.StringIO()
+    writer = ICalendarWriter(from_list)
+    writer._uid_prefix = "test"
+    writer.write_events(intervals)
+    writer.close()
+    writer = ICalendarWriter(from_array)
+    writer._uid_prefix = "test"
+    writer.write_events(IntervalArray.from_intervals(intervals))
+    writer.close()
+    assert from_list.getvalue() == from_array.getvalue()
+    assert write_calendar(io.StringIO(), intervals) == 10
+
+
+def test_line_folding():
+    line = "SUMMARY:" + "ä" * 100
+    folded = fold_line(line)
+    parts = folded.split("\r\n")
+    assert all(len(part.encode("utf-8")) <= 75 for part in parts)
+    assert all(part.startswith(" ") for part in parts[1:])
+    assert "".join(part[1:] if i else part for i, part in enumerate(parts)) == line
+    assert fold_line("SUMMARY:short") == "SUMMARY:short"
+
+
+def test_read_intervals():
+    lines = io.StringIO(CALENDAR.replace("\n", "\r\n"), newline="")
+    intervals = list(
+        read_intervals(lines, tzids={"W. Europe Standard Time": "Europe/Berlin"})
+    )
+    assert [(i.start.iso8601(), i.end.iso8601()) for i in intervals] == [
+        ("2018-03-25T01:30:00Z", "2018-03-25T02:00:00Z"),
+        ("2018-03-25T00:00:00Z", "2018-03-25T02:00:00Z"),
+        ("2018-03-25T00:00:00Z", "2018-03-26T00:00:00Z"),
+        # A nominal day across the start of summer time has 23 hours.
+        ("2018-03-24T11:00:00Z", "2018-03-25T10:00:00Z"),
+        # 02:30 is skipped in spring and occurs twice in autumn.
+        ("2018-03-25T01:30:00Z", "2018-10-28T00:30:00Z"),
+    ]
+
+
+def test_read_interval_array_and_roundtrip():
+    intervals = make_intervals(20)
+    output = io.StringIO()
+    write_calendar(output, intervals)
+    data = io.BytesIO(output.getvalue().encode("utf-8"))
+    assert read_interval_array(data).to_intervals() == intervals
+    assert list(read_intervals(io.StringIO(output.getvalue()))) == intervals
+
+
+def test_read_errors():
+    with pytest.raises(ValueError):
+        list(
+            read_intervals(
+                ["BEGIN:VEVENT", "DTSTART;TZID=Nowhere:20180101T000000", "END:VEVENT"]
+            )
+        )
+    with pytest.raises(ValueError):
+        list(read_intervals(["BEGIN:VEVENT", "DTEND:20180101T000000Z", "END:VEVENT"]))
+    with pytest.raises(ValueError):
+        parse_duration("PT")
+
+
+def test_parse_duration():
+    assert parse_duration("P2W") == (14, 0)
+    assert parse_duration("-P1DT2H3M4S") == (-1, -7384)
@@ -0,0 +1,146 @@
+import pytest
+
+import maya
+from maya import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_off_by_default():
+    assert not instrumentation.is_enabled()
+    maya.parse("2018-03-25T01:30:00Z")
+    assert instrumentation.snapshot()["counters"] == {}
+
+
+def test_wrappers_only_in_place_while_on():
+    parse, iso8601 = maya.parse, maya.MayaDT.iso8601
+    assert not hasattr(parse, "__wrapped__")
+    with instrumentation.collect():
+        assert maya.parse.__wrapped__ is parse
+        assert maya.core.parse is maya.tiered.parse is maya.parse
+        assert maya.MayaDT.iso8601.__wrapped__ is iso8601
+    assert maya.parse is maya.core.parse is maya.tiered.parse is parse
+    assert maya.MayaDT.iso8601 is iso8601
+
+
+def test_fallback_parses_once(monkeypatch):
+    calls = []
+    pendulum_parse = maya.core.pendulum.parse
+
+    def counting_parse(*args, **kwargs):
+        calls.append(args)
+        return pendulum_parse(*args, **kwargs)
+
+    monkeypatch.setattr(maya.core.pendulum, "parse", counting_parse)
+    string = "March 25 2018 02:30"
+    expected = maya.parse(string, timezone="Europe/Berlin")
+    with instrumentation.collect() as metrics:
+        assert maya.parse(string, timezone="Europe/Berlin") == expected
+    assert metrics.counters["parse.fallback"] == 1
+    assert len(calls) == 2
+
+
+def test_collect_counts_and_times_hot_paths():
+    with instrumentation.collect() as metrics:
+        dt = maya.parse("2018-03-25T01:30:00Z")
+        maya.parse("Sun, 25 Mar 2018 01:30:00 +0200")
+        dt.iso8601()
+        dt.rfc2822()
+        with pytest.raises(ValueError):
+            maya.when("not a date at all")
+    assert not instrumentation.is_enabled()
+    maya.parse("2018-03-25T01:30:00Z")
+
+    counters = metrics.counters
+    assert counters["parse.calls"] == 2
+    assert counters["parse.fallback"] == 1
+    assert counters["format.iso8601.calls"] == 1
+    assert counters["format.rfc2822.calls"] == 1
+    assert counters["when.errors"] == counters["when.calls"] == 1
+    histogram = metrics.histograms["parse"]
+    assert histogram.count == 2
+    assert histogram.min <= histogram.percentile(50) <= histogram.max
+    snapshot = metrics.snapshot()
+    assert snapshot["histograms"]["parse"]["count"] == 2
+    assert "timezone_offsets" in snapshot["caches"]
+
+
+def test_nested_collection_and_global_registry():
+    registry = instrumentation.enable()
+    with instrumentation.collect() as outer:
+        maya.parse("2018-03-25T01:30:00Z")
+        with instrumentation.collect() as inner:
+            maya.parse("2018-03-25T01:30:00Z")
+    assert inner.counters["parse.calls"] == 1
+    assert outer.counters["parse.calls"] == 2
+    assert registry.counters["parse.calls"] == 2
+    instrumentation.disable()
+    maya.parse("2018-03-25T01:30:00Z")
+    assert instrumentation.snapshot()["counters"]["parse.calls"] == 2
+    instrumentation.reset()
+    assert instrumentation.snapshot()["counters"] == {}
+
+
+def test_listeners():
+    events = []
+
+    def listener(*event):
+        events.append(event)
+
+    instrumentation.add_listener(listener)
+    try:
+        maya.parse("2018-03-25T01:30:00Z")
+        assert events == []
+        with instrumentation.collect():
+            maya.parse("2018-03-25T01:30:00Z")
+    finally:
+        instrumentation.remove_listener(listener)
+    assert [(kind, name) for kind, name, _ in events] == [
+        ("timing", "parse"),
+        ("counter", "parse.calls"),
+    ]
+
+
+def test_histogram():
+    histogram = instrumentation.Histogram()
+    assert histogram.mean is None and histogram.percentile(50) is None
+    for seconds in (1e-6, 3e-6, 5e-3, 2.0):
+        histogram.observe(seconds)
+    assert histogram.count == 4
+    assert histogram.percentile(50) == 4e-6
+    assert histogram.percentile(100) == 2.0
+
+
+def test_trace_when():
+    tracer = instrumentation.trace_when(threshold=0, capacity=2)
+    try:
+        for string in ("2018-03-25", "tomorrow", "25 March 2018"):
+            maya.when(string, timezone="Europe/Berlin")
+    finally:
+        assert instrumentation.stop_tracing_when() is tracer
+    maya.when("tomorrow")
+    assert tracer.calls == 3
+    traces = tracer.traces()
+    assert [trace.input for trace in traces] == ["tomorrow", "25 March 2018"]
+    trace = traces[-1]
+    assert trace.locale == "en"
+    assert trace.timezone == "Europe/Berlin"
+    assert set(trace.stages) == {"setup", "dateparser", "convert"}
+    assert trace.stage in trace.stages
+    assert trace.duration == pytest.approx(sum(trace.stages.values()))
+    assert tracer.slowest(1)[0].duration == max(t.duration for t in traces)
+
+
+def test_trace_when_threshold():
+    tracer = instrumentation.trace_when(threshold=60)
+    try:
+        assert maya.when("2018-03-25") == maya.parse("2018-03-25")
+    finally:
+        instrumentation.stop_tracing_when()
+    assert tracer.calls == 1
+    assert len(tracer) == 0
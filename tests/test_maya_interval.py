@@ -351,6 +351,35 @@ def test_interval_split_non_positive_delta():
         list(interval.split(timedelta(seconds=-10)))
 
 
+def test_interval_split_is_a_lazy_sequence():
+    start = maya.parse("2018-01-01T00:00:00Z")
+    interval = maya.MayaInterval(start=start, end=start.add(days=1, seconds=30))
+    chunks = interval.split(timedelta(minutes=1))
+    expected = list(chunks)
+    assert len(chunks) == 24 * 60 + 1
+    assert chunks[0] == maya.MayaInterval(start=start, duration=60)
+    assert chunks[-1] == maya.MayaInterval(start=start.add(days=1), duration=30)
+    assert list(chunks[10:20:3]) == expected[10:20:3]
+    assert list(reversed(chunks)) == expected[::-1]
+    assert len(interval.split(timedelta(minutes=1), include_remainder=False)) == 24 * 60
+
+
+def test_interval_split_of_a_year_into_minutes():
+    start = maya.parse("2018-01-01T00:00:00Z")
+    interval = maya.MayaInterval(start=start, end=start.add(years=1))
+    chunks = interval.split(60)
+    assert len(chunks) == 365 * 24 * 60
+    assert chunks[-1] == maya.MayaInterval(end=interval.end, duration=60)
+
+
+def test_interval_split_to_array():
+    start = maya.parse("2018-01-01T00:00:00Z")
+    interval = maya.MayaInterval(start=start, end=start.add(hours=1, minutes=5))
+    chunks = interval.split(timedelta(minutes=10))
+    assert chunks.to_array().to_intervals() == list(chunks)
+    assert list(chunks.to_array().duration) == [600] * 6 + [300]
+
+
 @pytest.mark.parametrize(
     "start,end,minutes,timezone,snap_out,expected_start,expected_end",
     [
@@ -522,6 +551,120 @@ def test_interval_from_iso8601_duration():
     assert interval.end == e
 
 
+@pytest.mark.parametrize(
+    "string,start,end",
+    [
+        (
+            "P1Y2M10DT2H30M/2008-05-11T15:30:00Z",
+            "2007-03-01T13:00:00Z",
+            "2008-05-11T15:30:00Z",
+        ),
+        ("2018-01-31T00:00:00Z/P1M", "2018-01-31T00:00:00Z", "2018-02-28T00:00:00Z"),
+        ("2018-01-01T00:00:00Z/P1Y", "2018-01-01T00:00:00Z", "2019-01-01T00:00:00Z"),
+        ("2018-01-01T00:00:00Z/PT1,5H", "2018-01-01T00:00:00Z", "2018-01-01T01:30:00Z"),
+        ("2018-01-01T00:00:00Z/P0.5D", "2018-01-01T00:00:00Z", "2018-01-01T12:00:00Z"),
+        ("2007-12-14T13:30Z/15:30Z", "2007-12-14T13:30:00Z", "2007-12-14T15:30:00Z"),
+        ("2008-02-15/03-14", "2008-02-15T00:00:00Z", "2008-03-14T00:00:00Z"),
+        ("2007-11-13T09:00/15T17:00", "2007-11-13T09:00:00Z", "2007-11-15T17:00:00Z"),
+        (
+            "2007-12-14T13:30+01:00/15:30",
+            "2007-12-14T12:30:00Z",
+            "2007-12-14T14:30:00Z",
+        ),
+        # Ends shorter than the start which are complete nonetheless.
+        (
+            "2007-03-01T13:00:00Z/2008-05-11",
+            "2007-03-01T13:00:00Z",
+            "2008-05-11T00:00:00Z",
+        ),
+        (
+            "2007-03-01T13:00:00+05:00/2008-05-11T15:30Z",
+            "2007-03-01T08:00:00Z",
+            "2008-05-11T15:30:00Z",
+        ),
+        (
+            "2007-03-01T13:00:00.123Z/2008-05-11T15:30:00Z",
+            "2007-03-01T13:00:00.123Z",
+            "2008-05-11T15:30:00Z",
+        ),
+    ],
+)
+def test_interval_from_iso8601_forms(string, start, end):
+    interval = maya.MayaInterval.from_iso8601(string)
+    assert interval.start == maya.parse(start)
+    assert interval.end == maya.parse(end)
+
+
+def test_interval_from_iso8601_invalid():
+    strings = (
+        "2018-01-01T00:00:00Z/P",
+        "2018-01-01T00:00:00Z/PT",
+        "a/b/c",
+        "P1D/P1D",
+        "2018-01-01/-P1D",
+        # Shortened ends in basic format are ambiguous.
+        "20071213T1330/1530",
+    )
+    for string in strings:
+        with pytest.raises(ValueError):
+            maya.MayaInterval.from_iso8601(string)
+    interval = maya.MayaInterval.from_iso8601("20071213T1330Z/20071213T1530Z")
+    assert interval.end == maya.parse("2007-12-13T15:30:00Z")
+    assert maya.MayaInterval.parse_iso8601_duration("P1Q", start=maya.now()) is None
+
+
+def test_interval_from_iso8601_repeating():
+    intervals = maya.MayaInterval.from_iso8601("R3/2018-01-31T00:00:00Z/P1M")
+    assert len(intervals) == 3
+    assert [i.start.iso8601() for i in intervals] == [
+        "2018-01-31T00:00:00Z",
+        "2018-02-28T00:00:00Z",
+        "2018-03-31T00:00:00Z",
+    ]
+    assert intervals[-1].end == maya.parse("2018-04-30T00:00:00Z")
+
+    intervals = maya.MayaInterval.from_iso8601(
+        "R2/2018-01-01T00:00:00Z/2018-01-01T06:00:00Z"
+    )
+    assert list(intervals)[1] == maya.MayaInterval(
+        start=maya.parse("2018-01-01T06:00:00Z"), end=maya.parse("2018-01-01T12:00:00Z")
+    )
+
+    intervals = maya.MayaInterval.from_iso8601("R/PT1H/2018-01-01T00:00:00Z")
+    assert repr(intervals) == "<MayaIntervalRepetition unbounded>"
+    assert intervals[2].end == maya.parse("2017-12-31T22:00:00Z")
+    assert [i.start.hour for i in intervals[:3]] == [23, 22, 21]
+
+
+def test_interval_from_iso8601_repeating_unbounded():
+    intervals = maya.MayaInterval.from_iso8601("R/2018-01-01T00:00:00Z/PT1H")
+    assert intervals[5].start == maya.parse("2018-01-01T05:00:00Z")
+    assert len(intervals[2:][:3]) == 3
+    assert list(reversed(intervals[:2]))[0].start.hour == 1
+    with pytest.raises(TypeError):
+        len(intervals)
+    with pytest.raises(TypeError):
+        reversed(intervals)
+    with pytest.raises(TypeError):
+        intervals[-1]
+    with pytest.raises(TypeError):
+        intervals[::-1]
+
+
+def test_parse_many():
+    strings = [
+        "2018-03-18T14:27:18Z/P13DT13H48M9S",
+        "P2W/2018-03-19T14:27:18Z",
+        "2018-03-18T14:27:18Z/P13DT13H48M9S",
+    ]
+    interval_array = maya.IntervalArray.parse_many(strings)
+    assert interval_array.to_intervals() == [
+        maya.MayaInterval.from_iso8601(string) for string in strings
+    ]
+    with pytest.raises(ValueError):
+        maya.IntervalArray.parse_many(["R2/2018-01-01T00:00:00Z/P1D"])
+
+
 @pytest.mark.parametrize(
     "start_string,end_string,interval,expected_count",
     [
@@ -554,8 +697,36 @@ def test_intervals(start_string, end_string, interval, expected_count):
 def test_issue_168_regression():
     start = maya.now()
     end = start.add(weeks=1)
-    gen = maya.intervals(start=start, end=end, interval=60 * 60 * 24)
+    gen = iter(maya.intervals(start=start, end=end, interval=60 * 60 * 24))
     # Since the bug causes the generator to never end, first sanity
     # check that two results are not the same.
     assert next(gen) != next(gen)
     assert len(list(maya.intervals(start=start, end=end, interval=60 * 60 * 24))) == 7
+
+
+def test_intervals_is_a_range():
+    start = maya.parse("2019-01-03 11:40:00Z")
+    end = maya.parse("2019-01-04 11:40:00Z")
+    hours = maya.intervals(start, end, timedelta(hours=1))
+    expected = list(hours)
+    assert len(hours) == 24
+    assert hours[0] == start
+    assert hours[-1] == end.subtract(hours=1)
+    assert list(hours[::5]) == expected[::5]
+    assert list(reversed(hours)) == expected[::-1]
+    assert start.add(hours=3) in hours
+    assert start.add(hours=3, minutes=1) not in hours
+    assert end not in hours
+    assert start.add(hours=4) not in hours[::3]
+    assert start.add(hours=6) in hours[::3]
+    with pytest.raises(ValueError):
+        maya.intervals(start, end, 0)
+
+
+def test_intervals_to_array():
+    start = maya.parse("2019-01-03 11:40:00Z")
+    end = maya.parse("2019-01-04 11:40:00Z")
+    minutes = maya.intervals(start, end, 60)
+    epochs = minutes.to_array()
+    assert len(epochs) == 24 * 60
+    assert epochs.to_list() == list(minutes)
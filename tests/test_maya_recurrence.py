@@ -0,0 +1,129 @@
+import itertools
+from datetime import timedelta
+
+import pytest
+from dateutil import rrule
+
+import maya
+from maya.recurrence import Recurrence
+
+RULES = (
+    ("FREQ=WEEKLY;INTERVAL=2;BYDAY=TU;BYHOUR=9;BYMINUTE=0;BYSECOND=0", "Europe/Berlin"),
+    ("FREQ=MONTHLY;BYDAY=2TU", "Europe/Berlin"),
+    ("FREQ=MONTHLY;INTERVAL=5;BYMONTHDAY=31", "America/New_York"),
+    ("FREQ=YEARLY;INTERVAL=3;BYMONTH=2;BYMONTHDAY=29", "UTC"),
+    ("FREQ=DAILY;INTERVAL=3", "Australia/Lord_Howe"),
+    ("FREQ=WEEKLY;INTERVAL=3;WKST=SU;BYDAY=SU,TU", "UTC"),
+    ("FREQ=HOURLY;INTERVAL=5;BYHOUR=1,2,3", "Europe/Berlin"),
+    ("FREQ=MINUTELY;INTERVAL=45;BYHOUR=1,2,9", "America/New_York"),
+    ("FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1", "Asia/Kolkata"),
+)
+
+
+def brute_force_between(recurrence, start, end):
+    occurrences = []
+    for occurrence in recurrence:
+        if occurrence >= end.add(days=2):
+            break
+        if start <= occurrence < end:
+            occurrences.append(occurrence)
+    return sorted(occurrences)
+
+
+@pytest.mark.parametrize("rule,timezone", RULES)
+def test_between_matches_iteration(rule, timezone):
+    dtstart = maya.parse("2015-03-17T10:23:17Z")
+    recurrence = Recurrence.from_rrule(rule, dtstart, timezone=timezone)
+    for start, days in (
+        ("2015-03-01T00:00:00Z", 30),
+        ("2018-03-20T00:00:00Z", 20),
+        ("2018-10-27T12:00:00Z", 3),
+        ("2020-02-01T00:00:00Z", 60),
+    ):
+        start = maya.parse(start)
+        end = start.add(days=days)
+        assert recurrence.between(start, end) == brute_force_between(
+            recurrence, start, end
+        )
+
+
+def test_wall_clock_semantics_across_dst():
+    dtstart = maya.when("2018-03-06 09:00", timezone="Europe/Berlin")
+    recurrence = Recurrence("weekly", dtstart, timezone="Europe/Berlin", interval=2)
+    occurrences = recurrence.between(dtstart, dtstart.add(weeks=8))
+    assert [o.datetime(to_timezone="Europe/Berlin").hour for o in occurrences] == [
+        9
+    ] * 5
+    assert [o.datetime(to_timezone="Europe/Berlin").weekday() for o in occurrences] == [
+        1
+    ] * 5
+    assert occurrences[2] - occurrences[1] == timedelta(weeks=2, hours=-1)
+
+
+def test_nonexistent_and_ambiguous_times():
+    dtstart = maya.when("2018-03-24 02:30", timezone="Europe/Berlin")
+    recurrence = Recurrence("daily", dtstart, timezone="Europe/Berlin")
+    occurrences = recurrence.between(dtstart, dtstart.add(days=2))
+    # 02:30 does not exist on the 25th, the offset before the gap is used.
+    assert occurrences[1] == maya.parse("2018-03-25T01:30:00Z")
+
+    dtstart = maya.when("2018-10-27 02:30", timezone="Europe/Berlin")
+    recurrence = Recurrence("daily", dtstart, timezone="Europe/Berlin")
+    occurrences = recurrence.between(dtstart, dtstart.add(days=2))
+    # 02:30 happens twice on the 28th, the first one is used.
+    assert occurrences[1] == maya.parse("2018-10-28T00:30:00Z")
+
+
+def test_count_and_until():
+    dtstart = maya.parse("2018-01-01T08:00:00Z")
+    recurrence = Recurrence("daily", dtstart, count=3)
+    assert list(recurrence) == [dtstart, dtstart.add(days=1), dtstart.add(days=2)]
+    assert recurrence.between(dtstart.add(days=2), dtstart.add(days=10)) == [
+        dtstart.add(days=2)
+    ]
+    recurrence = Recurrence.from_rrule("FREQ=DAILY;UNTIL=20180103T080000Z", dtstart)
+    assert len(list(recurrence)) == 3
+
+
+def test_after():
+    dtstart = maya.parse("2018-01-01T08:00:00Z")
+    recurrence = Recurrence("monthly", dtstart, bymonthday=-1)
+    moment = maya.parse("2030-06-30T08:00:00Z")
+    assert recurrence.after(moment) == maya.parse("2030-07-31T08:00:00Z")
+    assert recurrence.after(moment, inc=True) == moment
+
+
+def test_intervals_and_cache():
+    dtstart = maya.parse("2018-01-01T08:00:00Z")
+    recurrence = Recurrence(
+        rrule.DAILY, dtstart, duration=timedelta(hours=1), cache_size=1
+    )
+    start, end = dtstart.add(days=100), dtstart.add(days=102)
+    assert recurrence.intervals(start, end) == [
+        maya.MayaInterval(start=start, duration=3600),
+        maya.MayaInterval(start=start.add(days=1), duration=3600),
+    ]
+    assert len(recurrence._cache) == 1
+    recurrence.between(dtstart, end)
+    assert list(recurrence._cache) == [(dtstart.epoch, end.epoch)]
+    with pytest.raises(ValueError):
+        Recurrence("daily", dtstart).intervals(start, end)
+
+
+def test_invalid_rrules():
+    dtstart = maya.parse("2018-01-01T08:00:00Z")
+    with pytest.raises(ValueError):
+        Recurrence.from_rrule("INTERVAL=2", dtstart)
+    with pytest.raises(ValueError):
+        Recurrence.from_rrule("FREQ=DAILY;BYFOO=1", dtstart)
+
+
+def test_first_occurrences_of_rules():
+    dtstart = maya.when("2018-01-02 09:00", timezone="Europe/Berlin")
+    recurrence = Recurrence.from_rrule(
+        "FREQ=MONTHLY;BYDAY=2TU", dtstart, timezone="Europe/Berlin"
+    )
+    assert [
+        o.datetime(to_timezone="Europe/Berlin").strftime("%Y-%m-%d %H:%M")
+        for o in itertools.islice(recurrence, 3)
+    ] == ["2018-01-09 09:00", "2018-02-13 09:00", "2018-03-13 09:00"]
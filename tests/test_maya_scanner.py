@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import io
+import random
+
+import pytest
+
+import maya
+from maya.scanner import TimestampScanner, _CANDIDATES, _candidates, scan, scan_stream
+
+DOCUMENT = """<html><body>
+<p>Posted on Sunday, March 25th, 2018 at 10:30 am.</p>
+<p>Updated <time datetime="2018-03-26T08:00:00+02:00">the next day</time>,
+mailed Sun, 25 Mar 2018 01:30:00 +0200 and due 04/01/2018 or 25&nbsp;April&nbsp;2018.</p>
+<p>Not dates: version 1.2.3, 2018-13-45, id 12018-03-25x, 10:30 alone.</p>
+</body></html>
+"""
+
+EXPECTED = [
+    ("Sunday, March 25th, 2018 at 10:30 am", "2018-03-25T10:30:00Z"),
+    ("2018-03-26T08:00:00+02:00", "2018-03-26T06:00:00Z"),
+    ("Sun, 25 Mar 2018 01:30:00 +0200", "2018-03-24T23:30:00Z"),
+    ("04/01/2018", "2018-04-01T00:00:00Z"),
+    ("25&nbsp;April&nbsp;2018", "2018-04-25T00:00:00Z"),
+]
+
+
+def test_scan_html():
+    matches = scan(DOCUMENT)
+    assert [(m.text, m.dt.iso8601()) for m in matches] == EXPECTED
+    for match in matches:
+        assert DOCUMENT[match.start : match.end] == match.text
+
+
+def test_scan_options():
+    text = "due 05/03/2018 10:00, posted 3 days ago and yesterday at 5pm"
+    matches = scan(text, timezone="Europe/Berlin", day_first=True)
+    assert [m.text for m in matches] == [
+        "05/03/2018 10:00",
+        "3 days ago",
+        "yesterday at 5pm",
+    ]
+    assert matches[0].dt == maya.parse("2018-03-05T09:00:00Z")
+    assert matches[1].dt < maya.now()
+    assert [m.text for m in scan(text, relative=False)] == ["05/03/2018 10:00"]
+
+
+@pytest.mark.parametrize("size", [1, 7, 100])
+def test_scan_stream(size):
+    chunks = [DOCUMENT[i : i + size] for i in range(0, len(DOCUMENT), size)]
+    assert list(scan_stream(chunks)) == scan(DOCUMENT)
+    assert list(scan_stream(io.StringIO(DOCUMENT * 3))) == scan(DOCUMENT * 3)
+
+
+def test_scanner_is_reusable():
+    scanner = TimestampScanner()
+    assert scanner.feed(DOCUMENT) + scanner.close() == scanner.scan(DOCUMENT)
+    assert scanner.feed(DOCUMENT) + scanner.close() == scanner.scan(DOCUMENT)
+
+
+def test_prefilter_finds_all_candidates():
+    rng = random.Random(0)
+    words = [
+        "2018-03-25", "T10:30:00Z", "Sunday,", "March", "25th,", "2018", "at", "10:30",
+        "pm", "+0200", "03/25/2018", "3", "days", "ago", "an", "hour", "yesterday",
+        "of", "&nbsp;", "x", "1.2", "-", "/", "lorem ipsum dolor sit amet " * 4,
+    ]  # fmt: skip
+    for _ in range(500):
+        text = "".join(
+            rng.choice(words) + rng.choice(["", " ", ", ", "."])
+            for _ in range(rng.randint(1, 300))
+        )
+        expected = [match.span() for match in _CANDIDATES.finditer(text)]
+        assert [match.span() for match in _candidates(text)] == expected
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import random
+
+import pytest
+
+import maya
+from maya.tiered import TieredParser, parse_iso8601
+
+
+def random_timestamp(rng):
+    string = "{:04d}-{:02d}-{:02d}".format(
+        rng.randint(1900, 2100), rng.randint(1, 12), rng.randint(1, 28)
+    )
+    if rng.random() < 0.8:
+        string += "{}{:02d}:{:02d}".format(
+            rng.choice("T "), rng.randint(0, 23), rng.randint(0, 59)
+        )
+        if rng.random() < 0.8:
+            string += ":{:02d}".format(rng.randint(0, 59))
+            if rng.random() < 0.5:
+                string += ".{}".format(rng.randint(0, 999999))
+        string += rng.choice(["", "Z", "+02:00", "-05:30", "+0100", "+01"])
+    return string
+
+
+def test_parse_iso8601_matches_parse():
+    rng = random.Random(0)
+    for _ in range(1000):
+        string = random_timestamp(rng)
+        timezone = rng.choice(["UTC", "Europe/Berlin", "America/New_York"])
+        expected = maya.parse(string, timezone=timezone)
+        assert parse_iso8601(string, timezone)._epoch == expected._epoch
+
+
+@pytest.mark.parametrize(
+    "string", ["2018-02-30", "2018-03-25T25:00:00Z", "25.03.2018", "next week"]
+)
+def test_parse_iso8601_invalid(string):
+    with pytest.raises(ValueError):
+        parse_iso8601(string)
+
+
+def test_parse_any():
+    assert maya.parse_any("2018-03-25T01:30:00+02:00") == maya.parse(
+        "2018-03-24T23:30:00Z"
+    )
+    assert maya.parse_any("Sun, 25 Mar 2018 01:30:00 +0200") == maya.parse(
+        "2018-03-24T23:30:00Z"
+    )
+    assert maya.parse_any("March 25, 2018 1:30 am", timezone="Europe/Berlin") == (
+        maya.parse("2018-03-25T00:30:00Z")
+    )
+    with pytest.raises(ValueError):
+        maya.parse_any("not a date")
+
+
+def test_strategy_order_and_stats():
+    parser = TieredParser()
+    parser.parse("2018-03-25T01:30:00Z", source="a")
+    parser.parse("2018-03-25T01:30:00Z", source="a")
+    stats = parser.stats()["strategies"]
+    assert stats["iso"] == {"attempts": 2, "hits": 2, "hit_rate": 1.0, "share": 1.0}
+    assert stats["pendulum"]["attempts"] == 0
+    assert parser.winner("a") == "iso"
+
+    # Once pendulum succeeded for a source, it is tried first.
+    parser.parse("Sun, 25 Mar 2018 01:30:00 +0200", source="b")
+    assert parser.winner("b") == "pendulum"
+    parser.parse("Mon, 26 Mar 2018 01:30:00 +0200", source="b")
+    stats = parser.stats()
+    assert stats["strategies"]["iso"]["attempts"] == 3
+    assert stats["strategies"]["pendulum"] == {
+        "attempts": 2,
+        "hits": 2,
+        "hit_rate": 1.0,
+        "share": 0.5,
+    }
+
+    with pytest.raises(ValueError):
+        parser.parse("not a date", source="b")
+    assert parser.stats()["failures"] == 1
+    assert parser.winner("b") == "pendulum"
+
+    parser.forget("b")
+    assert parser.winner("b") is None
+    parser.reset_stats()
+    assert parser.stats()["strategies"]["iso"]["attempts"] == 0
+
+
+def test_custom_strategies():
+    def epoch(string, timezone):
+        return maya.MayaDT(float(string))
+
+    parser = TieredParser(strategies=["iso", ("epoch", epoch)])
+    assert parser.names == ("iso", "epoch")
+    assert parser.parse("1521941400") == maya.MayaDT(1521941400)
+    with pytest.raises(ValueError):
+        parser.parse("next week")
+    with pytest.raises(ValueError):
+        TieredParser(strategies=[])
+
+
+def test_instrumentation_counters():
+    parser = TieredParser(strategies=["iso", "pendulum"])
+    with maya.instrumentation.collect() as metrics:
+        parser.parse("2018-03-25T01:30:00Z")
+        parser.parse("Sun, 25 Mar 2018 01:30:00 +0200")
+    assert metrics.counters["parse_any.iso.attempts"] == 2
+    assert metrics.counters["parse_any.iso.hits"] == 1
+    assert metrics.counters["parse_any.pendulum.hits"] == 1
@@ -0,0 +1,232 @@
+import random
+from datetime import datetime as Datetime, timedelta
+
+import pytest
+import pytz
+
+import maya
+from maya import timezones
+from maya.arrays import NAT
+
+ZONES = (
+    "UTC",
+    "Europe/Berlin",
+    "America/New_York",
+    "Australia/Lord_Howe",
+    "Asia/Kolkata",
+    "America/St_Johns",
+    "Pacific/Apia",
+    "EST",
+)
+
+
+def random_epochs(count=400, seed=3):
+    rng = random.Random(seed)
+    epochs = [rng.randint(-(2**31), 2**32) for _ in range(count)]
+    # Around the 2018 transitions of Europe/Berlin and America/New_York.
+    for transition in (1521939600, 1540688400, 1520751600, 1541311200):
+        epochs.extend(range(transition - 2, transition + 2))
+    return epochs
+
+
+def pytz_local(epoch, zone):
+    utc = pytz.utc.localize(Datetime(1970, 1, 1) + timedelta(seconds=epoch))
+    return utc.astimezone(pytz.timezone(zone))
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_to_local_fields_matches_pytz(zone):
+    epochs = random_epochs()
+    fields = timezones.to_local_fields(epochs, zone)
+    for index, epoch in enumerate(epochs):
+        expected = pytz_local(epoch, zone)
+        assert (
+            fields.year[index],
+            fields.month[index],
+            fields.day[index],
+            fields.hour[index],
+            fields.minute[index],
+            fields.second[index],
+            fields.utcoffset[index],
+        ) == (
+            expected.year,
+            expected.month,
+            expected.day,
+            expected.hour,
+            expected.minute,
+            expected.second,
+            int(expected.utcoffset().total_seconds()),
+        )
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_to_local_matches_pytz(zone):
+    epochs = random_epochs(seed=4)
+    local = timezones.to_local(epochs, zone)
+    for epoch, wall in zip(epochs, local):
+        expected = pytz_local(epoch, zone).replace(tzinfo=None)
+        assert Datetime(1970, 1, 1) + timedelta(seconds=wall) == expected
+
+
+def test_transition_table_accepts_timestamp_arrays():
+    epochs = maya.TimestampArray([maya.parse("2018-07-01T12:00:00Z")])
+    assert list(timezones.utcoffsets(epochs, "Europe/Berlin")) == [7200]
+    table = timezones.get_transition_table("Europe/Berlin")
+    assert table is timezones.get_transition_table("Europe/Berlin")
+    assert table.utcoffset(epochs.epochs[0]) == 7200
+    assert table.names[table.index(epochs.epochs[0])] == "CEST"
+
+
+def test_transition_table_unknown_zone():
+    with pytest.raises(pytz.UnknownTimeZoneError):
+        timezones.get_transition_table("Mars/Olympus_Mons")
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_localize_matches_pytz_for_unambiguous_times(zone):
+    rng = random.Random(5)
+    walls = [
+        Datetime(1970, 1, 1) + timedelta(seconds=rng.randint(-(2**31), 2**32))
+        for _ in range(300)
+    ]
+    tz = pytz.timezone(zone)
+    expected = []
+    for wall in walls:
+        try:
+            localized = tz.localize(wall, is_dst=None)
+        except (pytz.AmbiguousTimeError, pytz.NonExistentTimeError):
+            localized = None
+        expected.append(localized and maya.MayaDT.from_datetime(localized).epoch)
+
+    epochs = timezones.localize(walls, zone, ambiguous="NaT", nonexistent="NaT")
+    assert [None if e == NAT else e for e in epochs] == expected
+
+
+def test_localize_ambiguous_policies():
+    # 02:30 happens twice in Berlin on 2018-10-28.
+    walls = [Datetime(2018, 10, 28, 2, 30)]
+    earliest = maya.parse("2018-10-28T00:30:00Z").epoch
+    latest = maya.parse("2018-10-28T01:30:00Z").epoch
+    assert list(timezones.localize(walls, "Europe/Berlin", ambiguous="earliest")) == [
+        earliest
+    ]
+    assert list(timezones.localize(walls, "Europe/Berlin", ambiguous="latest")) == [
+        latest
+    ]
+    assert list(timezones.localize(walls, "Europe/Berlin", ambiguous="NaT")) == [NAT]
+    with pytest.raises(pytz.AmbiguousTimeError):
+        timezones.localize(walls, "Europe/Berlin")
+
+
+def test_localize_nonexistent_policies():
+    # 02:30 does not exist in Berlin on 2018-03-25.
+    walls = [Datetime(2018, 3, 25, 2, 30)]
+    transition = maya.parse("2018-03-25T01:00:00Z").epoch
+    assert list(
+        timezones.localize(walls, "Europe/Berlin", nonexistent="shift_forward")
+    ) == [transition]
+    assert list(
+        timezones.localize(walls, "Europe/Berlin", nonexistent="shift_backward")
+    ) == [transition - 1]
+    assert list(timezones.localize(walls, "Europe/Berlin", nonexistent="NaT")) == [NAT]
+    with pytest.raises(pytz.NonExistentTimeError):
+        timezones.localize(walls, "Europe/Berlin")
+
+
+def test_localize_invalid_arguments():
+    with pytest.raises(ValueError):
+        timezones.localize([0], "Europe/Berlin", ambiguous="first")
+    with pytest.raises(ValueError):
+        timezones.localize([0], "Europe/Berlin", nonexistent="skip")
+    with pytest.raises(ValueError):
+        timezones.localize([Datetime(2018, 1, 1, tzinfo=pytz.utc)], "Europe/Berlin")
+
+
+def test_localize_roundtrips_to_local():
+    epochs = random_epochs(seed=6)
+    for zone in ZONES:
+        local = timezones.to_local(epochs, zone)
+        localized = timezones.localize(
+            local, zone, ambiguous="NaT", nonexistent="raise"
+        )
+        assert all(a == b or b == NAT for a, b in zip(epochs, localized))
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_utc_to_timezone_matches_pytz(zone):
+    for epoch in random_epochs(seed=7):
+        dt = pytz_local(epoch, "UTC")
+        converted = timezones.utc_to_timezone(dt, zone)
+        expected = dt.astimezone(pytz.timezone(zone))
+        assert converted == expected
+        assert converted.tzinfo is expected.tzinfo
+
+
+def test_offset_cache_statistics():
+    timezones.clear_offset_cache()
+    dt = maya.parse("2018-07-01T12:00:00Z")
+    assert str(dt.datetime(to_timezone="Europe/Berlin")) == "2018-07-01 14:00:00+02:00"
+    dt.add(minutes=30).datetime(to_timezone="Europe/Berlin")
+    dt.add(minutes=59).snap_tz("@h", "Europe/Berlin")
+    info = timezones.offset_cache_info()
+    assert info.misses >= 1
+    assert info.hits >= 1
+    timezones.clear_offset_cache()
+    assert timezones.offset_cache_info().currsize == 0
+
+
+def test_offset_cache_skips_hours_containing_a_transition():
+    # pytz switches Berlin from local mean time to CET at 20:45:52 UTC.
+    before = maya.parse("1901-12-13T20:45:51Z").datetime(to_timezone="Europe/Berlin")
+    after = maya.parse("1901-12-13T20:45:52Z").datetime(to_timezone="Europe/Berlin")
+    assert before.utcoffset() == timedelta(minutes=53)
+    assert after.utcoffset() == timedelta(hours=1)
+    hour = maya.parse("1901-12-13T20:00:00Z").epoch // 3600
+    assert timezones._hourly_tzinfo("Europe/Berlin", hour) is None
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "zones.bin")
+    timezones.compile_snapshot(path, zones=ZONES)
+    yield path
+    timezones.use_snapshot(None)
+
+
+def test_snapshot_tables_match_pytz(snapshot_path):
+    snapshot = timezones.TimezoneSnapshot(snapshot_path)
+    assert snapshot.zones == sorted(ZONES)
+    assert "Europe/Paris" not in snapshot
+    for zone in ZONES:
+        table = snapshot.table(zone)
+        expected = timezones.TransitionTable.from_pytz(zone)
+        assert list(table.transitions) == list(expected.transitions)
+        assert list(table.offsets) == list(expected.offsets)
+        assert list(table.dst) == list(expected.dst)
+        assert table.names == expected.names
+    epochs = random_epochs()
+    assert snapshot.table("Europe/Berlin").to_local_fields(
+        epochs
+    ) == timezones.TransitionTable.from_pytz("Europe/Berlin").to_local_fields(epochs)
+    snapshot.close()
+
+
+def test_use_snapshot(snapshot_path):
+    snapshot = timezones.use_snapshot(snapshot_path)
+    table = timezones.get_transition_table("Europe/Berlin")
+    assert isinstance(table.transitions, memoryview)
+    # Zones missing from the snapshot still come from pytz.
+    assert timezones.get_transition_table("Europe/Paris").zone == "Europe/Paris"
+    assert snapshot.zones == sorted(ZONES)
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "zones.bin"
+    path.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        timezones.TimezoneSnapshot(str(path)).zones
+
+
+def test_preload():
+    assert timezones.preload(["Europe/Berlin", "Asia/Tokyo"]) == 2
+    assert "Asia/Tokyo" in timezones._transition_tables
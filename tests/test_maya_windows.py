@@ -0,0 +1,110 @@
+import operator
+import random
+from datetime import timedelta
+
+import pytest
+
+import maya
+from maya.windows import SlidingWindow, TumblingWindow
+
+
+def test_tumbling_window_bucket_ids():
+    window = TumblingWindow(timedelta(minutes=5))
+    base = maya.parse("2018-03-25T10:00:00Z")
+    timestamps = [base.add(seconds=s) for s in (0, 299, 300, -1)]
+    ids = window.bucket_ids(timestamps)
+    assert [window.bucket_start(i) for i in ids] == [
+        base,
+        base,
+        base.add(minutes=5),
+        base.subtract(minutes=5),
+    ]
+    assert window.bucket_id(timestamps[2]) == ids[2]
+
+
+def test_tumbling_window_matches_quantize():
+    window = TumblingWindow(timedelta(hours=1), timezone="Asia/Kolkata")
+    moment = maya.parse("2018-03-25T10:42:00Z")
+    edges = window.edges([window.bucket_id(moment)])
+    interval = maya.MayaInterval(start=moment, duration=1).quantize(
+        timedelta(hours=1), snap_out=True, timezone="Asia/Kolkata"
+    )
+    assert edges[0] == interval
+
+
+def test_tumbling_window_origin():
+    origin = maya.parse("2018-03-25T10:00:07Z")
+    window = TumblingWindow(60, origin=origin)
+    assert window.bucket_start(window.bucket_id(origin.add(seconds=61))) == origin.add(
+        seconds=60
+    )
+
+
+def test_tumbling_window_aggregate():
+    window = TumblingWindow(60)
+    base = maya.parse("2018-03-25T10:00:00Z")
+    timestamps = [base.add(seconds=s) for s in (125, 5, 59, 61, 130)]
+    result = window.aggregate(timestamps, values=[1, 2, 3, 4, 5])
+    assert [window.bucket_start(i) for i in result.ids] == [
+        base,
+        base.add(minutes=1),
+        base.add(minutes=2),
+    ]
+    assert result.edges[1] == maya.MayaInterval(start=base.add(minutes=1), duration=60)
+    assert list(result.count) == [2, 1, 2]
+    assert result.sum == [5, 4, 6]
+    assert result.min == [2, 4, 1]
+    assert result.max == [3, 4, 5]
+
+    counts_only = window.aggregate(timestamps)
+    assert list(counts_only.count) == [2, 1, 2]
+    assert counts_only.sum is None
+
+
+def test_tumbling_window_invalid_arguments():
+    with pytest.raises(ValueError):
+        TumblingWindow(0)
+    with pytest.raises(ValueError):
+        TumblingWindow(timedelta(milliseconds=1500))
+    with pytest.raises(ValueError):
+        TumblingWindow(60).aggregate([1, 2], values=[1])
+
+
+def brute_force_window(events, width, now):
+    return [value for epoch, value in events if now - width < epoch <= now]
+
+
+def test_sliding_window_matches_brute_force():
+    rng = random.Random(42)
+    epoch = 0
+    events = []
+    window = SlidingWindow(10, reducers={"sum": operator.add, "max": max, "min": min})
+    for _ in range(500):
+        epoch += rng.choice((0, 0.5, 1, 3, 11))
+        value = rng.randint(-100, 100)
+        events.append((epoch, value))
+        result = window.push(maya.MayaDT(epoch), value)
+        expected = brute_force_window(events, 10, epoch)
+        assert result["count"] == len(expected)
+        assert result["sum"] == sum(expected)
+        assert result["max"] == max(expected)
+        assert result["min"] == min(expected)
+
+
+def test_sliding_window_keeps_order_for_non_commutative_reducers():
+    window = SlidingWindow(3, reducers={"concat": operator.add})
+    results = [r["concat"] for _, r in window.process(zip(range(6), "abcdef"))]
+    assert results == ["a", "ab", "abc", "bcd", "cde", "def"]
+
+
+def test_sliding_window_advance():
+    window = SlidingWindow(timedelta(seconds=5))
+    window.push(0)
+    window.push(1)
+    window.advance(5.5)
+    assert window.count == 1
+    assert window.result() == {"count": 1}
+    window.advance(10)
+    assert len(window) == 0
+    with pytest.raises(ValueError):
+        window.push(9)